@@ -1,7 +1,11 @@
+import os
 import sys
+import time
 
 sys.path.insert(0, "player_agents")
 sys.path.insert(0, "asteroid_agents")
+main_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.append(os.path.join(main_dir, "engine"))
 EFFECT_DURATION = 5000
 #from human import HumanPlayerAgent
 #from random_asteroids import RandomAsteroidAgent
@@ -16,6 +20,15 @@ import gymnasium as gym
 from gymnasium.spaces import Box, Discrete, Dict
 import math
 import numpy as np
+from entity_store import (
+    ASTEROID, SHOT, SPEED_POWERUP, SHOT_POWERUP, LIFE_POWERUP, POWERUP_KINDS,
+    EntityStore, SpriteCache, circle_hits, circle_hits_point, resolve_hits, split_asteroids,
+)
+from spatial_hash import SpatialHash
+from lifecycle import LifecyclePolicy, entity_counts
+from sim_clock import SimClock
+from rng import RandomStream
+from snapshot import copy_attrs, restore_attrs
 NEON_GREEN = (57, 255, 20)
 NEON_PINK = (255,20,147)
 NEON_RED = (255, 30, 30)
@@ -47,13 +60,15 @@ class CircleShape(pygame.sprite.Sprite):
         return False
 
 class Asteroid(CircleShape):
-    def __init__(self, x, y, radius):
+    def __init__(self, x, y, radius, rng=None):
         super().__init__(x,y,radius)
         self.position = pygame.Vector2(x,y)
         self.radius = radius
         self.velocity = pygame.Vector2(0,0)
+        # the owning env's RandomStream, or the global random module
+        self.rng = rng or random
 
-        self.sides = random.randint(5,10)
+        self.sides = self.rng.randint(5,10)
         self.points  = self.generate_polygons()
 
         self.image = pygame.Surface((radius*2,radius*2),pygame.SRCALPHA)
@@ -65,7 +80,7 @@ class Asteroid(CircleShape):
 
         for i in range(self.sides):
             angle = i * angle_step
-            rand_off = random.uniform(0.8,1.2)
+            rand_off = self.rng.uniform(0.8,1.2)
             x = self.radius * rand_off * math.cos(angle)
             y = self.radius * rand_off * math.sin(angle)
             p.append((x+self.radius,y+self.radius))
@@ -84,17 +99,17 @@ class Asteroid(CircleShape):
             return
         gamma = 0.4
         #spawning asteroids
-        random_degrees = random.uniform(20, 50)
+        random_degrees = self.rng.uniform(20, 50)
         vector1 = pygame.math.Vector2.rotate(self.velocity, random_degrees)
         vector2 = pygame.math.Vector2.rotate(self.velocity, -random_degrees)
 
         new_radius = self.radius - ASTEROID_MIN_RADIUS
         
-        asteroid1 = Asteroid(self.position.x, self.position.y, new_radius)
-        asteroid2 = Asteroid(self.position.x, self.position.y, new_radius)
+        asteroid1 = Asteroid(self.position.x, self.position.y, new_radius, self.rng)
+        asteroid2 = Asteroid(self.position.x, self.position.y, new_radius, self.rng)
         # RL must decide when to let asteroids spawn powerups upon destruction
         # random math as placeholder
-        random_degrees = random.uniform(20, 50)
+        random_degrees = self.rng.uniform(20, 50)
         # instead of creating asteroids here, extract out, and spawn in main gameplay loop
         asteroid1.velocity = vector1 * 1.5 
         asteroid2.velocity = vector2 * 1.5
@@ -102,17 +117,24 @@ class Asteroid(CircleShape):
 class Shot(CircleShape):
     def __init__(self, x, y, radius):
         super().__init__(x, y, radius)
+        self.ttl = 2.0  # seconds until the shot expires
 
     def draw(self, screen):
         pygame.draw.circle(screen, (255, 255, 255), self.position, self.radius, 2)
 
     def update(self, dt):
         self.position += self.velocity * dt
+        self.ttl -= dt
+        if self.ttl <= 0:
+            self.kill()
 
 
 class Player(CircleShape):
-    def __init__(self, x, y):
+    def __init__(self, x, y, clock=None):
         super().__init__(x, y, PLAYER_RADIUS)
+        # shot cooldown and effect timers read this; anything with
+        # get_ticks() in ms (the env passes its SimClock), wall clock by default
+        self.clock = clock or pygame.time
         self.rotation = 0
         self.timer = 0
         self.last_shot_time = 0
@@ -156,7 +178,7 @@ class Player(CircleShape):
         self.position += forward * PLAYER_SPEED * dt * forward_factor
 
     def update_effects(self):
-        current_time = pygame.time.get_ticks()
+        current_time = self.clock.get_ticks()
         expired_powerups = []
         for powerup,expiration in self.active_effects:
             if current_time >= expiration:
@@ -173,7 +195,7 @@ class Player(CircleShape):
                 self.player_shoot_speed -= 100
                 self.player_shoot_cooldown += 0.05
     def shoot(self):
-        now = pygame.time.get_ticks() / 1000
+        now = self.clock.get_ticks() / 1000
         if now - self.last_shot_time >= self.player_shoot_cooldown:
             self.last_shot_time = now
             shot = Shot(self.position.x, self.position.y, SHOT_RADIUS)
@@ -181,18 +203,20 @@ class Player(CircleShape):
             shot.ttl = 2.0  # time-to-live for shot
             return shot
 class PowerUp(CircleShape):
-    def __init__(self, x, y, radius,type,ttl=5000):
+    def __init__(self, x, y, radius,type,ttl=5000,clock=None):
         super().__init__(x,y,radius)
         self.type = type
         self.position = pygame.Vector2(x,y)
         self.radius = radius
         self.velocity = pygame.Vector2(0,0)
-        self.spawn_time = pygame.time.get_ticks()
+        # despawn timer reads this; wall clock unless an env passes its SimClock
+        self.clock = clock or pygame.time
+        self.spawn_time = self.clock.get_ticks()
         self.ttl = 5000
     def update(self,dt):
         self.position += self.velocity * dt
         self.ttl -= 1
-        if pygame.time.get_ticks() - self.spawn_time >= self.ttl:
+        if self.clock.get_ticks() - self.spawn_time >= self.ttl:
             self.kill()
     
     def collision_check(self, other):
@@ -206,27 +230,50 @@ class PowerUp(CircleShape):
         self.kill()
     
     def apply_effect(self,player):
-        match(self.type):
+        apply_powerup_effect(self.type, player)
+
+
+def apply_powerup_effect(powerup_type, player):
+        match(powerup_type):
             case 'speed_power_up':
                 player.player_powerups['speed_power_up']+=1
                 player.player_turn_speed += 100
                 player.player_speed += 50
-                player.active_effects.append(("speed_power_up", pygame.time.get_ticks() + EFFECT_DURATION))
+                player.active_effects.append(("speed_power_up", player.clock.get_ticks() + EFFECT_DURATION))
                 return
             case 'shot_power_up':
                 player.player_powerups['shot_power_up']+=1
                 player.player_shoot_speed += 100
                 player.player_shoot_cooldown -= 0.05
-                player.active_effects.append(("shot_power_up", pygame.time.get_ticks() + EFFECT_DURATION))
+                player.active_effects.append(("shot_power_up", player.clock.get_ticks() + EFFECT_DURATION))
                 return
             case 'life_power_up':
                 player.player_powerups['life_power_up']+=1
                 player.player_lives += 1
                 return
-            
+
+POWERUP_TYPES = {
+    SPEED_POWERUP: "speed_power_up",
+    SHOT_POWERUP: "shot_power_up",
+    LIFE_POWERUP: "life_power_up",
+}
+# PowerUp.update despawned a powerup once the clock had moved its ttl of
+# 5000 ms past spawn_time, taking a further 1 ms off that ttl every tick.
+# Store rows age by dt in the lifecycle policy plus POWERUP_TICK_AGE here.
+POWERUP_TTL = 5.0
+POWERUP_TICK_AGE = 0.001
+
+# Nothing wraps in this env, so anything that drifts well off-screen is
+# culled, and the caps keep a runaway spawner from growing the store.
+DEFAULT_LIFECYCLE = dict(
+    ttl={SHOT: 2.0, SPEED_POWERUP: POWERUP_TTL, SHOT_POWERUP: POWERUP_TTL, LIFE_POWERUP: POWERUP_TTL},
+    cull_margin={kind: 2 * ASTEROID_MAX_RADIUS for kind in (ASTEROID, SHOT) + POWERUP_KINDS},
+    caps={ASTEROID: 100, SHOT: 64, SPEED_POWERUP: 16, SHOT_POWERUP: 16, LIFE_POWERUP: 16},
+)
+
 class LifePowerUp(PowerUp):
-    def __init__(self, x, y, radius):
-        super().__init__(x,y,radius,"life_power_up")
+    def __init__(self, x, y, radius, clock=None):
+        super().__init__(x,y,radius,"life_power_up",clock=clock)
         self.size = radius * 10
     def draw(self,screen):
         line_weight = self.size // 5
@@ -254,8 +301,8 @@ class LifePowerUp(PowerUp):
 class SpeedPowerUp(PowerUp):
 
     #initializs powerup sprite
-    def __init__(self, x, y, radius):
-        super().__init__(x,y,radius,"speed_power_up")
+    def __init__(self, x, y, radius, clock=None):
+        super().__init__(x,y,radius,"speed_power_up",clock=clock)
 
     def draw(self,screen):
         pygame.draw.circle(screen,NEON_GREEN,(int(self.position.x), int(self.position.y)), self.radius,2)
@@ -263,8 +310,8 @@ class SpeedPowerUp(PowerUp):
         return super().collision_check(other)
 class ShotPowerUp(PowerUp):
         #initializs powerup sprite
-    def __init__(self, x, y, radius):
-        super().__init__(x,y,radius,"shot_power_up")
+    def __init__(self, x, y, radius, clock=None):
+        super().__init__(x,y,radius,"shot_power_up",clock=clock)
         self.size = radius * 10
 
     def draw(self,screen):
@@ -307,25 +354,53 @@ class AsteroidsRLLibEnv(MultiAgentEnv):
             config = {}
 
         # Rendering
-        self.render_mode = True
+        # "render_mode": open a window and draw every step (default, for watching).
+        # "headless": never open a window and never sleep; every step advances
+        # the simulation by a fixed "fixed_dt" instead of the wall-clock frame time.
+        self.render_mode = config.get("render_mode", True)
+        self.headless = config.get("headless", not self.render_mode)
+        self.fixed_dt = config.get("fixed_dt", 1.0 / 60.0)
+        if self.headless:
+            self.render_mode = False
+            os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
         pygame.init()
         self.clock = pygame.time.Clock()
         if self.render_mode:
             self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+            self.font = pygame.freetype.SysFont(None, 24)
         else:
             self.screen = None
-        self.font = pygame.freetype.SysFont(None, 24)
+            self.font = None
+
+        # Throughput bookkeeping, reported through the info dict
+        self.total_steps = 0
+        self.sim_time = 0.0
+        self.wall_start = time.perf_counter()
+        # Gameplay timers (shot cooldown, effect expiry) run on simulated time
+        self.sim_clock = SimClock()
+        # Spawn randomness comes from this env's own stream, seeded by
+        # config["seed"] and reseeded by reset(seed=...)
+        self.rng = RandomStream(config.get("seed"))
+
+        # Entity lifecycle: shot/powerup TTL, off-screen culling and caps.
+        # "lifecycle" takes a LifecyclePolicy; counts are reported in info.
+        self.lifecycle = config.get("lifecycle") or LifecyclePolicy(**DEFAULT_LIFECYCLE)
+        self.culled = {}
 
         # State
+        # Asteroids, shots and powerups live in one array-backed store;
+        # sprites are only built by the sprite cache when rendering.
         self.player = None
-        self.asteroids = pygame.sprite.Group()
-        self.shots = pygame.sprite.Group()
-        self.powerups = pygame.sprite.Group()
-        self.updatables = pygame.sprite.Group()
-        self.drawables = pygame.sprite.Group()
-        Asteroid.containers = (self.asteroids, self.updatables, self.drawables)
-        Shot.containers = (self.shots, self.updatables, self.drawables)
-        PowerUp.containers = (self.powerups,self.updatables,self.drawables)
+        self.entities = EntityStore()
+        # Broadphase for asteroid-shot collisions, rebuilt every tick
+        self.broadphase = SpatialHash(2 * ASTEROID_MAX_RADIUS)
+        self.sprite_cache = SpriteCache({
+            ASTEROID: Asteroid,
+            SHOT: Shot,
+            SPEED_POWERUP: SpeedPowerUp,
+            SHOT_POWERUP: ShotPowerUp,
+            LIFE_POWERUP: LifePowerUp,
+        })
         self.score = 0
         self.lives = 1
         self.collected = 0
@@ -340,6 +415,12 @@ class AsteroidsRLLibEnv(MultiAgentEnv):
         self.bucket_size = min(SCREEN_WIDTH // 8, SCREEN_HEIGHT // 6)
         self.num_of_buckets_x = SCREEN_WIDTH // self.bucket_size
         self.num_of_buckets_y = SCREEN_HEIGHT // self.bucket_size
+        # Asteroid count per bucket, refreshed in bulk once per tick by
+        # _update_bucket_index(). Covers the whole screen (the last column may
+        # be partial) plus a one-bucket border collecting everything off-screen.
+        self.grid_x = -(-SCREEN_WIDTH // self.bucket_size)
+        self.grid_y = -(-SCREEN_HEIGHT // self.bucket_size)
+        self.bucket_counts = np.zeros((self.grid_y + 2, self.grid_x + 2), dtype=np.int32)
         self.max_steps = MAX_STEPS  # you can override in config
 
         # RLlib requires specifying the spaces
@@ -350,6 +431,13 @@ class AsteroidsRLLibEnv(MultiAgentEnv):
         self.observation_space_asteroid = Box(
         low=-1e5, high=1e5, shape=(9,), dtype=np.float32
         )
+        # Both observations are written into these buffers every step.
+        # RLlib keeps every observation it is handed, so by default each one
+        # is returned as a copy; "copy_obs": False hands out the buffers
+        # themselves for callers that consume an observation before the next step.
+        self.copy_obs = config.get("copy_obs", True)
+        self._player_obs = np.zeros(self.observation_space_player.shape, dtype=np.float32)
+        self._asteroid_obs = np.zeros(self.observation_space_asteroid.shape, dtype=np.float32)
 
 # Updated action spaces
         self.action_space_player = Discrete(5)  # Move, move left, move right, Shoot, Stop
@@ -359,29 +447,23 @@ class AsteroidsRLLibEnv(MultiAgentEnv):
 
     def reset(self, *, seed=None, options=None):
         # Clear old state
-        self.asteroids.empty()
-        self.shots.empty()
-        self.powerups.empty()
-        self.updatables.empty()
-        self.drawables.empty()
+        self.entities.clear()
+        self.sprite_cache.clear()
+        self.culled = {}
+        self.sim_clock.reset()
+        if seed is not None:
+            self.rng.seed(seed)
 
         # Create player at center
-        self.player = Player(SCREEN_WIDTH / 2, SCREEN_HEIGHT / 2)
-        Shot.containers = (self.shots, self.updatables, self.drawables)
-        Asteroid.containers = (self.asteroids, self.updatables, self.drawables)
-        PowerUp.containers = (self.powerups, self.updatables, self.drawables)
-        self.updatables.add(self.player)
-        self.drawables.add(self.player)
+        self.player = Player(SCREEN_WIDTH / 2, SCREEN_HEIGHT / 2, self.sim_clock)
         self.score = 0
         self.game_over = False
         self.steps_elapsed = 0
-        self.near_miss_count = 0
         self.last_spawns.clear()
+        self._extract_features()
 
         # Return the initial observation and an empty info dict
-        obs = {"player": self._get_player_obs().astype(np.float32) if self._get_player_obs().dtype != np.float32 else self._get_player_obs(),
-                "asteroid": self._get_asteroid_obs().astype(np.float32) if self._get_asteroid_obs().dtype != np.float32 else self._get_asteroid_obs()}
-        return obs, {}
+        return self._get_obs(), {}
 
     def step(self, action_dict):
         """
@@ -389,22 +471,29 @@ class AsteroidsRLLibEnv(MultiAgentEnv):
         Returns:
           obs_dict, rew_dict, terminated_dict, truncated_dict, info_dict
         """
-        # Process any quit events
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                return (
-                    {},
-                    {"player": 0.0, "asteroid": 0.0},
-                    {"__all__": True},
-                    {"__all__": False},
-                    {},
-                )
+        # Process any quit events (there is no window to close when headless)
+        if not self.headless:
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    return (
+                        {},
+                        {"player": 0.0, "asteroid": 0.0},
+                        {"__all__": True},
+                        {"__all__": False},
+                        {},
+                    )
 
         if not self.game_over:
-            self.dt = self.clock.tick(60) / 1000.0
+            if self.headless:
+                self.dt = self.fixed_dt
+            else:
+                self.dt = self.clock.tick(60) / 1000.0
             self.steps_elapsed += 1
         else:
             self.dt = 0
+        self.total_steps += 1
+        self.sim_time += self.dt
+        self.sim_clock.advance(self.dt)
 
         # 1) Apply the player action
         player_act = action_dict.get("player", 0)
@@ -416,50 +505,14 @@ class AsteroidsRLLibEnv(MultiAgentEnv):
         if not self.game_over:
             self._apply_asteroid_action(asteroid_act)
 
-        for upd in self.updatables:
-            upd.update(self.dt)
         # 3) Update sprites
-        for s in list(self.updatables):
-            if hasattr(s, "update"):
-                s.update(self.dt)
-            if isinstance(s, Shot):
-                s.position += s.velocity * self.dt
-                if s.ttl <= 0:
-                    s.kill()
-            elif isinstance(s, Player):
-                pass  # Movement already handled
-            elif isinstance(s, Asteroid):
-                s.position += s.velocity * self.dt
-            elif isinstance(s,PowerUp):
-                s.position += s.velocity * self.dt
+        self._integrate(self.dt)
         # 4) Handle collisions
-        destroyed = 0
-        for asteroid in list(self.asteroids):
-            if asteroid.collision_check(self.player):
-                self.player.player_lives -= 1
-                if self.player.player_lives == 0:
-                    self.game_over = True
-            for shot in list(self.shots):
-                if asteroid.collision_check(shot):
-                    self.last_asteroid_destroyed = asteroid
-                    print(self.last_asteroid_destroyed)
-                    shot.kill()
-                    asteroid.split()
-                    destroyed += 1
-                    break
-        for powerup in list(self.powerups):
-            if powerup.collision_check(self.player):
-                self.collected += 1   
-                powerup.apply_effect(self.player)
-                powerup.remove()         
+        destroyed = self._handle_collisions()
         self.score += destroyed
 
-        # 5) Count near misses
-        self.near_miss_count = 0
-        for asteroid in self.asteroids:
-            dist = asteroid.position.distance_to(self.player.position)
-            if dist < NEAR_MISS_DISTANCE and dist > (asteroid.radius + self.player.radius):
-                self.near_miss_count += 1
+        # 5) Extract the features rewards and observations read this tick
+        self._extract_features()
 
         # 6) Check time limit
         if self.steps_elapsed >= self.max_steps:
@@ -474,15 +527,67 @@ class AsteroidsRLLibEnv(MultiAgentEnv):
         truncated = {"player": False, "asteroid": False, "__all__": False}
 
         # 9) Build next observation and info dicts
-        obs_dict = {"player": self._get_player_obs(), "asteroid": self._get_asteroid_obs()}
+        obs_dict = self._get_obs()
         rew_dict = {"player": player_reward, "asteroid": asteroid_reward}
-        info_dict = {}
+        perf = self.perf_stats()
+        perf["live"] = entity_counts(self.entities)
+        perf["culled"] = self.culled
+        info_dict = {"player": dict(perf), "asteroid": dict(perf)}
         if self.render_mode == True:
             self.render()
         if self.game_over == True:
+            if not self.copy_obs:
+                # reset() below rewrites the buffers; keep the final observation
+                obs_dict = {k: v.copy() for k, v in obs_dict.items()}
             self.reset()
         return obs_dict, rew_dict, terminated, truncated, info_dict
 
+    def get_state(self):
+        """
+        Snapshot of the game world (entities, player, timers, RNG and the
+        cached per-tick features) for branching from this point, e.g.
+        lookahead. Restore it with set_state() any number of times; it shares
+        nothing mutable with the env.
+        """
+        return {
+            "entities": self.entities.get_state(),
+            "player": copy_attrs(self.player),
+            "clock": self.sim_clock.time,
+            "rng": self.rng.get_state(),
+            "score": self.score,
+            "lives": self.lives,
+            "collected": self.collected,
+            "game_over": self.game_over,
+            "steps_elapsed": self.steps_elapsed,
+            "dt": self.dt,
+            "last_asteroid_destroyed": self.last_asteroid_destroyed,
+            "near_miss_count": self.near_miss_count,
+            "last_spawns": list(self.last_spawns),
+            "culled": self.culled,
+            "features": self.features,
+            "bucket_counts": self.bucket_counts.copy(),
+        }
+
+    def set_state(self, state):
+        self.entities.set_state(state["entities"])
+        restore_attrs(self.player, state["player"])
+        self.sim_clock.time = state["clock"]
+        self.rng.set_state(state["rng"])
+        self.score = state["score"]
+        self.lives = state["lives"]
+        self.collected = state["collected"]
+        self.game_over = state["game_over"]
+        self.steps_elapsed = state["steps_elapsed"]
+        self.dt = state["dt"]
+        # EntityRef and the features/culled dicts are replaced, never
+        # mutated, so they can be shared with the snapshot
+        self.last_asteroid_destroyed = state["last_asteroid_destroyed"]
+        self.near_miss_count = state["near_miss_count"]
+        self.last_spawns = list(state["last_spawns"])
+        self.culled = state["culled"]
+        self.features = state["features"]
+        self.bucket_counts[:] = state["bucket_counts"]
+
     def render(self, mode="human"):
         if not self.render_mode or not self.screen:
             return
@@ -490,8 +595,8 @@ class AsteroidsRLLibEnv(MultiAgentEnv):
         #     powerup.update(self.dt)
         #     powerup.draw(self.screen)
         self.screen.fill((0, 0, 0))
-        for d in self.drawables:
-            d.draw(self.screen)
+        self.sprite_cache.draw(self.entities, self.screen)
+        self.player.draw(self.screen)
         self.font.render_to(
             self.screen, (10, 10), f"Score: {self.score}", (255, 255, 255)
         )
@@ -500,6 +605,96 @@ class AsteroidsRLLibEnv(MultiAgentEnv):
     def close(self):
         pygame.quit()
 
+    @property
+    def asteroids(self):
+        return self.entities.view(ASTEROID)
+
+    @property
+    def shots(self):
+        return self.entities.view(SHOT)
+
+    @property
+    def powerups(self):
+        return self.entities.view(POWERUP_KINDS)
+
+    def _integrate(self, dt):
+        """
+        Advance every entity exactly once per tick in one batched array
+        operation: asteroids, shots and powerups move by velocity * dt, then
+        the lifecycle policy ages, culls and caps them. The player already
+        moved in its action.
+        """
+        self.entities.integrate(dt)
+        self.entities.ttl[self.entities.rows(POWERUP_KINDS)] -= POWERUP_TICK_AGE
+        self.culled = self.lifecycle.enforce(self.entities, dt, SCREEN_WIDTH, SCREEN_HEIGHT)
+        self.entities.compact()
+
+    def _handle_collisions(self):
+        """
+        Player vs asteroids, shots vs asteroids and player vs powerups.
+        Returns the number of asteroids destroyed this tick.
+        """
+        store = self.entities
+        player_pos = (self.player.position.x, self.player.position.y)
+
+        hits = len(circle_hits_point(store, ASTEROID, player_pos, self.player.radius))
+        if hits:
+            self.player.player_lives -= hits
+            if self.player.player_lives <= 0:
+                self.game_over = True
+
+        # Each asteroid is destroyed by at most one shot and vice versa
+        hit_ast, hit_shot = circle_hits(store, ASTEROID, SHOT, self.broadphase)
+        pairs = resolve_hits(hit_ast, hit_shot)
+        if pairs:
+            ast_rows = np.array([a for a, _ in pairs])
+            self.last_asteroid_destroyed = store.ref(ast_rows[-1])
+            store.kill([b for _, b in pairs])
+            split_asteroids(
+                store, ast_rows,
+                self.rng.uniforms(len(pairs), 20, 50),
+                ASTEROID_MIN_RADIUS,
+            )
+
+        for row in store.rows(POWERUP_KINDS):
+            if self._powerup_touches_player(row):
+                self.collected += 1
+                apply_powerup_effect(POWERUP_TYPES[int(store.kind[row])], self.player)
+                store.kill(row)
+
+        store.compact()
+        return len(pairs)
+
+    def _powerup_touches_player(self, row):
+        """
+        Same pickup shapes as the powerup sprites' collision_check:
+        a circle for speed, a box for shot and a cross for life.
+        """
+        x, y = self.entities.pos[row]
+        r = self.entities.radius[row]
+        px, py = self.player.position.x, self.player.position.y
+        kind = self.entities.kind[row]
+        if kind == SPEED_POWERUP:
+            return math.hypot(x - px, y - py) <= r + self.player.radius
+        size = r * 10
+        if kind == SHOT_POWERUP:
+            return x - size * 0.6 <= px <= x + size * 0.6 and y - size <= py <= y + size * 0.6
+        line_weight = size // 5
+        in_vertical = abs(px - x) < line_weight and abs(py - y) < size // 2
+        in_horizontal = abs(px - x) < size // 2 and abs(py - y) < line_weight
+        return in_vertical or in_horizontal
+
+    def perf_stats(self):
+        """
+        Env steps per wall-clock second since construction, plus how many
+        times faster than real time the simulation is running.
+        """
+        elapsed = max(time.perf_counter() - self.wall_start, 1e-9)
+        return {
+            "steps_per_sec": self.total_steps / elapsed,
+            "realtime_factor": self.sim_time / elapsed,
+        }
+
     def _compute_player_reward(self):
         reward = 0
         p_lives = self.player.player_lives
@@ -527,12 +722,8 @@ class AsteroidsRLLibEnv(MultiAgentEnv):
             reward += 0.2
         else:
             reward -= 0.2
-        px, py = self.player.position.x, self.player.position.y
-        player_bucket_x = px // self.bucket_size
-        player_bucket_y = py // self.bucket_size
         #checking # of asteroids in player bucket space
-        asteroids_in_bucket = sum(1 for a in self.asteroids if (a.position.x // self.bucket_size == player_bucket_x and
-                                        a.position.y // self.bucket_size == player_bucket_y))
+        asteroids_in_bucket = self.features["asteroids_in_bucket"]
         if asteroids_in_bucket > 3:
             reward -= 0.2 * asteroids_in_bucket
         if asteroids_in_bucket == 0:
@@ -556,27 +747,23 @@ class AsteroidsRLLibEnv(MultiAgentEnv):
         if self.game_over:
             early_factor = 1.0 - (self.steps_elapsed / self.max_steps)
             reward -= 5.0 + 5.0 * early_factor
+        num_asts = self.features["num_asteroids"]
         # boredom
-        if len(self.asteroids) < 1:
+        if num_asts < 1:
             reward -= 0.05
         # penalty if too many
-        if len(self.asteroids) > MAX_ASTEROIDS_ONSCREEN:
-            reward -= 0.1 * (len(self.asteroids) - MAX_ASTEROIDS_ONSCREEN)
+        if num_asts > MAX_ASTEROIDS_ONSCREEN:
+            reward -= 0.1 * (num_asts - MAX_ASTEROIDS_ONSCREEN)
 
-        px, py = self.player.position.x, self.player.position.y
-        player_bucket_x = px // self.bucket_size
-        player_bucket_y = py // self.bucket_size
         #checking # of asteroids in player bucket space
-        asteroids_in_bucket = sum(1 for a in self.asteroids if (a.position.x // self.bucket_size == player_bucket_x and
-                                        a.position.y // self.bucket_size == player_bucket_y))
+        asteroids_in_bucket = self.features["asteroids_in_bucket"]
         if asteroids_in_bucket > 3:
             reward -= 0.2 * asteroids_in_bucket
         if asteroids_in_bucket == 0:
             reward += 0.15
         #checking if lots of asteroids in one area of the game
         cluster_threshold = 4
-        nearby_asteroids = sum(1 for a in self.asteroids if (a.position.x // self.bucket_size == player_bucket_x or
-                                        a.position.y // self.bucket_size == player_bucket_y))
+        nearby_asteroids = self.features["asteroids_in_line"]
         if nearby_asteroids > cluster_threshold:
             reward -= 0.3 * nearby_asteroids
         # step cost
@@ -597,8 +784,12 @@ class AsteroidsRLLibEnv(MultiAgentEnv):
         elif a == 1:  # Shoot
             new_shot = self.player.shoot()  # Shoot a projectile
             if new_shot:
-                self.shots.add(new_shot)  # Add shot to the game
-                self.updatables.add(new_shot)  # Add shot to the updatable objects
+                # Add shot to the game
+                self.entities.spawn(
+                    SHOT, new_shot.position.x, new_shot.position.y,
+                    new_shot.velocity.x, new_shot.velocity.y,
+                    new_shot.radius, self.lifecycle.ttl_for(SHOT),
+                )
     
         elif a == 2:  # Move forward and turn right
             self.player.rotate(self.dt, 1)  # Turn right
@@ -623,20 +814,19 @@ class AsteroidsRLLibEnv(MultiAgentEnv):
             self.last_asteroid_destroyed = None
             return
 
-        edge = random.choice(ASTEROID_EDGES)
-        radius = random.choice(POSSIBLE_RADII)
-        speed = random.choice(POSSIBLE_SPEEDS)
-        angle = random.choice(POSSIBLE_ANGLES)
+        edge = self.rng.choice(ASTEROID_EDGES)
+        radius = self.rng.choice(POSSIBLE_RADII)
+        speed = self.rng.choice(POSSIBLE_SPEEDS)
+        angle = self.rng.choice(POSSIBLE_ANGLES)
 
         # Generate position and velocity
-        frac = random.random()  # This will be used to calculate the spawn position along the edge
+        frac = self.rng.random()  # This will be used to calculate the spawn position along the edge
         pos = edge[1](frac)  # Get position from edge definition (lambda function)
         direction = edge[0].rotate(angle)  # Rotate direction vector by angle
         vel = direction * speed  # Compute velocity vector
 
     # Create the asteroid (you should have an Asteroid class to instantiate)
-        asteroid = Asteroid(pos.x, pos.y, radius)
-        asteroid.velocity = vel
+        self.entities.spawn(ASTEROID, pos.x, pos.y, vel.x, vel.y, radius)
 
         self.last_spawns.append((radius, speed, angle))
         if len(self.last_spawns) > 20:
@@ -658,74 +848,114 @@ class AsteroidsRLLibEnv(MultiAgentEnv):
             life_weight /= total
             shot_weight /= total
             speed_weight /= total
-            powerup_type = random.choices(["speed", "shot", "life"],weights=[speed_weight,shot_weight,life_weight],k=1)[0]
+            powerup_type = self.rng.choices(["speed", "shot", "life"],weights=[speed_weight,shot_weight,life_weight],k=1)[0]
             print(powerup_type)
-            vector3 = pygame.math.Vector2.rotate(asteroid.velocity,random.uniform(20, 50))
+            vector3 = pygame.math.Vector2.rotate(asteroid.velocity,self.rng.uniform(20, 50))
+            x, y = asteroid.position.x, asteroid.position.y
+            # only life powerups enter play; shot and speed are rolled but not spawned
             if powerup_type == "shot":
-                powerup = ShotPowerUp(asteroid.position.x,asteroid.position.y,2)
-                powerup.velocity = vector3
-                #self.powerups.add(powerup)
-                #self.drawables.add(powerup)
-                #self.updatables.add(powerup)
+                #self.entities.spawn(SHOT_POWERUP, x, y, vector3.x, vector3.y, 2, self.lifecycle.ttl_for(SHOT_POWERUP))
                 self.action = "PowerUp_Spawned_Shot"
             elif powerup_type == "speed":
-                powerup = SpeedPowerUp(asteroid.position.x,asteroid.position.y,20)
-                powerup.velocity = vector3
-                #self.powerups.add(powerup)
-                #self.drawables.add(powerup)
-                #self.updatables.add(powerup)
+                #self.entities.spawn(SPEED_POWERUP, x, y, vector3.x, vector3.y, 20, self.lifecycle.ttl_for(SPEED_POWERUP))
                 self.action = "PowerUp_Spawned_Speed"
             elif powerup_type == "life":
-                powerup = LifePowerUp(asteroid.position.x,asteroid.position.y,5)
-                powerup.velocity = vector3
-                self.powerups.add(powerup)
-                self.drawables.add(powerup)
-                self.updatables.add(powerup)
+                self.entities.spawn(LIFE_POWERUP, x, y, vector3.x, vector3.y, 5, self.lifecycle.ttl_for(LIFE_POWERUP))
                 self.action = "PowerUp_Spawned_Life"
 
-    def _get_surrounding_buckets(self):
-        px, py = self.player.position.x, self.player.position.y
-        player_bucket = self._get_player_bucket()
-        surrounding_buckets = [
-            (player_bucket[0] + dx,player_bucket[1] + dy)
-            for dx in [-1,0,1]
-            for dy in [-1,0,1]
-        ]         
-        valid_in_game_bounds_bucket = [
-            (bx,by)
-            for bx,by in surrounding_buckets
-            if 0<=bx<self.num_of_buckets_x and 0<=by < self.num_of_buckets_y
-        ]
-        asteroid_buckets = self._update_asteroids_buckets()
-        surrounding_asteroids_count = sum(len(asteroid_buckets.get(bucket, [])) for bucket in valid_in_game_bounds_bucket)
-        return surrounding_asteroids_count
-    
-    def _update_asteroids_buckets(self):
-        asteroid_buckets = {}
-        for asteroid in self.asteroids:
-            bx,by = self._get_asteroid_bucket(asteroid)
-            if (bx,by) not in asteroid_buckets:
-                asteroid_buckets[(bx, by)] = []
-            asteroid_buckets[(bx, by)].append(asteroid) 
-        return asteroid_buckets  
+    def _extract_features(self):
+        """
+        One sweep over the live asteroids computing everything the rewards
+        and observations read this tick. The result is cached in
+        self.features until the next step.
+        """
+        ast = self.entities.rows(ASTEROID)
+        pos = self.entities.pos[ast]
+        self._update_bucket_index(pos)
+        bx, by = self._get_player_bucket()
+
+        d = pos - (self.player.position.x, self.player.position.y)
+        dist = np.sqrt((d * d).sum(axis=1))
+        self.near_miss_count = int(np.count_nonzero(
+            (dist < NEAR_MISS_DISTANCE) & (dist > self.entities.radius[ast] + self.player.radius)
+        ))
+
+        self.features = {
+            "num_asteroids": len(ast),
+            "num_powerups": self.entities.count_kind(POWERUP_KINDS),
+            "player_bucket": (bx, by),
+            "asteroids_in_bucket": self._asteroids_in_bucket(bx, by, pos),
+            "asteroids_in_line": self._asteroids_in_line(bx, by, pos),
+            "surrounding_asteroids": self._get_surrounding_buckets(bx, by),
+            "near_misses": self.near_miss_count,
+            "mean_velocity_x": float(self.entities.vel[ast, 0].mean()) if len(ast) else 0.0,
+        }
+        return self.features
+
+    def _get_surrounding_buckets(self, bx, by):
+        """
+        Asteroids in the valid buckets of the 3x3 neighbourhood around
+        bucket (bx, by), with asteroids beyond the edge buckets clamped onto them.
+        """
+        x0, x1 = max(bx - 1, 0), min(bx + 1, self.num_of_buckets_x - 1)
+        y0, y1 = max(by - 1, 0), min(by + 1, self.num_of_buckets_y - 1)
+        if x0 > x1 or y0 > y1:
+            return 0
+        # widen edge buckets to take in everything clamped onto them
+        lo_x = -1 if x0 == 0 else x0
+        hi_x = self.grid_x if x1 == self.num_of_buckets_x - 1 else x1
+        lo_y = -1 if y0 == 0 else y0
+        hi_y = self.grid_y if y1 == self.num_of_buckets_y - 1 else y1
+        return int(self.bucket_counts[lo_y + 1:hi_y + 2, lo_x + 1:hi_x + 2].sum())
+
+    def _update_bucket_index(self, pos):
+        """
+        Re-bin the asteroid positions `pos` into bucket_counts in one bincount.
+        """
+        bx = np.clip(pos[:, 0] // self.bucket_size, -1, self.grid_x).astype(np.intp) + 1
+        by = np.clip(pos[:, 1] // self.bucket_size, -1, self.grid_y).astype(np.intp) + 1
+        counts = np.bincount(by * (self.grid_x + 2) + bx, minlength=self.bucket_counts.size)
+        self.bucket_counts.reshape(-1)[:] = counts
+
+    def _on_grid(self, bx, by):
+        return 0 <= bx < self.grid_x and 0 <= by < self.grid_y
+
+    def _asteroids_in_bucket(self, bx, by, pos):
+        """
+        Asteroids whose bucket is exactly (bx, by).
+        """
+        if self._on_grid(bx, by):
+            return int(self.bucket_counts[by + 1, bx + 1])
+        # player is off-screen: the border bucket is too coarse, count directly
+        buckets = pos // self.bucket_size
+        return int(np.count_nonzero((buckets[:, 0] == bx) & (buckets[:, 1] == by)))
+
+    def _asteroids_in_line(self, bx, by, pos):
+        """
+        Asteroids sharing the bucket row or the bucket column of (bx, by).
+        """
+        if self._on_grid(bx, by):
+            counts = self.bucket_counts
+            return int(counts[by + 1].sum() + counts[:, bx + 1].sum() - counts[by + 1, bx + 1])
+        buckets = pos // self.bucket_size
+        return int(np.count_nonzero((buckets[:, 0] == bx) | (buckets[:, 1] == by)))
+
     #SCREEN_WIDTH, SCREEN_HEIGHT
     def _get_player_bucket(self):
         px, py = self.player.position.x, self.player.position.y
-        bucket_x = px // self.bucket_size
-        bucket_y = py // self.bucket_size
+        bucket_x = int(px // self.bucket_size)
+        bucket_y = int(py // self.bucket_size)
         return bucket_x,bucket_y
-    
-    def _get_asteroid_bucket(self,asteroid):
-        ax, ay = asteroid.position.x, asteroid.position.y
-        bucket_x = ax // self.bucket_size
-        bucket_y = ay // self.bucket_size
-        bucket_x = max(0, min(bucket_x, self.num_of_buckets_x - 1))
-        bucket_y = max(0, min(bucket_y, self.num_of_buckets_y - 1))
-
-        return bucket_x, bucket_y
     # ----------------------------
     #   Observations
     # ----------------------------
+    def _get_obs(self):
+        player_obs = self._get_player_obs()
+        asteroid_obs = self._get_asteroid_obs()
+        if self.copy_obs:
+            player_obs, asteroid_obs = player_obs.copy(), asteroid_obs.copy()
+        return {"player": player_obs, "asteroid": asteroid_obs}
+
     def _get_player_obs(self):
         """
         vector of buckets of player observations
@@ -740,7 +970,7 @@ class AsteroidsRLLibEnv(MultiAgentEnv):
         else:
             p_lives_bucket = 2
 
-        num_asts = len(self.asteroids)
+        num_asts = self.features["num_asteroids"]
         if num_asts < 10:
             num_asts_bucket = 0
         elif num_asts >= 10 and num_asts < 20:
@@ -767,19 +997,24 @@ class AsteroidsRLLibEnv(MultiAgentEnv):
         else:
             collected_buckets = 3
 
-        surrounding_asteroids_count = self._get_surrounding_buckets()
-        return np.array(
-            [self.player.position.x, self.player.position.y,self.player.velocity.x,self.player.velocity.y,
-              num_asts_bucket,collected_buckets,p_lives_bucket,num_act_effects_bucket,surrounding_asteroids_count],
-            dtype=np.float32,
-        #9
-        )
+        surrounding_asteroids_count = self.features["surrounding_asteroids"]
+        obs = self._player_obs  #9
+        obs[0] = self.player.position.x
+        obs[1] = self.player.position.y
+        obs[2] = self.player.velocity.x
+        obs[3] = self.player.velocity.y
+        obs[4] = num_asts_bucket
+        obs[5] = collected_buckets
+        obs[6] = p_lives_bucket
+        obs[7] = num_act_effects_bucket
+        obs[8] = surrounding_asteroids_count
+        return obs
 
     def _get_asteroid_obs(self):
         """
         Using buckets for asteroid and powerup observations
         """
-        num_asts = len(self.asteroids)
+        num_asts = self.features["num_asteroids"]
         if num_asts < 10:
             num_asts_bucket = 0
         elif num_asts >= 10 and num_asts < 20:
@@ -791,7 +1026,7 @@ class AsteroidsRLLibEnv(MultiAgentEnv):
 
         px, py = self.player.position.x, self.player.position.y
 
-        num_pup = len(self.powerups)
+        num_pup = self.features["num_powerups"]
         if num_pup < 3:
             num_pup_bucket = 0
         elif num_pup >=3 and num_pup < 5:
@@ -806,14 +1041,18 @@ class AsteroidsRLLibEnv(MultiAgentEnv):
             near_miss_bucket = 1  # Medium risk
         else:
             near_miss_bucket = 2 
-        surrounding_asteroids_count = self._get_surrounding_buckets()
-        return np.array(
-            [num_asts_bucket, px, float(np.mean([a.velocity.x for a in self.asteroids] if self.asteroids else 0)) if self.asteroids else 0.0,
-              py,self.player.velocity.x,self.player.velocity.x
-              ,num_pup_bucket,near_miss_bucket,surrounding_asteroids_count],
-            dtype=np.float32,
-            #8
-        )
+        surrounding_asteroids_count = self.features["surrounding_asteroids"]
+        obs = self._asteroid_obs
+        obs[0] = num_asts_bucket
+        obs[1] = px
+        obs[2] = self.features["mean_velocity_x"]
+        obs[3] = py
+        obs[4] = self.player.velocity.x
+        obs[5] = self.player.velocity.x
+        obs[6] = num_pup_bucket
+        obs[7] = near_miss_bucket
+        obs[8] = surrounding_asteroids_count
+        return obs
 
     @property
     def observation_space(self):
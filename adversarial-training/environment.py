@@ -1,7 +1,10 @@
+import os
 import sys
 
 sys.path.insert(0, "player_agents")
 sys.path.insert(0, "asteroid_agents")
+main_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.append(os.path.join(main_dir, "engine"))
 
 from human import HumanPlayerAgent
 from random_asteroids import RandomAsteroidAgent
@@ -16,6 +19,10 @@ import gymnasium as gym
 from gymnasium.spaces import Box, Discrete, Dict
 import math
 import numpy as np
+from entity_store import (
+    ASTEROID, SHOT, EntityStore, SpriteCache, circle_hits, circle_hits_point, resolve_hits,
+)
+from lifecycle import LifecyclePolicy, entity_counts
 
 
 class CircleShape(pygame.sprite.Sprite):
@@ -131,6 +138,15 @@ class Player(CircleShape):
         shot.ttl = 2.0  # time-to-live for shot
         return shot
 
+# Nothing wraps in this env, so anything that drifts well off-screen is
+# culled, and the caps keep a runaway spawner from growing the store.
+DEFAULT_LIFECYCLE = dict(
+    ttl={SHOT: 2.0},
+    cull_margin={ASTEROID: 2 * ASTEROID_MAX_RADIUS, SHOT: 2 * ASTEROID_MAX_RADIUS},
+    caps={ASTEROID: 100, SHOT: 64},
+)
+
+
 class AsteroidsRLLibEnv(MultiAgentEnv):
     """
     RLlib-compatible multi-agent environment.
@@ -159,11 +175,17 @@ class AsteroidsRLLibEnv(MultiAgentEnv):
             self.screen = None
         self.font = pygame.freetype.SysFont(None, 24)
 
+        # Entity lifecycle: shot TTL, off-screen culling and caps.
+        # "lifecycle" takes a LifecyclePolicy; counts are reported in info.
+        self.lifecycle = config.get("lifecycle") or LifecyclePolicy(**DEFAULT_LIFECYCLE)
+        self.culled = {}
+
         # State
+        # Asteroids and shots live in one array-backed store; sprites are
+        # only built by the sprite cache when rendering.
         self.player = None
-        self.asteroids = pygame.sprite.Group()
-        self.shots = pygame.sprite.Group()
-        self.updatables = pygame.sprite.Group()
+        self.entities = EntityStore()
+        self.sprite_cache = SpriteCache({ASTEROID: Asteroid, SHOT: Shot})
 
         self.score = 0
         self.game_over = False
@@ -192,13 +214,12 @@ class AsteroidsRLLibEnv(MultiAgentEnv):
 
     def reset(self, seed=None, options=None):
         # Clear old state
-        self.asteroids.empty()
-        self.shots.empty()
-        self.updatables.empty()
+        self.entities.clear()
+        self.sprite_cache.clear()
+        self.culled = {}
 
         # Create player at center
         self.player = Player(SCREEN_WIDTH / 2, SCREEN_HEIGHT / 2)
-        self.updatables.add(self.player)
 
         self.score = 0
         self.game_over = False
@@ -243,39 +264,20 @@ class AsteroidsRLLibEnv(MultiAgentEnv):
         if not self.game_over:
             self._apply_asteroid_action(asteroid_act)
 
-        # 3) Update sprites
-        for s in list(self.updatables):
-            if hasattr(s, "update"):
-                s.update(self.dt)
-            if isinstance(s, Shot):
-                s.position += s.velocity * self.dt
-                if s.ttl <= 0:
-                    s.kill()
-            elif isinstance(s, Player):
-                pass  # Movement already handled
-            elif isinstance(s, Asteroid):
-                s.position += s.velocity * self.dt
+        # 3) Move asteroids and shots (the player already moved in its action)
+        self._integrate(self.dt)
 
         # 4) Handle collisions
-        destroyed = 0
-        for asteroid in list(self.asteroids):
-            if asteroid.collision_check(self.player):
-                self.game_over = True
-            for shot in list(self.shots):
-                if asteroid.collision_check(shot):
-                    shot.kill()
-                    asteroid.kill()
-                    destroyed += 1
-                    break
-
+        destroyed = self._handle_collisions()
         self.score += destroyed
 
         # 5) Count near misses
-        self.near_miss_count = 0
-        for asteroid in self.asteroids:
-            dist = asteroid.position.distance_to(self.player.position)
-            if dist < NEAR_MISS_DISTANCE and dist > (asteroid.radius + self.player.radius):
-                self.near_miss_count += 1
+        ast = self.entities.rows(ASTEROID)
+        d = self.entities.pos[ast] - (self.player.position.x, self.player.position.y)
+        dist = np.sqrt((d * d).sum(axis=1))
+        self.near_miss_count = int(np.count_nonzero(
+            (dist < NEAR_MISS_DISTANCE) & (dist > self.entities.radius[ast] + self.player.radius)
+        ))
 
         # 6) Check time limit
         if self.steps_elapsed >= self.max_steps:
@@ -292,7 +294,7 @@ class AsteroidsRLLibEnv(MultiAgentEnv):
         # 9) Build next observation and info dicts
         obs_dict = {"player": self._get_player_obs(), "asteroid": self._get_asteroid_obs()}
         rew_dict = {"player": player_reward, "asteroid": asteroid_reward}
-        info_dict = {}
+        info_dict = {"live": entity_counts(self.entities), "culled": self.culled}
 
         return obs_dict, rew_dict, terminated, truncated, info_dict
 
@@ -301,6 +303,8 @@ class AsteroidsRLLibEnv(MultiAgentEnv):
             return
         self.screen.fill((0, 0, 0))
         # draw any sprites, text, etc.
+        self.sprite_cache.draw(self.entities, self.screen)
+        self.player.draw(self.screen)
         self.font.render_to(
             self.screen, (10, 10), f"Score: {self.score}", (255, 255, 255)
         )
@@ -309,6 +313,42 @@ class AsteroidsRLLibEnv(MultiAgentEnv):
     def close(self):
         pygame.quit()
 
+    @property
+    def asteroids(self):
+        return self.entities.view(ASTEROID)
+
+    @property
+    def shots(self):
+        return self.entities.view(SHOT)
+
+    def _integrate(self, dt):
+        """
+        Advance every asteroid and shot exactly once per tick in one batched
+        array operation, then the lifecycle policy ages, culls and caps them.
+        """
+        self.entities.integrate(dt)
+        self.culled = self.lifecycle.enforce(self.entities, dt, SCREEN_WIDTH, SCREEN_HEIGHT)
+        self.entities.compact()
+
+    def _handle_collisions(self):
+        """
+        Player vs asteroids and shots vs asteroids. A hit asteroid is
+        destroyed outright, together with the shot. Returns the number of
+        asteroids destroyed this tick.
+        """
+        store = self.entities
+        player_pos = (self.player.position.x, self.player.position.y)
+        if len(circle_hits_point(store, ASTEROID, player_pos, self.player.radius)):
+            self.game_over = True
+
+        # Each asteroid is destroyed by at most one shot and vice versa
+        hit_ast, hit_shot = circle_hits(store, ASTEROID, SHOT)
+        pairs = resolve_hits(hit_ast, hit_shot)
+        if pairs:
+            store.kill([a for a, _ in pairs] + [b for _, b in pairs])
+            store.compact()
+        return len(pairs)
+
     # ----------------------------
     #   Koster-inspired "fun" reward
     # ----------------------------
@@ -360,8 +400,11 @@ class AsteroidsRLLibEnv(MultiAgentEnv):
         if shoot:
             new_shot = self.player.shoot()
             if new_shot:
-                self.shots.add(new_shot)
-                self.updatables.add(new_shot)
+                self.entities.spawn(
+                    SHOT, new_shot.position.x, new_shot.position.y,
+                    new_shot.velocity.x, new_shot.velocity.y,
+                    new_shot.radius, self.lifecycle.ttl_for(SHOT),
+                )
 
     def _apply_asteroid_action(self, a):
         """
@@ -390,11 +433,7 @@ class AsteroidsRLLibEnv(MultiAgentEnv):
         vel = direction * speed
 
         # spawn asteroid
-        asteroid = Asteroid(pos.x, pos.y, radius)
-        asteroid.velocity = vel
-
-        self.asteroids.add(asteroid)
-        self.updatables.add(asteroid)
+        self.entities.spawn(ASTEROID, pos.x, pos.y, vel.x, vel.y, radius)
 
         self.last_spawns.append((radius, speed, angle))
         if len(self.last_spawns) > 20:
@@ -1,5 +1,6 @@
+import os
 import sys
-sys.path.insert(0, '../asteroid-random')
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'asteroid-random'))
 from player import Player
 from shot import Shot
 from asteroid import Asteroid
@@ -15,11 +16,49 @@ import numpy as np
 
 import math
 import heapq
+import time
 
+from planner_stats import PlannerStats
 
 
 from constants import *
 
+# Grid searches AStarAgent(planner=...) can plan with. HPA* and flow
+# fields are not: with one player on the grids this game plans on, each
+# costs more per replan than A* (see benchmarks/bench_hpa.py and
+# bench_flow.py, which keep them).
+PLANNERS = ("astar", "jps", "dstar", "spacetime")
+
+SQRT2 = math.sqrt(2)
+# 8-neighbour moves (dcol, drow) with their octile step costs
+NEIGHBOUR_STEPS = [
+    (dcol, drow, SQRT2 if dcol and drow else 1.0)
+    for dcol in (-1, 0, 1) for drow in (-1, 0, 1) if dcol or drow
+]
+
+
+def asteroid_arrays(asteroids):
+    """
+    (n, 2) positions and (n,) radii of `asteroids`: read straight from an
+    EntityView's arrays, or gathered from sprites one by one.
+    """
+    if hasattr(asteroids, "pos"):
+        return asteroids.pos.astype(np.float64), asteroids.radius.astype(np.float64)
+    pos = [(a.position.x, a.position.y) for a in asteroids]
+    radius = [a.radius for a in asteroids]
+    return np.array(pos, dtype=np.float64).reshape(-1, 2), np.array(radius, dtype=np.float64)
+
+
+def asteroid_velocities(asteroids):
+    """
+    (n, 2) velocities of `asteroids`, in pixels per second, in the same
+    order as asteroid_arrays().
+    """
+    if hasattr(asteroids, "vel"):
+        return asteroids.vel.astype(np.float64)
+    vel = [(a.velocity.x, a.velocity.y) for a in asteroids]
+    return np.array(vel, dtype=np.float64).reshape(-1, 2)
+
 
 class AStarAgent:
     def __init__(
@@ -30,34 +69,151 @@ class AStarAgent:
         shoot_distance=500,    # Max distance to attempt shooting
         # Angle threshold (degrees) to consider an asteroid "in front"
         shoot_angle_thresh=40,
+        # Extra A* step cost for passing close to asteroids (0 = shortest path)
+        clearance_weight=0.0,
+        # A* heuristic: "euclidean" (the original paths) or "octile" (tighter
+        # for 8-neighbour moves, fewer expansions; ties may pick another
+        # equally short path)
+        heuristic="euclidean",
+        # Grid search used by plan_path, one of PLANNERS
+        planner="astar",
+        # dstar only: keep the previous goal while its clearance is at least
+        # this fraction of the new safest cell's, so the search tree survives
+        goal_keep_ratio=0.8,
+        # spacetime only: seconds of asteroid motion to plan against; past it
+        # the last predicted grid is treated as static
+        horizon=2.0,
+        # ReplanScheduler deciding when to replan; None replans every replan_interval
+        scheduler=None,
+        # Aim at where a shot would meet an asteroid instead of where it is
+        lead_shots=False,
+        # PlanningService to hand replans to; None plans them in update()
+        service=None,
+        # Time the planning phases and count replans into self.stats (a PlannerStats)
+        instrument=False,
     ):
         self.grid_cols, self.grid_rows = grid_size
         self.cell_width = SCREEN_WIDTH / self.grid_cols
         self.cell_height = SCREEN_HEIGHT / self.grid_rows
 
         self.safe_distance = safe_distance
+        self.clearance_weight = clearance_weight
+        if heuristic not in ("euclidean", "octile"):
+            raise ValueError(f"unknown heuristic {heuristic!r}")
+        self.heuristic = heuristic
+        if planner not in PLANNERS:
+            raise ValueError(f"unknown planner {planner!r}, expected one of {PLANNERS}")
+        self.planner = planner
+        self.goal_keep_ratio = goal_keep_ratio
+        self.horizon = horizon
         self.replan_interval = replan_interval
+        self.scheduler = scheduler
+        if service is not None and planner not in service.planners:
+            raise ValueError(f"planner {planner!r} can't use a planning service, expected one of {service.planners}")
+        self.service = service
         self.time_since_replan = 0.0
 
         self.current_path = []
+        # Seconds left to wait in the current cell; space-time paths repeat a
+        # cell once per time step the player should hold there
+        self.hold = 0.0
+        # Seconds per cell step at player speed, the space-time search's clock tick
+        self.time_step = min(self.cell_width, self.cell_height) / PLAYER_SPEED
+
+        # Disc stencils build_grid stamps, one per blocking radius (asteroid
+        # radius + safe_distance); radii come from a small set, so this stays small.
+        self._stencils = {}
+        # Row-major cell-centre coordinates, for the distance stages
+        col, row = np.meshgrid(np.arange(self.grid_cols), np.arange(self.grid_rows))
+        self.cell_x = ((col + 0.5) * self.cell_width).ravel()
+        self.cell_y = ((row + 0.5) * self.cell_height).ravel()
+        # Distance field of the last plan when clearance_weight is set, in pixels
+        self.clearance = None
+        # A* search buffers, sized on first use by _allocate_search
+        self._search_shape = None
+        # Nodes expanded by the last search, and by replans during the last update()
+        self.last_expansions = 0
+        self.step_expansions = 0
+        # Expansions of paths a PlanningService delivered since the last update()
+        self._delivered_expansions = 0
+        # D* Lite search tree kept between replans (planner="dstar")
+        self._dstar_goal = None
+        # Predicted (slices, rows, cols) occupancy of the last plan (planner="spacetime")
+        self.occupancy = None
 
         # Combat params
         self.shoot_distance = shoot_distance
         self.shoot_angle_thresh = shoot_angle_thresh
+        self.lead_shots = lead_shots
+
+        # Per-phase timers and replan counts; None, and no shims, unless instrumented
+        self.stats = None
+        if instrument:
+            self.stats = PlannerStats()
+            self.stats.attach(self)
+
+    def get_state(self):
+        """
+        Replan timer, current path, wait time left, the kept D* Lite tree
+        and the scheduler's state (each None without one), for set_state().
+        """
+        scheduler = self.scheduler.get_state() if self.scheduler is not None else None
+        return (self.time_since_replan, list(self.current_path), self.hold, self._dstar_state(), scheduler)
+
+    def set_state(self, state):
+        self.time_since_replan = state[0]
+        self.current_path = list(state[1])
+        self.hold = state[2]
+        # the kept D* Lite tree steers the next replans, so it goes back too
+        self._set_dstar_state(state[3])
+        if self.scheduler is not None and state[4] is not None:
+            self.scheduler.set_state(state[4])
+        # a replan still waiting in a planning service reflects another history
+        if self.service is not None:
+            self.service.cancel(self)
+        self._delivered_expansions = 0
+
+    def reset(self):
+        """
+        Forget the path, replan timer and any kept search tree, for a new episode.
+        """
+        self.set_state((0.0, [], 0.0, None, None))
+        if self.scheduler is not None:
+            self.scheduler.reset()
+        if self.stats is not None:
+            self.stats.new_episode()
 
-    def update(self, dt, player, asteroids,powerups):
+    def update(self, dt, player, asteroids, powerups=()):
         """
         AI update step. 
-        1) Possibly replan path with A*
+        1) Possibly replan path with A* (every replan_interval, or when the scheduler says)
         2) Attempt to shoot if an asteroid is in line of fire
         3) Follow the path from A*
+
+        With a planning service the replan is only submitted; the new path
+        arrives at the service's next flush(), so this frame still follows
+        the old one.
         """
         self.time_since_replan += dt
+        self.step_expansions = self._delivered_expansions
+        self._delivered_expansions = 0
 
         # 1) Replan if needed
-        if self.time_since_replan > self.replan_interval:
+        if self.scheduler is None:
+            replan = self.time_since_replan > self.replan_interval
+        else:
+            replan = self.scheduler.should_replan(self, dt, player, asteroids)
+        if replan and self.service is not None:
+            self.service.submit(self, player, asteroids, powerups)
+            self.time_since_replan = 0.0
+        elif replan:
+            started = time.perf_counter()
             self.current_path = self.plan_path(player, asteroids,powerups)
             self.time_since_replan = 0.0
+            self.hold = 0.0
+            self.step_expansions = self.last_expansions
+            if self.scheduler is not None:
+                self.scheduler.planned(self, asteroids, time.perf_counter() - started)
 
         # 2) Combat check: see if we can shoot an asteroid
         self.shoot_if_possible(player, asteroids)
@@ -65,48 +221,83 @@ class AStarAgent:
         # 3) Follow the path
         self.follow_path(dt, player)
 
+    def deliver(self, path, expansions, asteroids, elapsed):
+        """
+        Take a path planned elsewhere (by a PlanningService) as if
+        plan_path had just returned it, for `asteroids`, after `elapsed`
+        seconds of planning.
+        """
+        self.current_path = path
+        self.hold = 0.0
+        self.last_expansions = expansions
+        self._delivered_expansions += expansions
+        if self.scheduler is not None:
+            self.scheduler.planned(self, asteroids, elapsed)
+
     def shoot_if_possible(self, player, asteroids):
         """
         Find if there's an asteroid in front of the player's ship
         within some distance and angle. If yes, shoot.
+
+        Range, forward cone and closest candidate come from one pass over
+        the asteroids' position arrays. With lead_shots, an asteroid is
+        judged by where a shot fired now would meet it rather than where it
+        is, and the closest such candidate must also cover the nose
+        direction at that point, so shots aimed past it are held back.
         """
-        # If there's no asteroids, do nothing
-        if not asteroids:
+        # If there's no asteroids, or we can't shoot yet, do nothing
+        if not asteroids or player.timer > 0:
             return
 
-        # Player forward vector
+        pos, radius = asteroid_arrays(asteroids)
+        dx = pos[:, 0] - player.position.x
+        dy = pos[:, 1] - player.position.y
+        if self.lead_shots:
+            dx, dy, reachable = self.intercept(dx, dy, asteroid_velocities(asteroids))
+        dist = np.hypot(dx, dy)
+
+        # signed angle between player's forward direction and each asteroid, in (-180, 180]
         forward_vec = pygame.Vector2(0, 1).rotate(player.rotation)
+        angle = np.degrees(np.arctan2(dy, dx) - math.atan2(forward_vec.y, forward_vec.x))
+        angle = np.where(angle > 180, angle - 360, np.where(angle < -180, angle + 360, angle))
 
-        # We'll track the best candidate to shoot (closest in front)
-        best_asteroid = None
-        best_dist = float("inf")
+        in_front = (dist <= self.shoot_distance) & (np.abs(angle) < self.shoot_angle_thresh)
+        if self.lead_shots:
+            in_front &= reachable
+        if not in_front.any():
+            return
+        best = int(np.argmin(np.where(in_front, dist, np.inf)))
+        if self.lead_shots:
+            # half the angle the asteroid (plus the shot) spans at the meeting point
+            cover = np.degrees(np.arcsin(min(1.0, (radius[best] + SHOT_RADIUS) / max(dist[best], 1e-9))))
+            if abs(angle[best]) >= cover:
+                return
 
-        for asteroid in asteroids:
-            ax, ay = asteroid.position.x, asteroid.position.y
-            dx = ax - player.position.x
-            dy = ay - player.position.y
-
-            dist = math.hypot(dx, dy)
-            if dist > self.shoot_distance:
-                continue  # too far to shoot
-
-            # angle between player's forward direction and vector to the asteroid
-            angle_diff = self.angle_between(forward_vec, (dx, dy))
-
-            # If it's roughly in front
-            if abs(angle_diff) < self.shoot_angle_thresh:
-                # Check if it's the closest in front
-                if dist < best_dist:
-                    best_dist = dist
-                    best_asteroid = asteroid
-
-        # If we found an asteroid in front, try to shoot
-        if best_asteroid is not None:
-            # The player class might have a cooldown or timer.
-            # Typically in your code, you do something like:
-            if player.timer <= 0:
-                player.shoot()
-                player.timer = player.player_shoot_cooldown
+        player.shoot()
+        player.timer = player.player_shoot_cooldown
+
+    def intercept(self, dx, dy, vel):
+        """
+        Where shots fired now from the player would meet asteroids offset
+        (dx, dy) from it and moving at vel: (aim dx, aim dy, reachable), the
+        offsets of the meeting points and whether a shot catches each
+        asteroid at all. Shots fly straight at PLAYER_SHOOT_SPEED.
+        """
+        vx, vy = vel[:, 0], vel[:, 1]
+        # |d + v t| = speed * t
+        a = vx * vx + vy * vy - PLAYER_SHOOT_SPEED ** 2
+        b = 2 * (dx * vx + dy * vy)
+        c = dx * dx + dy * dy
+        disc = b * b - 4 * a * c
+        root = np.sqrt(np.maximum(disc, 0.0))
+        with np.errstate(divide="ignore", invalid="ignore"):
+            t1 = (-b - root) / (2 * a)
+            t2 = (-b + root) / (2 * a)
+        # soonest meeting in the future
+        t = np.where((t1 > 0) & ((t1 <= t2) | (t2 <= 0)), t1, t2)
+        reachable = (disc >= 0) & (a != 0) & (t > 0)
+        t = np.where(reachable, t, 0.0)
+        return dx + vx * t, dy + vy * t, reachable
 
     def angle_between(self, vecA, vecB):
         """
@@ -127,92 +318,211 @@ class AStarAgent:
         """
         1. Build a grid representation (passable / blocked).
         2. Decide on a goal cell (e.g., the cell that is farthest from all asteroids).
-        3. Run A* from player's cell to the goal cell.
+        3. Run the planner (A*, JPS, D* Lite or space-time A*) from player's cell to the goal cell.
         4. Return the path (list of grid cells).
         """
-        grid = self.build_grid(asteroids)
+        if self.planner == "spacetime" and not self.clearance_weight:
+            # one time step per cell moved at the player's speed; slice 0 is
+            # the grid the other planners would build
+            self.time_step = min(self.cell_width, self.cell_height) / player.player_speed
+            self.occupancy = self.predict_grids(asteroids, self.time_step)
+            # aim for cells that stay free over the whole horizon, if any do
+            grid = self.occupancy.all(axis=0)
+            if not grid.any():
+                grid = self.occupancy[0]
+        else:
+            grid = self.build_grid(asteroids)
+        # cost-weighted A* needs the distance from every cell to the nearest
+        # asteroid; the goal choice then reuses it
+        self.clearance = self.distance_field(asteroids) if self.clearance_weight else None
 
         # Convert player's position to a grid cell
         start_cell = self.world_to_grid(player.position.x, player.position.y)
+        goal_cell = self.choose_goal(grid, player, asteroids, powerups)
+        if goal_cell is None:
+            # No safe place found. Return empty path, might just drift or try to shoot.
+            return []
+
+        cost = self.clearance_cost(self.clearance) if self.clearance is not None else None
+        self.last_expansions = 0
+        if self.planner == "dstar" and cost is None:
+            goal_cell = self._sticky_goal(grid, asteroids, goal_cell)
+        return self.search_path(grid, start_cell, goal_cell, cost)
 
+    def choose_goal(self, grid, player, asteroids, powerups=()):
+        """
+        The cell plan_path heads for: the nearest reachable powerup, else
+        the safest cell (reusing self.clearance when set), or None when
+        every cell is blocked.
+        """
         goal_cell = self.find_best_powerup(grid,powerups,player)
         #goal_cell = self.find_safest_cell(grid, asteroids)
 
         if goal_cell is None:
             # Choose a goal cell. For example, pick the cell that
             # is farthest from all asteroids (in grid space). if unable to find powerups
-            goal_cell = self.find_safest_cell(grid, asteroids)
-        if goal_cell is None:
-            # No safe place found. Return empty path, might just drift or try to shoot.
-            return []
-
-        path = self.a_star_search(grid, start_cell, goal_cell)
-        return path
+            goal_cell = self.find_safest_cell(grid, asteroids, self.clearance)
+        return goal_cell
 
-    def build_grid(self, asteroids):
+    def search_path(self, grid, start_cell, goal_cell, cost=None):
+        """
+        Run this agent's planner from start_cell to goal_cell on `grid`.
         """
-        Return a 2D list (rows x cols) marking True if passable, False if blocked.
-        We block cells that are within `safe_distance` of any asteroid.
+        # JPS, D* Lite and space-time A* rely on uniform step costs,
+        # so clearance-weighted plans use A*
+        if self.planner == "jps" and cost is None:
+            return self.jump_point_search(grid, start_cell, goal_cell)
+        if self.planner == "dstar" and cost is None:
+            return self.incremental_search(grid, start_cell, goal_cell)
+        if self.planner == "spacetime" and cost is None:
+            return self.space_time_search(self.occupancy, start_cell, goal_cell)
+        return self.a_star_search(grid, start_cell, goal_cell, cost)
+
+    def _sticky_goal(self, grid, asteroids, goal_cell):
         """
-        # Initialize all cells as passable
-        grid = [[True for _ in range(self.grid_cols)]
-                for _ in range(self.grid_rows)]
+        The goal D* Lite is already searching toward, if it is still passable
+        and nearly as clear of asteroids as `goal_cell`; a new goal means a
+        new search tree.
+        """
+        kept = self._dstar_goal
+        if kept is None or kept == goal_cell or not grid[kept[1], kept[0]]:
+            return goal_cell
+        pos, _ = asteroid_arrays(asteroids)
+        if len(pos) == 0:
+            return kept
+        cells = [kept, goal_cell]
+        x = np.array([(c + 0.5) * self.cell_width for c, _ in cells])
+        y = np.array([(r + 0.5) * self.cell_height for _, r in cells])
+        kept_d2, best_d2 = self._nearest_squared(x, y, pos)
+        return kept if kept_d2 >= (self.goal_keep_ratio ** 2) * best_d2 else goal_cell
 
-        for asteroid in asteroids:
-            ax, ay = asteroid.position.x, asteroid.position.y
-            ar = asteroid.radius
-
-            # For each asteroid, we mark cells as blocked if they're within (ar + safe_distance).
-            block_radius = ar + self.safe_distance
-
-            # Determine which cells in a bounding box around the asteroid might be blocked
-            min_col = max(0, int((ax - block_radius) // self.cell_width))
-            max_col = min(self.grid_cols - 1,
-                          int((ax + block_radius) // self.cell_width))
-            min_row = max(0, int((ay - block_radius) // self.cell_height))
-            max_row = min(self.grid_rows - 1,
-                          int((ay + block_radius) // self.cell_height))
-
-            for row in range(min_row, max_row + 1):
-                for col in range(min_col, max_col + 1):
-                    cell_center_x = (col + 0.5) * self.cell_width
-                    cell_center_y = (row + 0.5) * self.cell_height
-                    dist = math.hypot(cell_center_x - ax, cell_center_y - ay)
-                    if dist < block_radius:
-                        grid[row][col] = False
+    def build_grid(self, asteroids):
+        """
+        Return a (rows, cols) boolean array, True where passable.
+        We block cells whose centre is within `safe_distance` of an asteroid's edge.
 
+        Asteroids sharing a blocking radius are stamped together: each gets
+        the cached cell window around its own cell, the window's cells are
+        tested against the disc in one array expression, and the blocked
+        ones are cleared in the grid.
+        """
+        grid = np.ones((self.grid_rows, self.grid_cols), dtype=bool)
+        pos, radius = asteroid_arrays(asteroids)
+        self._stamp(grid.ravel(), pos, radius)
         return grid
 
-    def find_safest_cell(self, grid, asteroids):
+    def predict_grids(self, asteroids, time_step):
         """
-        Example approach: find the cell in 'grid' that is passable and
-        has the maximum distance to the nearest asteroid center.
+        (slices, rows, cols) boolean array: build_grid() for the asteroids
+        moved on in a straight line (wrapping around the screen) to times
+        0, time_step, 2 * time_step, ... up to `horizon`. Slice 0 is the
+        current grid.
         """
-        best_cell = None
-        best_dist = -1
-
-        rows = len(grid)
-        cols = len(grid[0]) if rows > 0 else 0
+        slices = int(self.horizon / time_step) + 1
+        grids = np.ones((slices, self.grid_rows, self.grid_cols), dtype=bool)
+        pos, radius = asteroid_arrays(asteroids)
+        if len(pos) == 0:
+            return grids
+        vel = asteroid_velocities(asteroids)
+        times = np.arange(slices) * time_step
+        # (slices * n, 2), slice-major, each slice's asteroids offset into its own grid
+        moved = (pos[None] + vel[None] * times[:, None, None]).reshape(-1, 2)
+        moved %= (SCREEN_WIDTH, SCREEN_HEIGHT)
+        base = np.repeat(np.arange(slices) * grids[0].size, len(pos))
+        self._stamp(grids.ravel(), moved, np.tile(radius, slices), base)
+        return grids
+
+    def _stamp(self, flat, pos, radius, base=0):
+        """
+        Clear the cells blocked by each asteroid in the flat row-major grid
+        `flat`, offset by `base` (per asteroid, or one for all).
+        """
+        if len(pos) == 0:
+            return
+        base = np.broadcast_to(base, len(pos))
+        block_radius = radius + self.safe_distance
+        for r in np.unique(block_radius):
+            mask = block_radius == r
+            group = pos[mask]
+            dcol, drow = self._stencil(r)
+            # window cells around each asteroid's own cell, (n, width) and (n, height)
+            cols = (group[:, 0] // self.cell_width).astype(np.int64)[:, None] + dcol
+            rows = (group[:, 1] // self.cell_height).astype(np.int64)[:, None] + drow
+            dx = (cols + 0.5) * self.cell_width - group[:, 0:1]
+            dy = (rows + 0.5) * self.cell_height - group[:, 1:2]
+            cols_in = (cols >= 0) & (cols < self.grid_cols)
+            rows_in = (rows >= 0) & (rows < self.grid_rows)
+            # (n, height, width): inside the disc and on the grid
+            blocked = (
+                (np.hypot(dx[:, None, :], dy[:, :, None]) < r)
+                & cols_in[:, None, :] & rows_in[:, :, None]
+            )
+            cells = base[mask][:, None, None] + rows[:, :, None] * self.grid_cols + cols[:, None, :]
+            flat[cells[blocked]] = False
+
+    def _stencil(self, block_radius):
+        """
+        Column and row offsets, relative to an asteroid's own cell, of every
+        cell whose centre can lie within block_radius of it.
+        """
+        stencil = self._stencils.get(block_radius)
+        if stencil is None:
+            half_cols = int(math.ceil(block_radius / self.cell_width))
+            half_rows = int(math.ceil(block_radius / self.cell_height))
+            stencil = (np.arange(-half_cols, half_cols + 1), np.arange(-half_rows, half_rows + 1))
+            self._stencils[block_radius] = stencil
+        return stencil
+
+    def distance_field(self, asteroids):
+        """
+        (rows, cols) array: distance in pixels from each cell centre to the
+        nearest asteroid centre, inf when there are none.
+        """
+        pos, _ = asteroid_arrays(asteroids)
+        nearest = self._nearest_squared(self.cell_x, self.cell_y, pos)
+        return np.sqrt(nearest).reshape(self.grid_rows, self.grid_cols)
 
-        for row in range(rows):
-            for col in range(cols):
-                if not grid[row][col]:
-                    continue
-                # Center of cell in world coords
-                cx, cy = self.grid_to_world(col, row)
-                # measure distance to nearest asteroid
-                nearest_asteroid_dist = float("inf")
-                for asteroid in asteroids:
-                    dist = math.hypot(cx - asteroid.position.x,
-                                      cy - asteroid.position.y)
-                    if dist < nearest_asteroid_dist:
-                        nearest_asteroid_dist = dist
-
-                if nearest_asteroid_dist > best_dist:
-                    best_dist = nearest_asteroid_dist
-                    best_cell = (col, row)
+    def _nearest_squared(self, x, y, pos):
+        """
+        Squared distance from each point (x[i], y[i]) to the nearest of
+        `pos`, in one pass over the asteroids. They are taken in batches so
+        the (points, batch) temporary stays small on big grids.
+        """
+        nearest = np.full(len(x), np.inf)
+        batch = max(1, (1 << 16) // max(1, len(x)))
+        for i in range(0, len(pos), batch):
+            px = pos[i:i + batch, 0]
+            py = pos[i:i + batch, 1]
+            d2 = (x[:, None] - px) ** 2 + (y[:, None] - py) ** 2
+            np.minimum(nearest, d2.min(axis=1), out=nearest)
+        return nearest
+
+    def find_safest_cell(self, grid, asteroids, distance=None):
+        """
+        The passable cell farthest from the nearest asteroid centre (the
+        first one in row-major order on ties), or None if every cell is
+        blocked. `distance` is a distance_field() to reuse; without one only
+        the passable cells are measured.
+        """
+        free = np.flatnonzero(grid)
+        if len(free) == 0:
+            return None
+        if distance is None:
+            pos, _ = asteroid_arrays(asteroids)
+            nearest = self._nearest_squared(self.cell_x[free], self.cell_y[free], pos)
+        else:
+            nearest = distance.ravel()[free]
+        row, col = divmod(int(free[np.argmax(nearest)]), self.grid_cols)
+        return (col, row)
 
-        return best_cell
+    def clearance_cost(self, distance):
+        """
+        Per-cell multiplier on A* step costs, >= 1: entering a cell within
+        2 * safe_distance of an asteroid centre costs up to (1 + clearance_weight)
+        times a normal step, so paths trade length for clearance.
+        """
+        closeness = np.clip(1.0 - distance / (2 * self.safe_distance), 0.0, 1.0)
+        return 1.0 + self.clearance_weight * closeness
 
     def find_best_powerup(self,grid,powerups,player):
         best_cell = None
@@ -220,12 +530,12 @@ class AStarAgent:
         for powerup in powerups:
             powerup_cell = self.world_to_grid(powerup.position.x, powerup.position.y)
             if (
-                powerup_cell[1] < 0 or powerup_cell[1] >= len(grid) or
-                powerup_cell[0] < 0 or powerup_cell[0] >= len(grid[0])
+                powerup_cell[1] < 0 or powerup_cell[1] >= grid.shape[0] or
+                powerup_cell[0] < 0 or powerup_cell[0] >= grid.shape[1]
                 ):
                 print(f"Skipping out-of-bounds powerup cell: {powerup_cell}")
                 continue
-            if not grid[powerup_cell[1]][powerup_cell[0]]:
+            if not grid[powerup_cell[1], powerup_cell[0]]:
                 continue
 
             player_cell = self.world_to_grid(player.position.x, player.position.y)
@@ -237,61 +547,581 @@ class AStarAgent:
 
         return best_cell
 
-    def a_star_search(self, grid, start_cell, goal_cell):
+    def a_star_search(self, grid, start_cell, goal_cell, cost=None):
         """
         A standard A* search on a 2D grid.
-        - grid[row][col] indicates passability
+        - grid[row, col] indicates passability
+        - cost[row, col], if given, multiplies the cost of stepping into a cell (>= 1)
         - start_cell and goal_cell are (col, row) in grid coordinates
         - returns a list of (col, row) cells from start to goal (including goal).
+
+        Cells are flat keys into buffers reused across searches (see
+        _allocate_search); a search id stamps which entries are current, so
+        starting a search clears nothing. Open-set entries are
+        (f, g, key, parent key), which pop in the same order as the
+        (f, g, (col, row), parent) tuples they replace.
         """
 
-        rows = len(grid)
-        cols = len(grid[0]) if rows > 0 else 0
+        self.last_expansions = 0
+        passable = self._begin_search(grid, start_cell, goal_cell)
+        if passable is None:
+            return []
+        if cost is not None:
+            self._padded_cost[1:-1, 1:-1] = cost.T
+            step_scale = self._padded_cost.ravel().tolist()
+
+        search_id = self._search_id
+        g_cost, parent, seen, closed = self._g, self._parent, self._seen, self._closed
+        key_col, key_row, h_table = self._key_col, self._key_row, self._h_table
+        offsets = self._offsets
+        push, pop = heapq.heappush, heapq.heappop
+
+        gc, gr = goal_cell
+        start = self._key(*start_cell)
+        goal = self._key(gc, gr)
+        g_cost[start] = 0
+        seen[start] = search_id
+        open_set = [(0, 0, start, -1)]
+        expansions = 0
+
+        while open_set:
+            f, g, current, came_from = pop(open_set)
+            if closed[current] == search_id:
+                continue
+            closed[current] = search_id
+            parent[current] = came_from
+            expansions += 1
+
+            if current == goal:
+                self.last_expansions = expansions
+                return self._trace_back(goal)
+
+            for offset, step in offsets:
+                n = current + offset
+                if not passable[n] or closed[n] == search_id:
+                    continue
+                if cost is not None:
+                    step *= step_scale[n]
+                tentative_g = g + step
+                if seen[n] != search_id or tentative_g < g_cost[n]:
+                    g_cost[n] = tentative_g
+                    seen[n] = search_id
+                    h = h_table[abs(key_col[n] - gc)][abs(key_row[n] - gr)]
+                    push(open_set, (tentative_g + h, tentative_g, n, current))
+
+        # No path found
+        self.last_expansions = expansions
+        return []
+
+    def jump_point_search(self, grid, start_cell, goal_cell):
+        """
+        Jump Point Search: A* on the same grid, moves and step costs that
+        only expands "jump points". From each expanded cell it scans in
+        straight lines, skipping every cell whose optimal paths are also
+        reachable through the cell it came from, and stops where an
+        obstacle forces a turn. The path it returns is as short as A*'s
+        (ties may pick another equally short one), with the straight runs
+        between jump points filled in cell by cell.
+        """
+        self.last_expansions = 0
+        passable = self._begin_search(grid, start_cell, goal_cell)
+        if passable is None:
+            return []
+
+        search_id = self._search_id
+        g_cost, parent, seen, closed = self._g, self._parent, self._seen, self._closed
+        key_col, key_row, h_table = self._key_col, self._key_row, self._h_table
+        push, pop = heapq.heappush, heapq.heappop
+        stride = self._stride
 
-        # If start or goal is blocked, abort
+        gc, gr = goal_cell
+        start = self._key(*start_cell)
+        goal = self._key(gc, gr)
+        g_cost[start] = 0
+        seen[start] = search_id
+        open_set = [(0, 0, start, -1)]
+        expansions = 0
+
+        while open_set:
+            f, g, current, came_from = pop(open_set)
+            if closed[current] == search_id:
+                continue
+            closed[current] = search_id
+            parent[current] = came_from
+            expansions += 1
+
+            if current == goal:
+                self.last_expansions = expansions
+                return self._fill_jumps(self._trace_back(goal))
+
+            col, row = key_col[current], key_row[current]
+            for dcol, drow in self._jps_directions(passable, current, came_from):
+                jump = self._jump(passable, current, dcol, drow, goal)
+                if jump < 0 or closed[jump] == search_id:
+                    continue
+                # straight run, so the distance is one octile step per cell
+                run = max(abs(key_col[jump] - col), abs(key_row[jump] - row))
+                tentative_g = g + (SQRT2 * run if dcol and drow else float(run))
+                if seen[jump] != search_id or tentative_g < g_cost[jump]:
+                    g_cost[jump] = tentative_g
+                    seen[jump] = search_id
+                    h = h_table[abs(key_col[jump] - gc)][abs(key_row[jump] - gr)]
+                    push(open_set, (tentative_g + h, tentative_g, jump, current))
+
+        self.last_expansions = expansions
+        return []
+
+    def _jps_directions(self, passable, key, came_from):
+        """
+        Directions JPS scans from `key`: all eight at the start, otherwise
+        the travel direction, its components when diagonal, and the
+        "forced" turns around an obstacle beside the cell.
+        """
+        if came_from < 0:
+            return [(dcol, drow) for dcol, drow, _ in NEIGHBOUR_STEPS]
+        stride = self._stride
+        key_col, key_row = self._key_col, self._key_row
+        dcol = (key_col[key] > key_col[came_from]) - (key_col[key] < key_col[came_from])
+        drow = (key_row[key] > key_row[came_from]) - (key_row[key] < key_row[came_from])
+        if dcol and drow:
+            dirs = [(dcol, drow), (dcol, 0), (0, drow)]
+            if not passable[key - dcol * stride]:
+                dirs.append((-dcol, drow))
+            if not passable[key - drow]:
+                dirs.append((dcol, -drow))
+        elif dcol:
+            dirs = [(dcol, 0)]
+            if not passable[key + 1]:
+                dirs.append((dcol, 1))
+            if not passable[key - 1]:
+                dirs.append((dcol, -1))
+        else:
+            dirs = [(0, drow)]
+            if not passable[key + stride]:
+                dirs.append((1, drow))
+            if not passable[key - stride]:
+                dirs.append((-1, drow))
+        return dirs
+
+    def _jump(self, passable, key, dcol, drow, goal):
+        """
+        Scan from `key` in direction (dcol, drow); return the first jump
+        point (the goal, or a cell with a forced neighbour, or for diagonal
+        moves a cell whose straight scans find one), or -1 at an obstacle.
+        """
+        stride = self._stride
+        step = dcol * stride + drow
+        while True:
+            key += step
+            if not passable[key]:
+                return -1
+            if key == goal:
+                return key
+            if dcol and drow:
+                if (passable[key - dcol * stride + drow] and not passable[key - dcol * stride]) or (
+                    passable[key + dcol * stride - drow] and not passable[key - drow]
+                ):
+                    return key
+                if self._jump(passable, key, dcol, 0, goal) >= 0 or self._jump(passable, key, 0, drow, goal) >= 0:
+                    return key
+            elif dcol:
+                if (passable[key + step + 1] and not passable[key + 1]) or (
+                    passable[key + step - 1] and not passable[key - 1]
+                ):
+                    return key
+            else:
+                if (passable[key + step + stride] and not passable[key + stride]) or (
+                    passable[key + step - stride] and not passable[key - stride]
+                ):
+                    return key
+
+    def _fill_jumps(self, jumps):
+        """
+        Expand a list of jump-point cells into every cell along the way.
+        """
+        path = jumps[:1]
+        for (col, row), (ncol, nrow) in zip(jumps, jumps[1:]):
+            dcol = (ncol > col) - (ncol < col)
+            drow = (nrow > row) - (nrow < row)
+            while (col, row) != (ncol, nrow):
+                col += dcol
+                row += drow
+                path.append((col, row))
+        return path
+
+    def incremental_search(self, grid, start_cell, goal_cell):
+        """
+        D* Lite: a shortest-path tree searched backwards from the goal and
+        kept between calls. While the goal stays the same, a call only
+        repairs the cells whose passability changed since the last one and
+        whatever their change makes inconsistent, then walks the tree from
+        the (possibly moved) start, so replanning every frame costs little
+        more than the asteroids' motion. Paths are as short as A*'s.
+        """
+        self.last_expansions = 0
+        rows, cols = grid.shape
         sr, sc = start_cell[1], start_cell[0]
         gr, gc = goal_cell[1], goal_cell[0]
         if not (0 <= sr < rows and 0 <= sc < cols and 0 <= gr < rows and 0 <= gc < cols):
             return []
-        if (not grid[sr][sc]) or (not grid[gr][gc]):
+        if (not grid[sr, sc]) or (not grid[gr, gc]):
             return []
 
-        # We'll store: (f_cost, g_cost, (col, row), parent)
-        open_set = []
-        heapq.heappush(open_set, (0, 0, start_cell, None))
-        visited = set()
-        came_from = dict()
+        if self._search_shape != (rows, cols):
+            self._allocate_search(rows, cols)
+            self._dstar_goal = None
+        start = self._key(sc, sr)
+        if self._dstar_goal != (gc, gr):
+            self._dstar_begin(grid, start, (gc, gr))
+        else:
+            # the heuristic is measured from the start, so a moved start
+            # lowers every queued key by at most the distance moved
+            self._dstar_km += self._h(self._dstar_start, start)
+            self._dstar_start = start
+            self._padded[1:-1, 1:-1] = grid.T
+            changed = np.flatnonzero(self._padded.ravel() != self._dstar_passable)
+            np.copyto(self._dstar_passable, self._padded.ravel())
+            passable = self._dstar_open
+            for key in changed.tolist():
+                passable[key] = not passable[key]
+            dirty = set(changed.tolist())
+            for offset, _ in self._offsets:
+                dirty.update((changed + offset).tolist())
+            self._dstar_update(dirty)
+
+        self.last_expansions = self._dstar_compute()
+        return self._dstar_path(start)
+
+    def _dstar_begin(self, grid, start, goal_cell):
+        """
+        A fresh D* Lite tree toward goal_cell: every g and rhs unknown
+        (inf) except the goal, which is the only queued cell.
+        """
+        size = len(self._g)
+        self._padded[1:-1, 1:-1] = grid.T
+        self._dstar_passable = self._padded.ravel().copy()
+        self._dstar_open = self._dstar_passable.tolist()
+        self._dstar_g = [math.inf] * size
+        self._dstar_rhs = [math.inf] * size
+        # key each cell is queued under, None when not queued; heap entries
+        # whose key no longer matches are stale and skipped
+        self._dstar_queued = [None] * size
+        self._dstar_heap = []
+        self._dstar_km = 0.0
+        self._dstar_start = start
+        self._dstar_goal = goal_cell
+        self._dstar_goal_key = goal = self._key(*goal_cell)
+        self._dstar_rhs[goal] = 0.0
+        self._dstar_update([goal])
+
+    def _dstar_state(self):
+        """
+        Copy of the kept D* Lite tree, or None if there is none.
+        """
+        if self._dstar_goal is None:
+            return None
+        return {
+            "shape": self._search_shape,
+            "passable": self._dstar_passable.copy(),
+            "open": list(self._dstar_open),
+            "g": list(self._dstar_g),
+            "rhs": list(self._dstar_rhs),
+            "queued": list(self._dstar_queued),
+            "heap": list(self._dstar_heap),
+            "km": self._dstar_km,
+            "start": self._dstar_start,
+            "goal": self._dstar_goal,
+        }
+
+    def _set_dstar_state(self, state):
+        """
+        Restore a _dstar_state() copy (None: no tree, the next D* Lite
+        replan starts a fresh one). The copy stays reusable.
+        """
+        if state is None:
+            self._dstar_goal = None
+            return
+        if self._search_shape != state["shape"]:
+            self._allocate_search(*state["shape"])
+        self._dstar_passable = state["passable"].copy()
+        self._dstar_open = list(state["open"])
+        self._dstar_g = list(state["g"])
+        self._dstar_rhs = list(state["rhs"])
+        self._dstar_queued = list(state["queued"])
+        self._dstar_heap = list(state["heap"])
+        self._dstar_km = state["km"]
+        self._dstar_start = state["start"]
+        self._dstar_goal = state["goal"]
+        self._dstar_goal_key = self._key(*state["goal"])
+
+    def _h(self, a, b):
+        key_col, key_row = self._key_col, self._key_row
+        return self._h_table[abs(key_col[a] - key_col[b])][abs(key_row[a] - key_row[b])]
+
+    def _dstar_update(self, keys):
+        """
+        Recompute each cell's one-step lookahead (rhs) from its neighbours
+        and (re)queue the ones that leaves inconsistent. Takes a batch so
+        the per-cell work stays inline.
+        """
+        g, rhs, queued, heap = self._dstar_g, self._dstar_rhs, self._dstar_queued, self._dstar_heap
+        passable, offsets = self._dstar_open, self._offsets
+        goal, km = self._dstar_goal_key, self._dstar_km
+        h_table, key_col, key_row = self._h_table, self._key_col, self._key_row
+        scol, srow = key_col[self._dstar_start], key_row[self._dstar_start]
+        push = heapq.heappush
+        for key in keys:
+            if key != goal:
+                best = math.inf
+                if passable[key]:
+                    for offset, step in offsets:
+                        n = key + offset
+                        if passable[n] and step + g[n] < best:
+                            best = step + g[n]
+                rhs[key] = best
+            if g[key] != rhs[key]:
+                m = g[key] if g[key] < rhs[key] else rhs[key]
+                k = (m + h_table[abs(key_col[key] - scol)][abs(key_row[key] - srow)] + km, m)
+                queued[key] = k
+                push(heap, (k[0], k[1], key))
+            else:
+                queued[key] = None
+
+    def _dstar_compute(self):
+        """
+        Pop inconsistent cells until the start's distance is settled;
+        returns the number of cells expanded.
+        """
+        g, rhs, queued, heap = self._dstar_g, self._dstar_rhs, self._dstar_queued, self._dstar_heap
+        passable = self._dstar_open
+        offsets = self._offsets
+        update = self._dstar_update
+        start, km = self._dstar_start, self._dstar_km
+        h_table, key_col, key_row = self._h_table, self._key_col, self._key_row
+        scol, srow = key_col[start], key_row[start]
+        expansions = 0
+        while heap:
+            k1, k2, key = heap[0]
+            if queued[key] != (k1, k2):
+                heapq.heappop(heap)
+                continue
+            # keys are float sums, so a cell whose k1 ties the start's may
+            # round either side of it and sort anywhere among the ties: expand
+            # every tie rather than trusting the k2 order
+            if rhs[start] == g[start] and k1 > min(g[start], rhs[start]) + km + 1e-9:
+                break
+            heapq.heappop(heap)
+            queued[key] = None
+            expansions += 1
+            m = g[key] if g[key] < rhs[key] else rhs[key]
+            new_key = (m + h_table[abs(key_col[key] - scol)][abs(key_row[key] - srow)] + km, m)
+            if (k1, k2) < new_key:
+                queued[key] = new_key
+                heapq.heappush(heap, (new_key[0], new_key[1], key))
+                continue
+            neighbours = [key + offset for offset, _ in offsets if passable[key + offset]]
+            if g[key] > rhs[key]:
+                g[key] = rhs[key]
+            else:
+                g[key] = math.inf
+                neighbours.append(key)
+            update(neighbours)
+        if len(heap) > 4 * len(g):
+            # drop stale entries so the heap doesn't grow across replans
+            self._dstar_heap = [(k[0], k[1], i) for i, k in enumerate(queued) if k is not None]
+            heapq.heapify(self._dstar_heap)
+        return expansions
+
+    def _dstar_path(self, start):
+        """
+        Follow the tree from start: each step goes to the neighbour with
+        the smallest step + g, until the goal.
+        """
+        g, passable = self._dstar_g, self._dstar_open
+        if g[start] == math.inf:
+            return []
+        goal = self._dstar_goal_key
+        key_col, key_row = self._key_col, self._key_row
+        path = [(key_col[start], key_row[start])]
+        key = start
+        for _ in range(len(g)):
+            if key == goal:
+                return path
+            best, best_key = math.inf, -1
+            for offset, step in self._offsets:
+                n = key + offset
+                if passable[n] and step + g[n] < best:
+                    best, best_key = step + g[n], n
+            if best_key < 0:
+                return []
+            key = best_key
+            path.append((key_col[key], key_row[key]))
+        return []
 
-        # G cost dictionary
-        g_costs = {start_cell: 0}
+    def space_time_search(self, occupancy, start_cell, goal_cell):
+        """
+        A* over (cell, time) against predicted occupancy, a predict_grids()
+        array. Moving to a neighbour takes its step cost in time steps
+        (1 or sqrt 2) and staying put takes one, and a move is only allowed
+        into a cell that is free in the slice it is reached in. Past the
+        last slice the grid stops changing, so waiting there is pointless
+        and not tried. Returns (col, row) cells from start to goal, with a
+        cell repeated once per time step to wait in it; if the goal can't
+        be reached, the path to the reached cell nearest it instead. The
+        start may be blocked already: the player is there regardless.
+
+        States are flat keys slice * cells + key, into buffers stamped with
+        the A* search id as in a_star_search.
+        """
+        self.last_expansions = 0
+        slices, rows, cols = occupancy.shape
+        sc, sr = start_cell
+        gc, gr = goal_cell
+        if not (0 <= sr < rows and 0 <= sc < cols and 0 <= gr < rows and 0 <= gc < cols):
+            return []
+        if self._search_shape != (rows, cols):
+            self._allocate_search(rows, cols)
+        self._search_id += 1
+        size = self._padded.size
+        if len(self._st_g) < slices * size:
+            self._st_g = [0.0] * (slices * size)
+            self._st_parent = [-1] * (slices * size)
+            self._st_seen = [0] * (slices * size)
+            self._st_closed = [0] * (slices * size)
+        # (slices, cols + 2, rows + 2): every slice padded and keyed like the grid
+        padded = np.zeros((slices,) + self._padded.shape, dtype=bool)
+        padded[:, 1:-1, 1:-1] = occupancy.transpose(0, 2, 1)
+        passable = padded.ravel().tolist()
+
+        search_id = self._search_id
+        g_cost, parent, seen, closed = self._st_g, self._st_parent, self._st_seen, self._st_closed
+        key_col, key_row, h_table = self._key_col, self._key_row, self._h_table
+        moves = self._offsets + [(0, 1.0)]
+        last = slices - 1
+        push, pop = heapq.heappush, heapq.heappop
+
+        start = self._key(sc, sr)
+        goal = self._key(gc, gr)
+        g_cost[start] = 0
+        seen[start] = search_id
+        open_set = [(0, 0, start, -1)]
+        expansions = 0
+        # closest state to the goal reached so far, (h, -g, state)
+        nearest = (math.inf, 0, start)
 
         while open_set:
-            f, g, current, parent = heapq.heappop(open_set)
-            if current in visited:
+            f, g, current, came_from = pop(open_set)
+            if closed[current] == search_id:
                 continue
-            visited.add(current)
-            came_from[current] = parent
+            closed[current] = search_id
+            parent[current] = came_from
+            expansions += 1
+
+            t, key = divmod(current, size)
+            if key == goal:
+                break
+            if (f - g, -g) < nearest[:2]:
+                nearest = (f - g, -g, current)
+
+            for offset, step in moves:
+                if not offset and t == last:
+                    continue
+                tentative_g = g + step
+                # the slice the move ends in; g counts time steps
+                n = min(last, int(tentative_g + 0.5)) * size + key + offset
+                if not passable[n] or closed[n] == search_id:
+                    continue
+                if seen[n] != search_id or tentative_g < g_cost[n]:
+                    g_cost[n] = tentative_g
+                    seen[n] = search_id
+                    h = h_table[abs(key_col[key + offset] - gc)][abs(key_row[key + offset] - gr)]
+                    push(open_set, (tentative_g + h, tentative_g, n, current))
+        else:
+            # goal unreachable in time: head for the closest state that is
+            current = nearest[2]
 
-            if current == goal_cell:
-                # found path
-                return self._reconstruct_path(came_from, current)
+        self.last_expansions = expansions
+        path = []
+        while current != -1:
+            key = current % size
+            path.append((key_col[key], key_row[key]))
+            current = parent[current]
+        path.reverse()
+        return path
 
-            # Explore neighbors (8 directions or 4 directions).
-            neighbors = self.get_neighbors(current, grid)
-            for ncol, nrow in neighbors:
-                if (ncol, nrow) in visited:
-                    continue
-                tentative_g = g + self.distance(current, (ncol, nrow))
-                old_g = g_costs.get((ncol, nrow), float("inf"))
-                if tentative_g < old_g:
-                    g_costs[(ncol, nrow)] = tentative_g
-                    h = self.distance((ncol, nrow), goal_cell)
-                    f_cost = tentative_g + h
-                    heapq.heappush(
-                        open_set, (f_cost, tentative_g, (ncol, nrow), current))
+    def _begin_search(self, grid, start_cell, goal_cell):
+        """
+        Shared search setup: None if start or goal is off the grid or
+        blocked, else the padded passability list for this search, with a
+        fresh search id.
+        """
+        rows, cols = grid.shape
+        sr, sc = start_cell[1], start_cell[0]
+        gr, gc = goal_cell[1], goal_cell[0]
+        if not (0 <= sr < rows and 0 <= sc < cols and 0 <= gr < rows and 0 <= gc < cols):
+            return None
+        if (not grid[sr, sc]) or (not grid[gr, gc]):
+            return None
 
-        # No path found
-        return []
+        if self._search_shape != (rows, cols):
+            self._allocate_search(rows, cols)
+        self._padded[1:-1, 1:-1] = grid.T
+        self._search_id += 1
+        return self._padded.ravel().tolist()
+
+    def _key(self, col, row):
+        return (col + 1) * self._stride + row + 1
+
+    def _trace_back(self, key):
+        """
+        (col, row) cells from the search's start to `key`, following parents.
+        """
+        path = []
+        while key != -1:
+            path.append((self._key_col[key], self._key_row[key]))
+            key = self._parent[key]
+        path.reverse()
+        return path
+
+    def _allocate_search(self, rows, cols):
+        """
+        Buffers for a_star_search on a rows x cols grid. A cell's key is
+        (col + 1) * (rows + 2) + (row + 1): column-major over the grid plus
+        a blocked border ring, so keys sort like (col, row) tuples and a
+        neighbour is key + offset with no bounds check.
+        """
+        stride = rows + 2
+        size = (cols + 2) * stride
+        self._search_shape = (rows, cols)
+        self._stride = stride
+        self._offsets = [(dcol * stride + drow, step) for dcol, drow, step in NEIGHBOUR_STEPS]
+        self._padded = np.zeros((cols + 2, stride), dtype=bool)
+        self._padded_cost = np.ones((cols + 2, stride))
+
+        # per-key search state; an entry is current only if stamped with the search id
+        self._g = [0.0] * size
+        self._parent = [-1] * size
+        self._seen = [0] * size
+        self._closed = [0] * size
+        self._search_id = 0
+        # space-time search state, one block of keys per time slice; grown on use
+        self._st_g = []
+        self._st_parent = []
+        self._st_seen = []
+        self._st_closed = []
+
+        key = np.arange(size)
+        self._key_col = (key // stride - 1).tolist()
+        self._key_row = (key % stride - 1).tolist()
+
+        # heuristic by |dcol|, |drow| to the goal
+        if self.heuristic == "octile":
+            self._h_table = [
+                [max(dc, dr) + (SQRT2 - 1) * min(dc, dr) for dr in range(rows)]
+                for dc in range(cols)
+            ]
+        else:
+            self._h_table = [[math.hypot(dc, dr) for dr in range(rows)] for dc in range(cols)]
 
     def get_neighbors(self, cell, grid):
         """
@@ -299,8 +1129,7 @@ class AStarAgent:
         We can use 8-direction adjacency for a smoother path.
         """
         (col, row) = cell
-        rows = len(grid)
-        cols = len(grid[0]) if rows > 0 else 0
+        rows, cols = grid.shape
 
         neighbors = []
         for dcol in [-1, 0, 1]:
@@ -310,7 +1139,7 @@ class AStarAgent:
                 ncol = col + dcol
                 nrow = row + drow
                 if 0 <= ncol < cols and 0 <= nrow < rows:
-                    if grid[nrow][ncol]:
+                    if grid[nrow, ncol]:
                         neighbors.append((ncol, nrow))
 
         return neighbors
@@ -324,17 +1153,6 @@ class AStarAgent:
         (colB, rowB) = cell_b
         return math.hypot(colA - colB, rowA - rowB)
 
-    def _reconstruct_path(self, came_from, current):
-        """
-        Reconstruct the path from A* came_from map.
-        """
-        path = []
-        while current is not None:
-            path.append(current)
-            current = came_from[current]
-        path.reverse()
-        return path
-
     def world_to_grid(self, wx, wy):
         """
         Convert world (pixel) coordinates to (col, row) in the grid.
@@ -356,6 +1174,9 @@ class AStarAgent:
         Move along A* path if we have one. 
         Possibly mix in logic to chase an asteroid if you want to be aggressive.
         """
+        if self.hold > 0:
+            self.hold -= dt
+            return
         if not self.current_path:
             return
         
@@ -365,7 +1186,11 @@ class AStarAgent:
         dist = math.hypot(player.position.x - next_world_x,
                           player.position.y - next_world_y)
         if dist < 10:
-            self.current_path.pop(0)
+            cell = self.current_path.pop(0)
+            # a repeated cell means wait there a time step
+            while self.current_path and self.current_path[0] == cell:
+                self.current_path.pop(0)
+                self.hold += self.time_step
             return
 
         desired_angle = math.degrees(math.atan2(
@@ -0,0 +1,329 @@
+import heapq
+import math
+
+import numpy as np
+
+SQRT2 = math.sqrt(2)
+# 8-neighbour moves (drow, dcol) with their octile step costs
+STEPS = [
+    (drow, dcol, SQRT2 if drow and dcol else 1.0)
+    for drow in (-1, 0, 1) for dcol in (-1, 0, 1) if drow or dcol
+]
+# Runs of free cells shared across a cluster border at least this long get a
+# transition at each end, shorter ones a single one in the middle
+LONG_ENTRANCE = 6
+
+
+class ClusterGraph:
+    """
+    HPA* abstraction of a passability grid, for searching big grids.
+
+    The grid is cut into cluster_size x cluster_size clusters. Where two
+    clusters share a run of free border cells there is an entrance, and
+    the cells either side of it are the abstract graph's nodes, joined by
+    a one-step edge. Within each cluster, every entrance cell keeps a
+    distance field over the cluster, which gives both the intra-cluster
+    edges to the other entrances and, walked downhill, the cells between
+    them.
+
+    update() takes each new grid and drops only the clusters whose cells
+    or entrances changed; their fields are recomputed when a search first
+    reaches them, so clusters off the route cost nothing. find_path()
+    searches the abstract graph and turns only as many of its legs into
+    cells as asked for.
+
+    Grid cells are (col, row) as in AStarAgent. The grid is padded with
+    blocked cells up to whole clusters.
+    """
+
+    def __init__(self, shape, cluster_size=16):
+        self.rows, self.cols = shape
+        self.cluster_size = cluster_size
+        self.cluster_rows = -(-self.rows // cluster_size)
+        self.cluster_cols = -(-self.cols // cluster_size)
+        self.width = self.cluster_cols * cluster_size
+        self.grid = np.zeros((self.cluster_rows * cluster_size, self.width), dtype=bool)
+        # cluster index -> (entrance cells, (entrances, size, size) distance
+        # fields, [[(entrance j, distance), ...] per entrance i])
+        self._clusters = {}
+        self._entrances = None
+        # Clusters recomputed since the last update(), abstract nodes
+        # expanded by the last find_path()
+        self.rebuilt = 0
+        self.expansions = 0
+
+    def update(self, grid):
+        """
+        Take a new (rows, cols) passability grid. Clusters whose cells or
+        entrances it changed are dropped, to be recomputed when a search
+        next reaches them.
+        """
+        old = self._blocks().copy()
+        self.grid[:self.rows, :self.cols] = grid
+        changed = (self._blocks() != old).any(axis=(2, 3)).ravel()
+
+        entrances, cross = self._find_entrances()
+        for ci in range(len(entrances)):
+            if changed[ci] or self._entrances is None or self._entrances[ci] != entrances[ci]:
+                self._clusters.pop(ci, None)
+        self._entrances = entrances
+        self.cross = cross
+        # entrance cell -> (cluster, index among its entrances)
+        self._where = {
+            cell: (ci, i) for ci, cells in enumerate(entrances) for i, cell in enumerate(cells)
+        }
+        self.rebuilt = 0
+
+    def _cluster_data(self, ci):
+        """
+        (entrance cells, distance fields, intra-cluster edges) of cluster
+        ci, computed on first use after it changed.
+        """
+        data = self._clusters.get(ci)
+        if data is not None:
+            return data
+        size = self.cluster_size
+        cells = self._entrances[ci]
+        local = [self._local(cell) for cell in cells]
+        block = self._blocks().reshape(-1, size, size)[ci]
+        field = self._relax(np.broadcast_to(block, (len(cells), size, size)), local)
+        edges = [
+            [(j, float(field[i][r, c])) for j, (r, c) in enumerate(local)
+             if j != i and field[i][r, c] < math.inf]
+            for i in range(len(cells))
+        ]
+        data = self._clusters[ci] = (cells, field, edges)
+        self.rebuilt += 1
+        return data
+
+    def find_path(self, start_cell, goal_cell, min_cells=None):
+        """
+        (col, row) cells from start_cell toward goal_cell, both passable in
+        the last update()'s grid. The abstract path is refined leg by leg
+        only until it is min_cells long (all of it when None), so the path
+        may stop short of the goal. Empty if the goal can't be reached.
+        Abstract paths may be a little longer than the grid's shortest.
+        """
+        self.expansions = 0
+        size = self.cluster_size
+        start = start_cell[1] * self.width + start_cell[0]
+        goal = goal_cell[1] * self.width + goal_cell[0]
+        start_ci, goal_ci = self._cluster(start), self._cluster(goal)
+        blocks = self._blocks().reshape(-1, size, size)
+        start_field, goal_field = self._relax(
+            blocks[[start_ci, goal_ci]], [self._local(start), self._local(goal)]
+        )
+
+        legs = self._search(start, goal, start_ci, goal_ci, start_field, goal_field)
+        if not legs:
+            return []
+        path = [start_cell]
+        for a, b in zip(legs, legs[1:]):
+            if min_cells is not None and len(path) >= min_cells:
+                break
+            if self._cluster(a) != self._cluster(b):
+                # across a border: one step
+                path.append((b % self.width, b // self.width))
+                continue
+            if b == goal:
+                field = goal_field
+            else:
+                ci, j = self._where[b]
+                field = self._cluster_data(ci)[1][j]
+            path.extend(self._descend(field, a))
+        return path
+
+    def _search(self, start, goal, start_ci, goal_ci, start_field, goal_field):
+        """
+        A* over the abstract graph with start and goal joined to their
+        clusters' entrances; returns the node cells from start to goal.
+        """
+        width = self.width
+        goal_row, goal_col = divmod(goal, width)
+        g_cost = {start: 0.0}
+        parent = {}
+        open_set = [(0.0, 0.0, start, -1)]
+        expansions = 0
+        while open_set:
+            f, g, current, came_from = heapq.heappop(open_set)
+            if current in parent:
+                continue
+            parent[current] = came_from
+            expansions += 1
+            if current == goal:
+                break
+            for n, step in self._neighbours(current, start, goal, start_ci, goal_ci, start_field, goal_field):
+                tentative_g = g + step
+                if n not in parent and tentative_g < g_cost.get(n, math.inf):
+                    g_cost[n] = tentative_g
+                    row, col = divmod(n, width)
+                    h = math.hypot(row - goal_row, col - goal_col)
+                    heapq.heappush(open_set, (tentative_g + h, tentative_g, n, current))
+        self.expansions = expansions
+        if goal not in parent:
+            return []
+        legs = []
+        while goal != -1:
+            legs.append(goal)
+            goal = parent[goal]
+        legs.reverse()
+        return legs
+
+    def _neighbours(self, cell, start, goal, start_ci, goal_ci, start_field, goal_field):
+        if cell == start:
+            # the start reaches its own cluster's entrances (and the goal
+            # if it's there) through the start's distance field
+            for e in self._entrances[start_ci]:
+                d = start_field[self._local(e)]
+                if d < math.inf:
+                    yield e, float(d)
+            if goal_ci == start_ci and start_field[self._local(goal)] < math.inf:
+                yield goal, float(start_field[self._local(goal)])
+        where = self._where.get(cell)
+        if where is None:
+            return
+        ci, i = where
+        cells, _, edges = self._cluster_data(ci)
+        for j, d in edges[i]:
+            yield cells[j], d
+        for n in self.cross[cell]:
+            yield n, 1.0
+        if ci == goal_ci and goal_field[self._local(cell)] < math.inf:
+            yield goal, float(goal_field[self._local(cell)])
+
+    def _descend(self, field, cell):
+        """
+        Cells after `cell` down `field` to its source (distance 0), each
+        step to the neighbour with the smallest step + distance.
+        """
+        size = self.cluster_size
+        base_row, base_col = divmod(cell, self.width)
+        base_row -= base_row % size
+        base_col -= base_col % size
+        r, c = self._local(cell)
+        cells = []
+        while field[r, c] > 0:
+            best, best_rc = math.inf, None
+            for drow, dcol, step in STEPS:
+                nr, nc = r + drow, c + dcol
+                if 0 <= nr < size and 0 <= nc < size and step + field[nr, nc] < best:
+                    best, best_rc = step + field[nr, nc], (nr, nc)
+            r, c = best_rc
+            cells.append((base_col + c, base_row + r))
+        return cells
+
+    def _relax(self, passable, sources):
+        """
+        (n, size, size) distance fields over n cluster blocks, each from
+        one source cell (local (row, col)), inf where unreachable. In an
+        all-free block that is the octile distance; the other fields relax
+        together, one neighbour step per round, until none changes.
+        """
+        n, size = len(passable), self.cluster_size
+        # float32 halves the memory traffic; the fields are small distances
+        rows, cols = np.array(sources, dtype=np.int64).reshape(-1, 2).T
+        local = np.arange(size)
+        drow = np.abs(local[None, :, None] - rows[:, None, None])
+        dcol = np.abs(local[None, None, :] - cols[:, None, None])
+        fields = (np.maximum(drow, dcol) + (SQRT2 - 1) * np.minimum(drow, dcol)).astype(np.float32)
+
+        walled = np.flatnonzero(~passable.reshape(n, -1).all(axis=1))
+        if len(walled) == 0:
+            return fields
+        m = len(walled)
+        dist = np.full((m, size + 2, size + 2), np.inf, dtype=np.float32)
+        dist[np.arange(m), rows[walled] + 1, cols[walled] + 1] = 0.0
+        inner = dist[:, 1:-1, 1:-1]
+        blocked = ~passable[walled]
+
+        def shifted(drow, dcol):
+            return dist[:, 1 + drow:size + 1 + drow, 1 + dcol:size + 1 + dcol]
+
+        orth, diag = np.empty_like(inner), np.empty_like(inner)
+        for _ in range(size * size):
+            np.minimum(shifted(-1, 0), shifted(1, 0), out=orth)
+            np.minimum(orth, shifted(0, -1), out=orth)
+            np.minimum(orth, shifted(0, 1), out=orth)
+            orth += 1.0
+            np.minimum(shifted(-1, -1), shifted(-1, 1), out=diag)
+            np.minimum(diag, shifted(1, -1), out=diag)
+            np.minimum(diag, shifted(1, 1), out=diag)
+            diag += SQRT2
+            np.minimum(orth, diag, out=orth)
+            np.copyto(orth, np.inf, where=blocked)
+            if not (orth < inner).any():
+                break
+            np.minimum(inner, orth, out=inner)
+        fields[walled] = inner
+        return fields
+
+    def _find_entrances(self):
+        """
+        Entrance cells of every cluster (sorted flat cells) and, per
+        entrance cell, the cells across the border it steps to.
+        """
+        size, grid, width = self.cluster_size, self.grid, self.width
+        pairs = []
+        # vertical borders, between columns x - 1 and x
+        xs = np.arange(1, self.cluster_cols) * size
+        if len(xs):
+            both = (grid[:, xs - 1] & grid[:, xs]).T.reshape(-1, size)
+            seg, off = self._transitions(both)
+            border, cluster_row = divmod(seg, self.cluster_rows)
+            row = cluster_row * size + off
+            pairs.append((row * width + xs[border] - 1, row * width + xs[border]))
+        # horizontal borders, between rows y - 1 and y
+        ys = np.arange(1, self.cluster_rows) * size
+        if len(ys):
+            both = (grid[ys - 1, :] & grid[ys, :]).reshape(-1, size)
+            seg, off = self._transitions(both)
+            border, cluster_col = divmod(seg, self.cluster_cols)
+            col = cluster_col * size + off
+            pairs.append(((ys[border] - 1) * width + col, ys[border] * width + col))
+
+        clusters = self.cluster_rows * self.cluster_cols
+        if not pairs:
+            return [[] for _ in range(clusters)], {}
+        a_cells = np.concatenate([a for a, _ in pairs])
+        b_cells = np.concatenate([b for _, b in pairs])
+        cells = np.unique(np.concatenate((a_cells, b_cells)))
+        row, col = np.divmod(cells, width)
+        owner = (row // size) * self.cluster_cols + col // size
+        order = np.argsort(owner, kind="stable")
+        bounds = np.cumsum(np.bincount(owner, minlength=clusters))[:-1]
+        entrances = [part.tolist() for part in np.split(cells[order], bounds)]
+
+        cross = {}
+        for a, b in zip(a_cells.tolist(), b_cells.tolist()):
+            cross.setdefault(a, []).append(b)
+            cross.setdefault(b, []).append(a)
+        return entrances, cross
+
+    @staticmethod
+    def _transitions(both):
+        """
+        (segment, offset) of the transitions along each row of `both`, a
+        (segments, length) array of border cells free on both sides.
+        """
+        edges = np.diff(np.pad(both.astype(np.int8), ((0, 0), (1, 1))), axis=1)
+        seg, start = np.nonzero(edges == 1)
+        _, end = np.nonzero(edges == -1)
+        long = end - start >= LONG_ENTRANCE
+        seg = np.concatenate((seg[~long], seg[long], seg[long]))
+        off = np.concatenate(((start + end - 1)[~long] // 2, start[long], end[long] - 1))
+        return seg, off
+
+    def _blocks(self):
+        """
+        (cluster_rows, cluster_cols, size, size) view of the padded grid.
+        """
+        size = self.cluster_size
+        return self.grid.reshape(self.cluster_rows, size, self.cluster_cols, size).swapaxes(1, 2)
+
+    def _cluster(self, cell):
+        row, col = divmod(cell, self.width)
+        return (row // self.cluster_size) * self.cluster_cols + col // self.cluster_size
+
+    def _local(self, cell):
+        row, col = divmod(cell, self.width)
+        return (row % self.cluster_size, col % self.cluster_size)
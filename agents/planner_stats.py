@@ -0,0 +1,150 @@
+import time
+
+# AStarAgent methods PlannerStats times, under their own names. plan_path
+# covers a whole replan; the searches are the planners it may dispatch to.
+PHASES = (
+    "plan_path",
+    "build_grid",
+    "predict_grids",
+    "find_best_powerup",
+    "find_safest_cell",
+    "a_star_search",
+    "jump_point_search",
+    "incremental_search",
+    "space_time_search",
+    "follow_path",
+)
+# Per-replan counts kept next to the phase timers
+COUNTS = ("replans", "failures", "expansions", "path_cells")
+
+
+class PlannerStats:
+    """
+    Timers and counters for one AStarAgent (built with instrument=True):
+    seconds and calls per phase in PHASES, plus replans, failures (replans
+    that found no path), nodes expanded and path length in cells.
+
+    attach() wraps the agent's own methods with timing shims on the
+    instance, so an agent built without instrument=True runs exactly the
+    code it always did; nothing is checked or counted on that path.
+    Replans a PlanningService delivers count too, but only the phases
+    that ran on this agent (the service builds grids in its own batch,
+    and pooled searches run in other processes).
+
+    Counts are kept per episode: new_episode() (called by the agent's
+    reset()) folds the current one into the running totals.
+    """
+
+    def __init__(self):
+        self.episodes = 0
+        self.episode = self._empty()
+        self.totals = self._empty()
+
+    @staticmethod
+    def _empty():
+        counts = {name: 0 for name in COUNTS}
+        counts["seconds"] = {phase: 0.0 for phase in PHASES}
+        counts["calls"] = {phase: 0 for phase in PHASES}
+        return counts
+
+    def attach(self, agent):
+        """
+        Time every PHASES method of `agent`, and count its replans.
+        """
+        for phase in PHASES:
+            setattr(agent, phase, self._timed(phase, getattr(agent, phase)))
+        plan_path = agent.plan_path
+        deliver = agent.deliver
+
+        def counted_plan_path(*args, **kwargs):
+            path = plan_path(*args, **kwargs)
+            self.record(path, agent.last_expansions)
+            return path
+
+        def counted_deliver(path, expansions, *args, **kwargs):
+            deliver(path, expansions, *args, **kwargs)
+            self.record(path, expansions)
+
+        agent.plan_path = counted_plan_path
+        agent.deliver = counted_deliver
+
+    def _timed(self, phase, method):
+        seconds = self.episode["seconds"]
+        calls = self.episode["calls"]
+        clock = time.perf_counter
+
+        def timed(*args, **kwargs):
+            started = clock()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                seconds[phase] += clock() - started
+                calls[phase] += 1
+
+        # new_episode() clears the episode dicts in place, so the shim's
+        # references stay current
+        return timed
+
+    def record(self, path, expansions):
+        """
+        Count one replan that found `path` (empty: a failure) after
+        expanding `expansions` nodes.
+        """
+        episode = self.episode
+        episode["replans"] += 1
+        episode["failures"] += not path
+        episode["expansions"] += expansions
+        episode["path_cells"] += len(path)
+
+    def new_episode(self):
+        """
+        Add the current episode to the totals and start counting a new one.
+        """
+        if _active(self.episode):
+            _add(self.totals, self.episode)
+            self.episodes += 1
+        for name in COUNTS:
+            self.episode[name] = 0
+        for phase in PHASES:
+            self.episode["seconds"][phase] = 0.0
+            self.episode["calls"][phase] = 0
+
+    def summary(self, totals=False):
+        """
+        Flat dict for logging: the current episode's counts (or, with
+        totals=True, every episode's so far including this one), the mean
+        expansions and path cells per replan, and for each phase that ran
+        its total ms, calls and mean ms per call.
+        """
+        counts = self.episode
+        if totals:
+            counts = self._empty()
+            _add(counts, self.totals)
+            _add(counts, self.episode)
+        replans = counts["replans"]
+        out = {name: counts[name] for name in COUNTS}
+        out["expansions_per_replan"] = counts["expansions"] / replans if replans else 0.0
+        out["path_cells_per_replan"] = counts["path_cells"] / replans if replans else 0.0
+        if totals:
+            out["episodes"] = self.episodes + _active(self.episode)
+        for phase in PHASES:
+            calls = counts["calls"][phase]
+            if not calls:
+                continue
+            ms = counts["seconds"][phase] * 1e3
+            out[f"{phase}_ms"] = ms
+            out[f"{phase}_calls"] = calls
+            out[f"{phase}_mean_ms"] = ms / calls
+        return out
+
+
+def _active(counts):
+    return bool(counts["replans"] or counts["calls"]["follow_path"])
+
+
+def _add(into, counts):
+    for name in COUNTS:
+        into[name] += counts[name]
+    for phase in PHASES:
+        into["seconds"][phase] += counts["seconds"][phase]
+        into["calls"][phase] += counts["calls"][phase]
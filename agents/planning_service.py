@@ -0,0 +1,195 @@
+import math
+import time
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from types import SimpleNamespace
+
+import numpy as np
+import pygame
+
+from a_star import AStarAgent, asteroid_arrays
+
+# Planners a PlanningService can run: searches that need nothing but the
+# grid. D* Lite keeps a search tree per agent and space-time A* plans on
+# predicted occupancy, so agents using them plan for themselves.
+SERVICE_PLANNERS = ("astar", "jps")
+
+# A queued replan: the player's position and speed and the asteroids (with
+# their position and radius arrays) and powerups at submit time
+Request = namedtuple("Request", "player asteroids pos radius powerups")
+
+
+class PlanningService:
+    """
+    Plans for many AStarAgents at once, e.g. one per env in a process.
+
+    Agents built with service=... submit their replans here instead of
+    running them. flush(), called once per tick after every env has
+    stepped, then:
+
+      - builds all the submitted grids in one stamping pass: agents with
+        the same grid geometry share a (requests, rows, cols) array and
+        every asteroid is stamped into its own request's slice at once
+      - picks each agent's goal (and clearance costs, if it uses them)
+      - runs the searches, in this process (workers=0, the default) or
+        spread over a pool of `workers` processes, one chunk per worker
+      - hands each agent its path, which it starts following on its next
+        update()
+
+    So a replan lands one frame later than an agent planning for itself,
+    and a submitted replan must be flushed before the next tick. Paths
+    are the ones plan_path would find on the same grids: the worker
+    processes run the same search code on agents of the same grid size,
+    heuristic and planner.
+
+    The worker pool is experimental. It has only been measured on a single
+    CPU, where pickling requests and paths costs more than the searches
+    it moves off the process (see benchmarks/bench_planning_service.py).
+    Whether it scales with cores is unverified, so keep workers=0 unless
+    a multi-core run of that benchmark shows a gain.
+
+    stats counts "flushes", "requests" and "seconds" spent in flush().
+    """
+
+    planners = SERVICE_PLANNERS
+
+    def __init__(self, workers=0):
+        self.workers = workers
+        self._pool = None
+        # agent -> its latest request; a second submit before a flush replaces the first
+        self._pending = {}
+        self.stats = {"flushes": 0, "requests": 0, "seconds": 0.0}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        """
+        Shut the worker pool down; flush() starts a new one if called again.
+        """
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def submit(self, agent, player, asteroids, powerups=()):
+        """
+        Queue a replan for `agent` from the player and asteroids as they
+        are now.
+        """
+        pos, radius = asteroid_arrays(asteroids)
+        player = SimpleNamespace(position=pygame.Vector2(player.position), player_speed=player.player_speed)
+        self._pending[agent] = Request(player, asteroids, pos, radius, tuple(powerups))
+
+    def cancel(self, agent):
+        """
+        Drop `agent`'s queued replan, if any.
+        """
+        self._pending.pop(agent, None)
+
+    @property
+    def pending(self):
+        return len(self._pending)
+
+    def flush(self):
+        """
+        Plan every queued replan and deliver the paths. Returns how many
+        were planned.
+        """
+        if not self._pending:
+            return 0
+        started = time.perf_counter()
+        requests = list(self._pending.items())
+        self._pending.clear()
+        grids = self.build_grids(requests)
+
+        tasks = []
+        for (agent, request), grid in zip(requests, grids):
+            player = request.player
+            agent.clearance = agent.distance_field(request.asteroids) if agent.clearance_weight else None
+            start_cell = agent.world_to_grid(player.position.x, player.position.y)
+            goal_cell = agent.choose_goal(grid, player, request.asteroids, request.powerups)
+            cost = agent.clearance_cost(agent.clearance) if agent.clearance is not None else None
+            tasks.append((grid, start_cell, goal_cell, cost))
+
+        if self.workers:
+            results = self._solve_pooled(requests, tasks)
+        else:
+            results = [_solve(agent, *task) for (agent, _), task in zip(requests, tasks)]
+
+        elapsed = time.perf_counter() - started
+        for (agent, request), (path, expansions) in zip(requests, results):
+            agent.deliver(path, expansions, request.asteroids, elapsed / len(requests))
+        self.stats["flushes"] += 1
+        self.stats["requests"] += len(requests)
+        self.stats["seconds"] += time.perf_counter() - started
+        return len(requests)
+
+    def build_grids(self, requests):
+        """
+        One build_grid() result per (agent, Request), stamped together per
+        grid geometry.
+        """
+        groups = {}
+        for i, (agent, _) in enumerate(requests):
+            key = (agent.grid_cols, agent.grid_rows, agent.safe_distance)
+            groups.setdefault(key, []).append(i)
+        grids = [None] * len(requests)
+        for members in groups.values():
+            template = requests[members[0]][0]
+            group = [requests[i][1] for i in members]
+            stack = np.ones((len(members), template.grid_rows, template.grid_cols), dtype=bool)
+            pos = np.concatenate([request.pos for request in group])
+            radius = np.concatenate([request.radius for request in group])
+            counts = [len(request.pos) for request in group]
+            base = np.repeat(np.arange(len(members)) * stack[0].size, counts)
+            template._stamp(stack.ravel(), pos, radius, base)
+            for slot, i in enumerate(members):
+                grids[i] = stack[slot]
+        return grids
+
+    def _solve_pooled(self, requests, tasks):
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.workers)
+        packed = [
+            (_config(agent), np.packbits(grid), start, goal, cost)
+            for (agent, _), (grid, start, goal, cost) in zip(requests, tasks)
+        ]
+        chunksize = max(1, math.ceil(len(packed) / self.workers))
+        return list(self._pool.map(_solve_packed, packed, chunksize=chunksize))
+
+
+def _config(agent):
+    """
+    What a worker needs to rebuild an agent that searches like `agent`.
+    """
+    return dict(
+        grid_size=(agent.grid_cols, agent.grid_rows),
+        heuristic=agent.heuristic,
+        planner=agent.planner,
+    )
+
+
+def _solve(agent, grid, start_cell, goal_cell, cost):
+    if goal_cell is None:
+        return [], 0
+    agent.last_expansions = 0
+    path = agent.search_path(grid, start_cell, goal_cell, cost)
+    return path, agent.last_expansions
+
+
+# Worker-process agents, one per _config()
+_worker_agents = {}
+
+
+def _solve_packed(task):
+    config, packed, start_cell, goal_cell, cost = task
+    key = tuple(sorted(config.items()))
+    agent = _worker_agents.get(key)
+    if agent is None:
+        agent = _worker_agents[key] = AStarAgent(**config)
+    cols, rows = config["grid_size"]
+    grid = np.unpackbits(packed, count=rows * cols).astype(bool).reshape(rows, cols)
+    return _solve(agent, grid, start_cell, goal_cell, cost)
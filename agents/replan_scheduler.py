@@ -0,0 +1,248 @@
+import math
+
+import numpy as np
+
+from a_star import asteroid_arrays, asteroid_velocities
+from constants import PLAYER_RADIUS
+
+# Reasons a replan is triggered, in the order they are checked
+REASONS = ("no_path", "ttc", "blocked", "drift", "timer")
+
+
+class ReplanScheduler:
+    """
+    Decides when AStarAgent replans, from cheap per-frame checks on the
+    path it is following instead of a fixed timer:
+
+      - ttc: an asteroid, moving as it is, will hit one of the next
+        `lookahead` path cells (or the player) within ttc_threshold seconds,
+        at least ttc_hysteresis seconds sooner than the last plan already
+        expected (a threat the new path couldn't avoid doesn't replan
+        again every min_interval)
+      - blocked: one of those cells is now within an asteroid's blocking
+        radius, i.e. a fresh grid would block it
+      - drift: the player is more than drift_tolerance pixels off the
+        path's next cells
+      - no_path: the path ran out or none was found, after the agent's
+        replan_interval as before
+      - timer: max_interval passed without any of the above
+
+    and never sooner than min_interval after the last replan. With an
+    empty screen that is a replan every max_interval; with asteroids
+    closing in it is as soon as one threatens the path.
+
+    budget_ms, if set, caps the planner's CPU time per frame on average:
+    each frame adds budget_ms to a bank (holding at most burst_frames
+    frames' worth), each replan spends its measured time, and a triggered
+    replan the bank can't cover (at the recent average cost) waits for a
+    later frame. A collision less than urgent_ttc seconds away replans
+    regardless. The budget reads the wall clock, so runs using it are no
+    longer reproducible from a seed.
+
+    counters holds "triggered" (replans made, also broken down by reason),
+    "skipped" (replans the agent's fixed replan_interval timer would have
+    made that no check asked for) and "deferred" (frames a triggered replan
+    waited for budget).
+    """
+
+    def __init__(
+        self,
+        min_interval=0.1,
+        max_interval=1.0,
+        ttc_threshold=0.75,
+        ttc_hysteresis=0.1,
+        urgent_ttc=0.25,
+        lookahead=8,
+        drift_tolerance=None,
+        budget_ms=None,
+        burst_frames=30,
+    ):
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.ttc_threshold = ttc_threshold
+        self.ttc_hysteresis = ttc_hysteresis
+        self.urgent_ttc = urgent_ttc
+        self.lookahead = lookahead
+        # None: five cells, taken from the agent
+        self.drift_tolerance = drift_tolerance
+        self.budget_ms = budget_ms
+        self.burst_frames = burst_frames
+        self.reset_counters()
+        self.reset()
+
+    def reset(self):
+        """
+        Forget the budget bank, cost estimate and fixed-timer phase, for a new episode.
+        """
+        self.bank_ms = 0.0 if self.budget_ms is None else self.budget_ms * self.burst_frames
+        self.cost_ms = 0.0
+        self.last_reason = None
+        self.last_ttc = math.inf
+        self._timer = 0.0
+        self._known_blocked = set()
+        # player position the pending replan plans from, and the soonest
+        # contact the last plan's path faced when it was made
+        self._replan_from = None
+        self._plan_ttc = math.inf
+
+    def get_state(self):
+        """
+        Budget bank, cost estimate, fixed-timer phase and what the checks
+        remember of the last plan, for set_state(). Counters are left out.
+        """
+        return (
+            self.bank_ms, self.cost_ms, self.last_reason, self.last_ttc, self._timer,
+            frozenset(self._known_blocked), self._replan_from, self._plan_ttc,
+        )
+
+    def set_state(self, state):
+        (self.bank_ms, self.cost_ms, self.last_reason, self.last_ttc, self._timer,
+         known_blocked, self._replan_from, self._plan_ttc) = state
+        self._known_blocked = set(known_blocked)
+
+    def reset_counters(self):
+        self.counters = {"triggered": 0, "skipped": 0, "deferred": 0}
+        self.counters.update({reason: 0 for reason in REASONS})
+
+    def should_replan(self, agent, dt, player, asteroids):
+        """
+        True if the agent should replan this frame. Call once per frame,
+        after the agent has added dt to time_since_replan.
+        """
+        if self.budget_ms is not None:
+            self.bank_ms = min(self.bank_ms + self.budget_ms, self.budget_ms * self.burst_frames)
+        # phase of the fixed timer this scheduler replaces, for "skipped"
+        self._timer += dt
+        timer_due = self._timer > agent.replan_interval
+        if timer_due:
+            self._timer = 0.0
+
+        reason = None
+        if agent.time_since_replan >= self.min_interval:
+            reason = self._reason(agent, player, asteroids)
+        if reason is None:
+            self.counters["skipped"] += timer_due
+            return False
+        short = self.budget_ms is not None and self.bank_ms < self.cost_ms
+        if short and self.last_ttc >= self.urgent_ttc:
+            self.counters["deferred"] += 1
+            return False
+        self.last_reason = reason
+        self._replan_from = (player.position.x, player.position.y)
+        self.counters["triggered"] += 1
+        self.counters[reason] += 1
+        return True
+
+    def planned(self, agent, asteroids, elapsed):
+        """
+        Record a replan that took `elapsed` seconds and remember which of
+        the new path's cells were blocked already and how soon an asteroid
+        meets it, so only cells that become blocked and threats that grow
+        count as a change.
+        """
+        ms = elapsed * 1e3
+        self.cost_ms = ms if self.cost_ms == 0.0 else 0.8 * self.cost_ms + 0.2 * ms
+        if self.budget_ms is not None:
+            self.bank_ms -= ms
+        self._timer = 0.0
+        blocked = self._blocked(agent, asteroids, agent.current_path)
+        self._known_blocked = {cell for cell, b in zip(agent.current_path, blocked) if b}
+        self._plan_ttc = math.inf
+        if agent.current_path and len(asteroids) and self._replan_from is not None:
+            dx, dy, radius = self._offsets(agent, *self._replan_from, agent.current_path, asteroids)
+            vel = asteroid_velocities(asteroids)
+            self._plan_ttc = _time_to_contact(dx, dy, vel, radius[:, None] + PLAYER_RADIUS)
+
+    def _reason(self, agent, player, asteroids):
+        self.last_ttc = math.inf
+        path = agent.current_path
+        if not path:
+            return "no_path" if agent.time_since_replan > agent.replan_interval else None
+
+        ahead = path[:self.lookahead]
+        px, py = player.position.x, player.position.y
+
+        if len(asteroids):
+            dx, dy, radius = self._offsets(agent, px, py, ahead, asteroids)
+            vel = asteroid_velocities(asteroids)
+            self.last_ttc = _time_to_contact(dx, dy, vel, radius[:, None] + PLAYER_RADIUS)
+            expected = self._plan_ttc - agent.time_since_replan
+            if self.last_ttc < min(self.ttc_threshold, expected - self.ttc_hysteresis):
+                return "ttc"
+            reach = (radius + agent.safe_distance)[:, None]
+            blocked = (np.hypot(dx[:, 1:], dy[:, 1:]) < reach).any(axis=0)
+            if any(b and cell not in self._known_blocked for cell, b in zip(ahead, blocked.tolist())):
+                return "blocked"
+
+        tolerance = self.drift_tolerance
+        if tolerance is None:
+            tolerance = 5 * max(agent.cell_width, agent.cell_height)
+        cells = np.array(ahead, dtype=np.float64)
+        x = (cells[:, 0] + 0.5) * agent.cell_width
+        y = (cells[:, 1] + 0.5) * agent.cell_height
+        if _polyline_distance(px, py, x, y) > tolerance:
+            return "drift"
+        if agent.time_since_replan > self.max_interval:
+            return "timer"
+        return None
+
+    def _offsets(self, agent, px, py, path, asteroids):
+        """
+        (asteroids, points) x and y offsets from the player at (px, py) and
+        the first `lookahead` cells of `path` to every asteroid, and the
+        asteroid radii.
+        """
+        cells = np.array(path[:self.lookahead], dtype=np.float64)
+        x = (cells[:, 0] + 0.5) * agent.cell_width
+        y = (cells[:, 1] + 0.5) * agent.cell_height
+        pos, radius = asteroid_arrays(asteroids)
+        dx = pos[:, 0:1] - np.concatenate(([px], x))
+        dy = pos[:, 1:2] - np.concatenate(([py], y))
+        return dx, dy, radius
+
+    def _blocked(self, agent, asteroids, path):
+        """
+        Per path cell, whether a fresh grid would block it.
+        """
+        if not path or not len(asteroids):
+            return [False] * len(path)
+        pos, radius = asteroid_arrays(asteroids)
+        cells = np.array(path, dtype=np.float64)
+        dx = pos[:, 0:1] - (cells[:, 0] + 0.5) * agent.cell_width
+        dy = pos[:, 1:2] - (cells[:, 1] + 0.5) * agent.cell_height
+        reach = (radius + agent.safe_distance)[:, None]
+        return (np.hypot(dx, dy) < reach).any(axis=0).tolist()
+
+
+def _time_to_contact(dx, dy, vel, reach):
+    """
+    Soonest time (s) any asteroid, offset (dx, dy) from a point and moving
+    at vel, comes within reach of it; 0 if one already is, inf if none will.
+    """
+    vx, vy = vel[:, 0:1], vel[:, 1:2]
+    c = dx * dx + dy * dy - reach * reach
+    if (c <= 0).any():
+        return 0.0
+    a = vx * vx + vy * vy
+    b = 2 * (dx * vx + dy * vy)
+    disc = b * b - 4 * a * c
+    # approaching (b < 0) and passing close enough (disc >= 0)
+    hit = (b < 0) & (disc >= 0) & (a > 0)
+    if not hit.any():
+        return math.inf
+    a = np.broadcast_to(a, hit.shape)[hit]
+    t = (-b[hit] - np.sqrt(disc[hit])) / (2 * a)
+    return float(t.min())
+
+
+def _polyline_distance(px, py, x, y):
+    """
+    Distance from (px, py) to the polyline through the points (x, y).
+    """
+    if len(x) < 2:
+        return math.hypot(px - x[0], py - y[0])
+    ax, ay, bx, by = x[:-1], y[:-1], x[1:], y[1:]
+    length2 = (bx - ax) ** 2 + (by - ay) ** 2
+    t = ((px - ax) * (bx - ax) + (py - ay) * (by - ay)) / np.maximum(length2, 1e-12)
+    t = np.clip(t, 0.0, 1.0)
+    return float(np.hypot(px - (ax + t * (bx - ax)), py - (ay + t * (by - ay))).min())
@@ -7,13 +7,15 @@ import pygame
 import math
 
 class Asteroid(CircleShape):
-    def __init__(self, x, y, radius):
+    def __init__(self, x, y, radius, rng=None):
         super().__init__(x,y,radius)
         self.position = pygame.Vector2(x,y)
         self.radius = radius
         self.velocity = pygame.Vector2(0,0)
+        # the owning env's RandomStream, or the global random module
+        self.rng = rng or random
 
-        self.sides = random.randint(5,10)
+        self.sides = self.rng.randint(5,10)
         self.points  = self.generate_polygons()
 
         self.image = pygame.Surface((radius*2,radius*2),pygame.SRCALPHA)
@@ -25,7 +27,7 @@ class Asteroid(CircleShape):
 
         for i in range(self.sides):
             angle = i * angle_step
-            rand_off = random.uniform(0.8,1.2)
+            rand_off = self.rng.uniform(0.8,1.2)
             x = self.radius * rand_off * math.cos(angle)
             y = self.radius * rand_off * math.sin(angle)
             p.append((x+self.radius,y+self.radius))
@@ -44,17 +46,17 @@ class Asteroid(CircleShape):
             return
         gamma = 0.4
         #spawning asteroids
-        random_degrees = random.uniform(20, 50)
+        random_degrees = self.rng.uniform(20, 50)
         vector1 = pygame.math.Vector2.rotate(self.velocity, random_degrees)
         vector2 = pygame.math.Vector2.rotate(self.velocity, -random_degrees)
 
         new_radius = self.radius - ASTEROID_MIN_RADIUS
         
-        asteroid1 = Asteroid(self.position.x, self.position.y, new_radius)
-        asteroid2 = Asteroid(self.position.x, self.position.y, new_radius)
+        asteroid1 = Asteroid(self.position.x, self.position.y, new_radius, self.rng)
+        asteroid2 = Asteroid(self.position.x, self.position.y, new_radius, self.rng)
         # RL must decide when to let asteroids spawn powerups upon destruction
         # random math as placeholder
-        random_degrees = random.uniform(20, 50)
+        random_degrees = self.rng.uniform(20, 50)
         # instead of creating asteroids here, extract out, and spawn in main gameplay loop
         asteroid1.velocity = vector1 * 1.5 
         asteroid2.velocity = vector2 * 1.5
@@ -1,4 +1,6 @@
 import json
+import os
+import sys
 from powerup_manager import PowerUpManager
 import pygame # type: ignore
 import pygame.freetype # type: ignore
@@ -10,6 +12,9 @@ from shot import Shot
 from powerups import LifePowerUp, PowerUp, ShotPowerUp, SpeedPowerUp
 import numpy as np
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "engine"))
+from spatial_hash import SpatialHash
+
 training_data = []
 def collect_data(player,shots,score,elapsed_time,asteroids,powerups,action):
     state = {
@@ -62,6 +67,7 @@ def main():
 
     asteroid_field = AsteroidField()
     powerup_manager = PowerUpManager()
+    broadphase = SpatialHash(2 * ASTEROID_MAX_RADIUS)
 
     dt = 0
     game_over = False
@@ -119,14 +125,17 @@ def main():
                 break
                 # return
         
-            for shot in shots:
-                if asteroid.collision_check(shot):
-                    asteroid.split(powerup_manager)
-                    if powerup_manager.action != None:
-                        collect_data(player,shots,score,elapsed_time,asteroids,powerups,powerup_manager.action)
-                    shot.kill()
-                    score += 1
-                    # print("hit")
+        # only asteroid/shot pairs in neighbouring grid cells can touch
+        for asteroid, shot in broadphase.sprite_pairs(asteroids, shots):
+            if not (asteroid.alive() and shot.alive()):
+                continue
+            if asteroid.collision_check(shot):
+                asteroid.split(powerup_manager)
+                if powerup_manager.action != None:
+                    collect_data(player,shots,score,elapsed_time,asteroids,powerups,powerup_manager.action)
+                shot.kill()
+                score += 1
+                # print("hit")
 
         # check for player collison or shot collision with a powerup
         for powerup in powerups:
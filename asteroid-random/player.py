@@ -4,8 +4,11 @@ from constants import *
 from shot import Shot
 
 class Player(CircleShape):
-    def __init__(self, x, y):
+    def __init__(self, x, y, clock=None):
         super().__init__(x, y, PLAYER_RADIUS)
+        # effect timers read this; anything with get_ticks() in ms
+        # (e.g. an env's SimClock), wall clock by default
+        self.clock = clock or pygame.time
         self.rotation = 0
         self.timer = 0
         self.current_action = 0 #player starts in middle still
@@ -33,7 +36,7 @@ class Player(CircleShape):
         self.rotation += self.player_turn_speed * dt
 
     def update_effects(self):
-        current_time = pygame.time.get_ticks()
+        current_time = self.clock.get_ticks()
         expired_powerups = []
         for powerup,expiration in self.active_effects:
             if current_time >= expiration:
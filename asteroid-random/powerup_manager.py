@@ -4,7 +4,10 @@ import pygame
 from constants import *
 
 class PowerUpManager(pygame.sprite.Sprite):
-    def __init__(self):
+    def __init__(self, clock=None, rng=None):
+        self.clock = clock
+        # the owning env's RandomStream, or the global random module
+        self.rng = rng or random
         self.powerup_timer = 0
         self.action = None
         self.powerups = pygame.sprite.Group()
@@ -13,18 +16,18 @@ class PowerUpManager(pygame.sprite.Sprite):
         self.action = None
 
     def spawn_from_asteroid(self,asteroid):
-            powerup_type = random.choice(["speed", "shot", "life"])
-            vector3 = pygame.math.Vector2.rotate(asteroid.velocity,random.uniform(20, 50))
+            powerup_type = self.rng.choice(["speed", "shot", "life"])
+            vector3 = pygame.math.Vector2.rotate(asteroid.velocity,self.rng.uniform(20, 50))
             if powerup_type == "shot":
-                powerup = ShotPowerUp(asteroid.position.x,asteroid.position.y,2)
+                powerup = ShotPowerUp(asteroid.position.x,asteroid.position.y,2,self.clock)
                 powerup.velocity = vector3
                 self.action = "PowerUp_Spawned_Shot"
             elif powerup_type == "speed":
-                powerup = SpeedPowerUp(asteroid.position.x,asteroid.position.y,20)
+                powerup = SpeedPowerUp(asteroid.position.x,asteroid.position.y,20,self.clock)
                 powerup.velocity = vector3
                 self.action = "PowerUp_Spawned_Speed"
             elif powerup_type == "life":
-                powerup = LifePowerUp(asteroid.position.x,asteroid.position.y,5)
+                powerup = LifePowerUp(asteroid.position.x,asteroid.position.y,5,self.clock)
                 powerup.velocity = vector3
                 self.action = "PowerUp_Spawned_Life"
 
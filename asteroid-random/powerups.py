@@ -6,18 +6,20 @@ NEON_RED = (255, 30, 30)
 EFFECT_DURATION = 5000
 # add despawn timer, add effect timer
 class PowerUp(CircleShape):
-    def __init__(self, x, y, radius,type,ttl=5000):
+    def __init__(self, x, y, radius,type,ttl=5000,clock=None):
         super().__init__(x,y,radius)
         self.type = type
         self.position = pygame.Vector2(x,y)
         self.radius = radius
         self.velocity = pygame.Vector2(0,0)
-        self.spawn_time = pygame.time.get_ticks()
+        # despawn timer reads this; wall clock unless an env passes its SimClock
+        self.clock = clock or pygame.time
+        self.spawn_time = self.clock.get_ticks()
         self.ttl = 5000
     def update(self,dt):
         self.position += self.velocity * dt
         self.ttl -= 1
-        if pygame.time.get_ticks() - self.spawn_time >= self.ttl:
+        if self.clock.get_ticks() - self.spawn_time >= self.ttl:
             self.kill()
     
     def collision_check(self, other):
@@ -36,13 +38,13 @@ class PowerUp(CircleShape):
                 player.player_powerups['speed_power_up']+=1
                 player.player_turn_speed += 100
                 player.player_speed += 50
-                player.active_effects.append(("speed_power_up", pygame.time.get_ticks() + EFFECT_DURATION))
+                player.active_effects.append(("speed_power_up", player.clock.get_ticks() + EFFECT_DURATION))
                 return
             case 'shot_power_up':
                 player.player_powerups['shot_power_up']+=1
                 player.player_shoot_speed += 100
                 player.player_shoot_cooldown -= 0.05
-                player.active_effects.append(("shot_power_up", pygame.time.get_ticks() + EFFECT_DURATION))
+                player.active_effects.append(("shot_power_up", player.clock.get_ticks() + EFFECT_DURATION))
                 return
             case 'life_power_up':
                 player.player_powerups['life_power_up']+=1
@@ -50,8 +52,8 @@ class PowerUp(CircleShape):
                 return
             
 class LifePowerUp(PowerUp):
-    def __init__(self, x, y, radius):
-        super().__init__(x,y,radius,"life_power_up")
+    def __init__(self, x, y, radius, clock=None):
+        super().__init__(x,y,radius,"life_power_up",clock=clock)
         self.size = radius * 10
     def draw(self,screen):
         line_weight = self.size // 5
@@ -79,8 +81,8 @@ class LifePowerUp(PowerUp):
 class SpeedPowerUp(PowerUp):
 
     #initializs powerup sprite
-    def __init__(self, x, y, radius):
-        super().__init__(x,y,radius,"speed_power_up")
+    def __init__(self, x, y, radius, clock=None):
+        super().__init__(x,y,radius,"speed_power_up",clock=clock)
 
     def draw(self,screen):
         pygame.draw.circle(screen,NEON_GREEN,(int(self.position.x), int(self.position.y)), self.radius,2)
@@ -88,8 +90,8 @@ class SpeedPowerUp(PowerUp):
         return super().collision_check(other)
 class ShotPowerUp(PowerUp):
         #initializs powerup sprite
-    def __init__(self, x, y, radius):
-        super().__init__(x,y,radius,"shot_power_up")
+    def __init__(self, x, y, radius, clock=None):
+        super().__init__(x,y,radius,"shot_power_up",clock=clock)
         self.size = radius * 10
 
     def draw(self,screen):
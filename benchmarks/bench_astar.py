@@ -0,0 +1,144 @@
+"""
+A* search throughput: AStarAgent.a_star_search (flat keys, reused
+buffers, octile step table) against the dict/set/tuple search it
+replaced, in node expansions per second.
+
+Plans between random free cells on grids built from random asteroid
+fields, checks the flat search returns exactly the reference path, and
+reports the octile heuristic and Jump Point Search (planner="jps")
+alongside: same path lengths, fewer expansions.
+
+    python benchmarks/bench_astar.py
+    python benchmarks/bench_astar.py --grid 256 144 --asteroids 40
+"""
+import argparse
+import heapq
+import math
+import os
+import sys
+import time
+
+main_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+sys.path.insert(0, os.path.join(main_dir, "agents"))
+sys.path.append(os.path.join(main_dir, "engine"))
+
+import numpy as np
+from a_star import AStarAgent
+from constants import ASTEROID_KINDS, ASTEROID_MIN_RADIUS, SCREEN_HEIGHT, SCREEN_WIDTH
+from entity_store import ASTEROID, EntityStore
+
+
+def dict_a_star(grid, start_cell, goal_cell):
+    """
+    The original search: tuple keys, g_costs dict, visited set, came_from
+    dict, a fresh neighbour list and math.hypot per edge. Returns
+    (path, expansions).
+    """
+    rows, cols = len(grid), len(grid[0])
+    open_set = [(0, 0, start_cell, None)]
+    visited = set()
+    came_from = {}
+    g_costs = {start_cell: 0}
+    while open_set:
+        f, g, current, parent = heapq.heappop(open_set)
+        if current in visited:
+            continue
+        visited.add(current)
+        came_from[current] = parent
+        if current == goal_cell:
+            path = []
+            while current is not None:
+                path.append(current)
+                current = came_from[current]
+            return path[::-1], len(visited)
+        col, row = current
+        neighbors = []
+        for dcol in [-1, 0, 1]:
+            for drow in [-1, 0, 1]:
+                if dcol == 0 and drow == 0:
+                    continue
+                ncol, nrow = col + dcol, row + drow
+                if 0 <= ncol < cols and 0 <= nrow < rows and grid[nrow][ncol]:
+                    neighbors.append((ncol, nrow))
+        for n in neighbors:
+            if n in visited:
+                continue
+            tentative_g = g + math.hypot(n[0] - col, n[1] - row)
+            if tentative_g < g_costs.get(n, float("inf")):
+                g_costs[n] = tentative_g
+                h = math.hypot(n[0] - goal_cell[0], n[1] - goal_cell[1])
+                heapq.heappush(open_set, (tentative_g + h, tentative_g, n, current))
+    return [], len(visited)
+
+
+def path_length(path):
+    return sum(math.hypot(b[0] - a[0], b[1] - a[1]) for a, b in zip(path, path[1:]))
+
+
+def make_queries(agent, asteroids, pairs, rng):
+    store = EntityStore()
+    for _ in range(asteroids):
+        store.spawn(
+            ASTEROID,
+            rng.uniform(0, SCREEN_WIDTH), rng.uniform(0, SCREEN_HEIGHT),
+            radius=ASTEROID_MIN_RADIUS * int(rng.integers(1, ASTEROID_KINDS + 1)),
+        )
+    grid = agent.build_grid(store.view(ASTEROID))
+    free = np.argwhere(grid)
+    ends = free[rng.integers(len(free), size=(pairs, 2))]
+    return grid, [((int(s[1]), int(s[0])), (int(t[1]), int(t[0]))) for s, t in ends]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--grid", type=int, nargs=2, default=[64, 36], metavar=("COLS", "ROWS"))
+    parser.add_argument("--asteroids", type=int, default=20)
+    parser.add_argument("--fields", type=int, default=10)
+    parser.add_argument("--pairs", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    grid_size = tuple(args.grid)
+    euclid = AStarAgent(grid_size=grid_size, safe_distance=50)
+    octile = AStarAgent(grid_size=grid_size, safe_distance=50, heuristic="octile")
+    jps = AStarAgent(grid_size=grid_size, safe_distance=50, planner="jps")
+    totals = {name: [0, 0.0] for name in ("dict", "flat", "flat octile", "jps")}
+
+    for _ in range(args.fields):
+        grid, queries = make_queries(euclid, args.asteroids, args.pairs, rng)
+        grid_list = grid.tolist()
+        for start, goal in queries:
+            t0 = time.perf_counter()
+            expected, expanded = dict_a_star(grid_list, start, goal)
+            t1 = time.perf_counter()
+            path = euclid.a_star_search(grid, start, goal)
+            t2 = time.perf_counter()
+            octile_path = octile.a_star_search(grid, start, goal)
+            t3 = time.perf_counter()
+            jps_path = jps.jump_point_search(grid, start, goal)
+            t4 = time.perf_counter()
+
+            assert path == expected, f"path mismatch {start} -> {goal}"
+            assert abs(path_length(octile_path) - path_length(expected)) < 1e-9
+            assert abs(path_length(jps_path) - path_length(expected)) < 1e-9
+            assert euclid.last_expansions == expanded
+            for name, n, dt in (
+                ("dict", expanded, t1 - t0),
+                ("flat", euclid.last_expansions, t2 - t1),
+                ("flat octile", octile.last_expansions, t3 - t2),
+                ("jps", jps.last_expansions, t4 - t3),
+            ):
+                totals[name][0] += n
+                totals[name][1] += dt
+
+    searches = args.fields * args.pairs
+    print(f"grid {grid_size[0]}x{grid_size[1]}, {args.asteroids} asteroids, {searches} searches, paths identical")
+    print(f"{'search':>12} {'expansions':>11} {'ms/search':>10} {'expansions/sec':>15}")
+    for name, (expanded, elapsed) in totals.items():
+        print(f"{name:>12} {expanded:>11} {elapsed / searches * 1e3:>10.3f} {expanded / elapsed:>15.0f}")
+
+
+if __name__ == "__main__":
+    main()
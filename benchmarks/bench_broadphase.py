@@ -0,0 +1,84 @@
+"""
+Asteroid-shot collision detection: spatial hash broadphase vs brute force.
+
+For growing entity counts, times
+  - loop:   the nested `for asteroid: for shot: distance_to` sprite loop
+  - matrix: vectorized all-pairs test (circle_hits without a broadphase)
+  - hash:   SpatialHash rebuild + candidate query + exact test
+and checks all three find the same hits.
+
+    python benchmarks/bench_broadphase.py --counts 50 200 1000 5000
+"""
+import argparse
+import os
+import sys
+import time
+
+main_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, os.path.join(main_dir, "game", "original"))
+sys.path.append(os.path.join(main_dir, "engine"))
+
+import numpy as np
+import pygame
+from constants import ASTEROID_MAX_RADIUS, ASTEROID_MIN_RADIUS, SCREEN_HEIGHT, SCREEN_WIDTH, SHOT_RADIUS
+from entity_store import ASTEROID, SHOT, EntityStore, circle_hits
+from spatial_hash import SpatialHash
+
+
+def best_of(fn, repeats):
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def loop_hits(asteroids, shots):
+    hits = set()
+    for i, (a_pos, a_r) in enumerate(asteroids):
+        for j, (s_pos, s_r) in enumerate(shots):
+            if a_pos.distance_to(s_pos) <= a_r + s_r:
+                hits.add((i, j))
+    return hits
+
+
+def run(count, rng, repeats):
+    n_shots = max(1, count // 4)
+    store = EntityStore()
+    ast_pos = rng.uniform((0, 0), (SCREEN_WIDTH, SCREEN_HEIGHT), size=(count, 2))
+    ast_r = rng.choice([ASTEROID_MIN_RADIUS * k for k in (1, 2, 3)], size=count)
+    shot_pos = rng.uniform((0, 0), (SCREEN_WIDTH, SCREEN_HEIGHT), size=(n_shots, 2))
+    store.spawn_many(ASTEROID, ast_pos, np.zeros_like(ast_pos), ast_r)
+    store.spawn_many(SHOT, shot_pos, np.zeros_like(shot_pos), SHOT_RADIUS)
+
+    sprites_a = [(pygame.Vector2(*map(float, store.pos[i])), float(store.radius[i])) for i in range(count)]
+    sprites_s = [(pygame.Vector2(*map(float, store.pos[count + j])), float(SHOT_RADIUS)) for j in range(n_shots)]
+    broadphase = SpatialHash(2 * ASTEROID_MAX_RADIUS)
+
+    t_loop, loop = best_of(lambda: loop_hits(sprites_a, sprites_s), 1 if count > 1000 else repeats)
+    t_matrix, matrix = best_of(lambda: circle_hits(store, ASTEROID, SHOT), repeats)
+    t_hash, hashed = best_of(lambda: circle_hits(store, ASTEROID, SHOT, broadphase), repeats)
+
+    as_set = lambda pair: set(zip(pair[0].tolist(), (pair[1] - count).tolist()))
+    assert as_set(matrix) == as_set(hashed) == loop, "broadphase missed or invented a hit"
+    return n_shots, len(loop), t_loop, t_matrix, t_hash
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--counts", type=int, nargs="+", default=[50, 200, 1000, 5000])
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    rng = np.random.default_rng(args.seed)
+
+    print(f"{'asteroids':>10} {'shots':>6} {'hits':>6} {'loop ms':>10} {'matrix ms':>10} {'hash ms':>10}")
+    for count in args.counts:
+        n_shots, hits, t_loop, t_matrix, t_hash = run(count, rng, args.repeats)
+        print(f"{count:>10} {n_shots:>6} {hits:>6} {t_loop * 1e3:>10.3f} "
+              f"{t_matrix * 1e3:>10.3f} {t_hash * 1e3:>10.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,171 @@
+"""
+Flow-field navigation versus per-goal A*: one multi-source sweep from the
+goal cell, walked from any start, against an A* search from each start.
+Flow fields are not one of AStarAgent's planners: with a single player
+per grid, as in the envs, a sweep costs more than the search it replaces.
+
+Builds random asteroid grids and, for each count in `--starts`, times A*
+from every start to the safest cell against one flow_field() sweep from
+the same goal plus a walk per start, and checks the walked paths are as
+short as A*'s.
+
+    python benchmarks/bench_flow.py
+    python benchmarks/bench_flow.py --starts 1 4 16 64
+"""
+import argparse
+import math
+import os
+import sys
+import time
+
+main_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+sys.path.insert(0, os.path.join(main_dir, "agents"))
+sys.path.append(os.path.join(main_dir, "engine"))
+
+import numpy as np
+from a_star import NEIGHBOUR_STEPS, SQRT2, AStarAgent
+from constants import ASTEROID_KINDS, ASTEROID_MIN_RADIUS, SCREEN_HEIGHT, SCREEN_WIDTH
+from entity_store import ASTEROID, EntityStore
+
+
+def path_length(path):
+    return sum(math.hypot(b[0] - a[0], b[1] - a[1]) for a, b in zip(path, path[1:]))
+
+
+def flow_field(grid, goals, cost=None):
+    """
+    Multi-source Dijkstra over the 8-neighbour grid from the flat keys
+    `goals`: (rows * cols,) next-cell keys, each step to the neighbour
+    on a shortest (octile, times `cost` of the cell entered) way to the
+    nearest goal; -1 at goals and -2 where no goal is reachable. One
+    sweep serves any number of starts (see flow_path); for a single
+    start AStarAgent.a_star_search is cheaper.
+
+    The distances relax on whole arrays, one neighbour step per round,
+    until none changes, so a sweep costs a few NumPy passes per cell
+    of the longest route instead of a heap operation per cell. Blocked
+    cells are never entered, but get a next step too, so a player
+    caught in one still has a way out.
+    """
+    rows, cols = grid.shape
+    step_cost = np.ones((rows + 2, cols + 2))
+    if cost is not None:
+        step_cost[1:-1, 1:-1] = cost
+    dist = np.full((rows + 2, cols + 2), np.inf)
+    inner = dist[1:-1, 1:-1]
+    inner.flat[goals] = 0.0
+    blocked = ~grid
+
+    def shifted(array, drow, dcol):
+        return array[1 + drow:rows + 1 + drow, 1 + dcol:cols + 1 + dcol]
+
+    # with unit costs the neighbours' distances are the sources; with
+    # costs, each neighbour's distance plus the cost of stepping into it
+    orth_src = diag_src = dist
+    if cost is not None:
+        orth_src, diag_src = np.empty_like(dist), np.empty_like(dist)
+    best, diag = np.empty_like(inner), np.empty_like(inner)
+    for _ in range(rows * cols):
+        if cost is not None:
+            np.add(dist, step_cost, out=orth_src)
+            np.multiply(step_cost, SQRT2, out=diag_src)
+            diag_src += dist
+        # left/right minimum per padded row; the rows above and below
+        # give the diagonals, the row itself the horizontal steps
+        across = np.minimum(orth_src[:, :-2], orth_src[:, 2:])
+        np.minimum(across[1:-1], np.minimum(orth_src[:-2, 1:-1], orth_src[2:, 1:-1]), out=best)
+        if diag_src is not orth_src:
+            across = np.minimum(diag_src[:, :-2], diag_src[:, 2:])
+        np.minimum(across[:-2], across[2:], out=diag)
+        if cost is None:
+            best += 1.0
+            diag += SQRT2
+        np.minimum(best, diag, out=best)
+        np.copyto(best, np.inf, where=blocked)
+        if not (best < inner).any():
+            break
+        np.minimum(inner, best, out=inner)
+
+    # each cell's best neighbour, from the settled distances
+    candidates = np.stack([
+        shifted(dist, drow, dcol) + step * shifted(step_cost, drow, dcol)
+        for dcol, drow, step in NEIGHBOUR_STEPS
+    ])
+    choice = candidates.argmin(axis=0)
+    offsets = np.array([drow * cols + dcol for dcol, drow, _ in NEIGHBOUR_STEPS])
+    flow_next = np.arange(rows * cols).reshape(rows, cols) + offsets[choice]
+    flow_next[~np.isfinite(np.take_along_axis(candidates, choice[None], 0)[0])] = -2
+    flow_next[inner == 0.0] = -1
+    return flow_next.ravel()
+
+
+def flow_path(flow_next, shape, start_cell):
+    """
+    (col, row) cells from start_cell down the flow_field() `flow_next`
+    (a list, for fast indexing) of a `shape` (rows, cols) grid to its
+    goal, [] if start_cell is off the grid or no goal is reachable.
+    """
+    rows, cols = shape
+    col, row = start_cell
+    if not (0 <= row < rows and 0 <= col < cols):
+        return []
+    key = flow_next[row * cols + col]
+    if key == -2:
+        return []
+    path = [start_cell]
+    while key != -1:
+        row, col = divmod(key, cols)
+        path.append((col, row))
+        key = flow_next[key]
+    return path
+
+
+def sweeps(args):
+    rng = np.random.default_rng(args.seed)
+    astar = AStarAgent(grid_size=(64, 36), safe_distance=50)
+    print(f"{args.fields} fields of {args.asteroids} asteroids, 64x36 grid")
+    print(f"{'starts':>6} {'A* ms':>9} {'flow ms':>9} {'speedup':>8}")
+    for count in args.starts:
+        t_astar = t_flow = 0.0
+        for _ in range(args.fields):
+            store = EntityStore()
+            for _ in range(args.asteroids):
+                store.spawn(
+                    ASTEROID, rng.uniform(0, SCREEN_WIDTH), rng.uniform(0, SCREEN_HEIGHT),
+                    radius=ASTEROID_MIN_RADIUS * int(rng.integers(1, ASTEROID_KINDS + 1)),
+                )
+            asteroids = store.view(ASTEROID)
+            grid = astar.build_grid(asteroids)
+            goal = astar.find_safest_cell(grid, asteroids)
+            free = np.argwhere(grid)
+            starts = [(int(c), int(r)) for r, c in free[rng.integers(len(free), size=count)]]
+
+            t0 = time.perf_counter()
+            expected = [astar.a_star_search(grid, start, goal) for start in starts]
+            t1 = time.perf_counter()
+            flow_next = flow_field(grid, np.array([goal[1] * grid.shape[1] + goal[0]])).tolist()
+            paths = [flow_path(flow_next, grid.shape, start) for start in starts]
+            t2 = time.perf_counter()
+            t_astar += t1 - t0
+            t_flow += t2 - t1
+            for path, want in zip(paths, expected):
+                assert bool(path) == bool(want), "reachability mismatch"
+                assert abs(path_length(path) - path_length(want)) < 1e-6, "flow path longer than A*'s"
+        print(f"{count:>6} {t_astar / args.fields * 1e3:>9.2f} {t_flow / args.fields * 1e3:>9.2f}"
+              f" {t_astar / t_flow:>8.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--starts", type=int, nargs="+", default=[1, 4, 16])
+    parser.add_argument("--fields", type=int, default=30)
+    parser.add_argument("--asteroids", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    sweeps(args)
+
+
+if __name__ == "__main__":
+    main()
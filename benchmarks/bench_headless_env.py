@@ -0,0 +1,45 @@
+"""
+Throughput of AsteroidsRLLibEnv in headless mode.
+
+Steps the env with random actions and prints env steps/sec and how many
+times faster than real time (60 FPS) the simulation runs.
+
+    python benchmarks/bench_headless_env.py --steps 20000
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+main_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, os.path.join(main_dir, "adversarial-training-powerups"))
+
+from environment import AsteroidsRLLibEnv
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--steps", type=int, default=20000)
+    parser.add_argument("--fixed-dt", type=float, default=1.0 / 60.0)
+    args = parser.parse_args()
+
+    env = AsteroidsRLLibEnv({"headless": True, "fixed_dt": args.fixed_dt})
+    env.reset()
+
+    start = time.perf_counter()
+    for _ in range(args.steps):
+        env.step({"player": random.randrange(5), "asteroid": random.randrange(3)})
+    elapsed = time.perf_counter() - start
+
+    steps_per_sec = args.steps / elapsed
+    print(f"steps:          {args.steps}")
+    print(f"wall time:      {elapsed:.2f}s")
+    print(f"steps/sec:      {steps_per_sec:.0f}")
+    print(f"vs 60 FPS:      {steps_per_sec / 60.0:.1f}x real time")
+    print(f"env perf_stats: {env.perf_stats()}")
+    env.close()
+
+
+if __name__ == "__main__":
+    main()
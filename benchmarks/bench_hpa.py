@@ -0,0 +1,139 @@
+"""
+Replanning on finer grids: AStarAgent's flat A* versus HPA* (a
+hpa_star.ClusterGraph kept between replans) as the grid resolution grows.
+HPA* is not one of AStarAgent's planners: on the grids the game plans on
+it costs more per replan than A*, and it only wins on much finer ones
+(512x288 with 32-cell clusters).
+
+Moves a random asteroid field on by one replan interval per replan,
+builds the grid, and plans from a random free cell to the safest one,
+the way plan_path does. HPA* keeps its cluster graph between replans,
+recomputes only the clusters the asteroids touched that the search
+reaches, and refines only the first legs of the route (as much as
+a replan would need). Reports ms per replan for both, with HPA*'s grid
+update included, plus how many clusters it recomputed and how much
+longer its full routes are than A*'s.
+
+    python benchmarks/bench_hpa.py
+    python benchmarks/bench_hpa.py --grids 128x72 256x144 512x288 --cluster-size 16
+"""
+import argparse
+import math
+import os
+import sys
+import time
+
+main_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+sys.path.insert(0, os.path.join(main_dir, "agents"))
+sys.path.append(os.path.join(main_dir, "engine"))
+
+import numpy as np
+from a_star import AStarAgent
+from hpa_star import ClusterGraph
+from constants import ASTEROID_KINDS, ASTEROID_MIN_RADIUS, PLAYER_SPEED, SCREEN_HEIGHT, SCREEN_WIDTH
+from entity_store import ASTEROID, EntityStore
+
+
+def path_length(path):
+    return sum(math.hypot(b[0] - a[0], b[1] - a[1]) for a, b in zip(path, path[1:]))
+
+
+def hierarchical_search(astar, clusters, grid, start_cell, goal_cell, min_cells=None):
+    """
+    HPA*: update `clusters` with `grid` (only clusters whose cells or
+    entrances changed are recomputed), search its abstract graph and
+    refine legs of the route into cells until the path is min_cells long
+    (all of it when None). Paths may be slightly longer than A*'s.
+    """
+    rows, cols = grid.shape
+    sr, sc = start_cell[1], start_cell[0]
+    gr, gc = goal_cell[1], goal_cell[0]
+    if not (0 <= sr < rows and 0 <= sc < cols and 0 <= gr < rows and 0 <= gc < cols):
+        return []
+    if (not grid[sr, sc]) or (not grid[gr, gc]):
+        return []
+    clusters.update(grid)
+    path = clusters.find_path(start_cell, goal_cell, min_cells)
+    if not path:
+        # entrances only join cells side by side, so a route that can
+        # only squeeze diagonally across a cluster corner needs the grid
+        path = astar.a_star_search(grid, start_cell, goal_cell)
+    return path
+
+
+def make_field(count, rng):
+    store = EntityStore()
+    for _ in range(count):
+        speed = rng.uniform(40, 100)
+        angle = rng.uniform(0, 2 * math.pi)
+        store.spawn(
+            ASTEROID,
+            rng.uniform(0, SCREEN_WIDTH), rng.uniform(0, SCREEN_HEIGHT),
+            speed * math.cos(angle), speed * math.sin(angle),
+            radius=ASTEROID_MIN_RADIUS * int(rng.integers(1, ASTEROID_KINDS + 1)),
+        )
+    return store
+
+
+def run(grid_size, args):
+    rng = np.random.default_rng(args.seed)
+    store = make_field(args.asteroids, rng)
+    astar = AStarAgent(grid_size=grid_size, safe_distance=50)
+    clusters = ClusterGraph((grid_size[1], grid_size[0]), args.cluster_size)
+    # enough of the route to outlast the next replan twice over
+    cells = 2 * args.replan_interval * PLAYER_SPEED / min(astar.cell_width, astar.cell_height)
+    min_cells = int(math.ceil(cells)) + 1
+
+    t_astar = t_hpa = 0.0
+    rebuilt = ratio = routes = 0
+    for _ in range(args.replans):
+        store.integrate(args.replan_interval)
+        store.wrap(SCREEN_WIDTH, SCREEN_HEIGHT)
+        asteroids = store.view(ASTEROID)
+        grid = astar.build_grid(asteroids)
+        goal = astar.find_safest_cell(grid, asteroids)
+        free = np.argwhere(grid)
+        row, col = free[rng.integers(len(free))]
+        start = (int(col), int(row))
+
+        t0 = time.perf_counter()
+        expected = astar.a_star_search(grid, start, goal)
+        t1 = time.perf_counter()
+        path = hierarchical_search(astar, clusters, grid, start, goal, min_cells)
+        t2 = time.perf_counter()
+        t_astar += t1 - t0
+        t_hpa += t2 - t1
+        rebuilt += clusters.rebuilt
+
+        assert bool(path) == bool(expected), "reachability mismatch"
+        if expected:
+            full = clusters.find_path(start, goal)
+            ratio += path_length(full) / max(path_length(expected), 1e-9)
+            routes += 1
+
+    n = args.replans
+    print(f"{grid_size[0]:>4}x{grid_size[1]:<4} {t_astar / n * 1e3:>9.2f} {t_hpa / n * 1e3:>9.2f}"
+          f" {t_astar / t_hpa:>8.1f} {rebuilt / n:>8.1f}/{clusters.cluster_rows * clusters.cluster_cols:<5} {ratio / max(routes, 1):>10.3f}")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--grids", nargs="+", default=["64x36", "128x72", "256x144"])
+    parser.add_argument("--asteroids", type=int, default=20)
+    parser.add_argument("--replans", type=int, default=50)
+    parser.add_argument("--replan-interval", type=float, default=0.4)
+    parser.add_argument("--cluster-size", type=int, default=16)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    print(f"{args.asteroids} asteroids, {args.replans} replans every {args.replan_interval}s,"
+          f" {args.cluster_size}-cell clusters")
+    print(f"{'grid':>9} {'A* ms':>9} {'HPA* ms':>9} {'speedup':>8} {'rebuilt/clusters':>16} {'route/A*':>10}")
+    for spec in args.grids:
+        cols, rows = (int(v) for v in spec.split("x"))
+        run((cols, rows), args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""
+AsteroidsRLLibEnv step time over one long episode.
+
+The asteroid agent spawns every step and the player is made immortal, so
+without a lifecycle policy the store keeps growing with asteroids that have
+left the screen. Prints ms/step and the live/culled entity counters from
+the info dict for each window of steps; with the default policy the step
+time should stay flat.
+
+    python benchmarks/bench_long_episode.py --steps 10000
+    python benchmarks/bench_long_episode.py --steps 10000 --no-culling
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+main_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, os.path.join(main_dir, "adversarial-training-powerups"))
+
+from environment import AsteroidsRLLibEnv, DEFAULT_LIFECYCLE
+from lifecycle import LifecyclePolicy
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--steps", type=int, default=10000)
+    parser.add_argument("--window", type=int, default=1000)
+    parser.add_argument("--no-culling", action="store_true",
+                        help="keep only the shot/powerup TTLs, no culling or caps")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    random.seed(args.seed)
+    config = {"headless": True}
+    if args.no_culling:
+        config["lifecycle"] = LifecyclePolicy(ttl=DEFAULT_LIFECYCLE["ttl"])
+    env = AsteroidsRLLibEnv(config)
+    env.reset()
+    env.max_steps = float("inf")
+    env.player.player_lives = 10**9
+
+    print(f"{'steps':>8} {'ms/step':>9} {'asteroids':>10} {'shots':>6} {'culled':>7}")
+    culled = 0
+    start = time.perf_counter()
+    for step in range(1, args.steps + 1):
+        _, _, _, _, info = env.step({"player": random.randrange(5), "asteroid": 1})
+        culled += sum(info["player"]["culled"].values())
+        if step % args.window == 0:
+            elapsed = time.perf_counter() - start
+            live = info["player"]["live"]
+            print(f"{step:>8} {elapsed / args.window * 1e3:>9.3f} "
+                  f"{live['asteroid']:>10} {live['shot']:>6} {culled:>7}")
+            culled = 0
+            start = time.perf_counter()
+    env.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""
+Per-step observation allocations with reused buffers versus copy-on-return.
+
+Steps an env to steady state, keeps every observation it returns, and
+reports how many distinct arrays that was and (via tracemalloc) how many
+bytes allocated inside the obs builders are still held. With reused
+buffers (copy_obs=False for the PCG envs, "copy_obs": False for the
+RLlib env) every step returns the same arrays and the builders allocate
+nothing.
+
+    python benchmarks/bench_obs_alloc.py --env koster
+    python benchmarks/bench_obs_alloc.py --env astar
+    python benchmarks/bench_obs_alloc.py --env rllib
+
+Each env imports its own game modules, so run one env per process.
+"""
+import argparse
+import inspect
+import os
+import sys
+import time
+import tracemalloc
+
+main_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+import numpy as np
+
+
+def make_env(name, copy_obs):
+    if name == "rllib":
+        sys.path.insert(0, os.path.join(main_dir, "adversarial-training-powerups"))
+        from environment import AsteroidsRLLibEnv
+
+        env = AsteroidsRLLibEnv({"headless": True, "seed": 0, "copy_obs": copy_obs})
+        env.reset()
+        rng = np.random.default_rng(0)
+        return env, lambda: {"player": int(rng.integers(5)), "asteroid": int(rng.integers(3))}
+
+    os.chdir(main_dir)
+    sys.path.insert(0, os.path.join(main_dir, "pcg-agents"))
+    if name == "koster":
+        from pcgrl_koster import AsteroidsPCGEnvKoster as Env
+    else:
+        from pcgrl import AsteroidsPCGEnvWithAStar as Env
+    env = Env(render_mode=None, max_steps=10**9, copy_obs=copy_obs)
+    env.reset(seed=0)
+    env.action_space.seed(0)
+    return env, env.action_space.sample
+
+
+def obs_arrays(obs):
+    return list(obs.values()) if isinstance(obs, dict) else [obs]
+
+
+def builder_lines(env):
+    """
+    (filename, first line, last line) of each observation builder on env.
+    """
+    spans = []
+    for name in ("_get_obs", "_get_player_obs", "_get_asteroid_obs"):
+        method = getattr(env, name, None)
+        if method is not None:
+            lines, first = inspect.getsourcelines(method)
+            spans.append((inspect.getsourcefile(method), first, first + len(lines) - 1))
+    return spans
+
+
+def measure(name, copy_obs, warmup, steps):
+    env, sample = make_env(name, copy_obs)
+    for _ in range(warmup):
+        env.step(sample())
+    spans = builder_lines(env)
+
+    kept = []
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    start = time.perf_counter()
+    for _ in range(steps):
+        kept.extend(obs_arrays(env.step(sample())[0]))
+    elapsed = time.perf_counter() - start
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+
+    # bytes still held that were allocated inside an obs builder
+    held = 0
+    for stat in after.compare_to(before, "lineno"):
+        frame = stat.traceback[0]
+        if any(frame.filename == f and lo <= frame.lineno <= hi for f, lo, hi in spans):
+            held += stat.size_diff
+    distinct = len({id(a) for a in kept})
+    env.close()
+    return distinct, held, steps / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--env", choices=["koster", "astar", "rllib"], default="koster")
+    parser.add_argument("--warmup", type=int, default=300)
+    parser.add_argument("--steps", type=int, default=1000)
+    args = parser.parse_args()
+
+    print(f"env: {args.env}")
+    print(f"{'mode':>6} {'distinct obs arrays':>20} {'obs bytes held':>15} {'steps/sec':>10}")
+    for copy_obs in (False, True):
+        distinct, held, rate = measure(args.env, copy_obs, args.warmup, args.steps)
+        mode = "copy" if copy_obs else "reuse"
+        print(f"{mode:>6} {distinct:>20} {held:>15} {rate:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""
+AStarAgent planner stages against the per-cell Python loops they replaced.
+
+For growing asteroid counts, times
+  - build_grid: stamping cached disc stencils vs the nested-list loop
+    calling math.hypot per bounding-box cell
+  - find_safest_cell: argmax over the distance field vs measuring every
+    passable cell against every asteroid
+and checks both versions of each stage give the same result. The loop's
+safest-cell cost scales with the free cells left, so it is printed too.
+
+    python benchmarks/bench_planner.py --counts 10 50 200
+"""
+import argparse
+import math
+import os
+import sys
+import time
+
+main_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+sys.path.insert(0, os.path.join(main_dir, "agents"))
+sys.path.append(os.path.join(main_dir, "engine"))
+
+import numpy as np
+from a_star import AStarAgent
+from constants import ASTEROID_KINDS, ASTEROID_MIN_RADIUS, SCREEN_HEIGHT, SCREEN_WIDTH
+from entity_store import ASTEROID, EntityStore
+
+
+def best_of(fn, repeats):
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def loop_build_grid(agent, asteroids):
+    grid = [[True for _ in range(agent.grid_cols)] for _ in range(agent.grid_rows)]
+    for asteroid in asteroids:
+        ax, ay = asteroid.position.x, asteroid.position.y
+        block_radius = asteroid.radius + agent.safe_distance
+        min_col = max(0, int((ax - block_radius) // agent.cell_width))
+        max_col = min(agent.grid_cols - 1, int((ax + block_radius) // agent.cell_width))
+        min_row = max(0, int((ay - block_radius) // agent.cell_height))
+        max_row = min(agent.grid_rows - 1, int((ay + block_radius) // agent.cell_height))
+        for row in range(min_row, max_row + 1):
+            for col in range(min_col, max_col + 1):
+                cx = (col + 0.5) * agent.cell_width
+                cy = (row + 0.5) * agent.cell_height
+                if math.hypot(cx - ax, cy - ay) < block_radius:
+                    grid[row][col] = False
+    return grid
+
+
+def loop_find_safest_cell(agent, grid, asteroids):
+    best_cell = None
+    best_dist = -1
+    for row in range(agent.grid_rows):
+        for col in range(agent.grid_cols):
+            if not grid[row][col]:
+                continue
+            cx, cy = agent.grid_to_world(col, row)
+            nearest = float("inf")
+            for asteroid in asteroids:
+                nearest = min(nearest, math.hypot(cx - asteroid.position.x, cy - asteroid.position.y))
+            if nearest > best_dist:
+                best_dist = nearest
+                best_cell = (col, row)
+    return best_cell
+
+
+def make_asteroids(count, rng):
+    store = EntityStore()
+    for _ in range(count):
+        store.spawn(
+            ASTEROID,
+            rng.uniform(0, SCREEN_WIDTH), rng.uniform(0, SCREEN_HEIGHT),
+            radius=ASTEROID_MIN_RADIUS * int(rng.integers(1, ASTEROID_KINDS + 1)),
+        )
+    return store.view(ASTEROID)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--counts", type=int, nargs="+", default=[10, 50, 200])
+    parser.add_argument("--repeats", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    agent = AStarAgent(grid_size=(64, 36), safe_distance=50)
+    print(f"{'stage':>12} {'asteroids':>9} {'loop ms':>9} {'numpy ms':>9} {'speedup':>8}")
+    for count in args.counts:
+        asteroids = make_asteroids(count, rng)
+
+        t_loop, expected = best_of(lambda: loop_build_grid(agent, asteroids), args.repeats)
+        t_new, grid = best_of(lambda: agent.build_grid(asteroids), args.repeats)
+        assert np.array_equal(grid, np.array(expected)), "build_grid mismatch"
+        print(f"{'build_grid':>12} {count:>9} {t_loop * 1e3:>9.3f} {t_new * 1e3:>9.3f} {t_loop / t_new:>8.1f}")
+
+        # the loop walks sprite-style refs, as the agent used to
+        refs = list(asteroids)
+        t_loop, expected = best_of(lambda: loop_find_safest_cell(agent, expected, refs), args.repeats)
+        t_new, cell = best_of(lambda: agent.find_safest_cell(grid, asteroids), args.repeats)
+        assert cell == expected, "find_safest_cell mismatch"
+        print(f"{'safest_cell':>12} {count:>9} {t_loop * 1e3:>9.3f} {t_new * 1e3:>9.3f} {t_loop / t_new:>8.1f}"
+              f"  ({int(grid.sum())} free cells)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+Where the Koster env's surrogate player spends its planning time, from
+AStarAgent(instrument=True), and what the instrumentation itself costs.
+
+Plays the same seeded episodes, with random spawn actions, with the
+default agent uninstrumented and instrumented, and reports steps per
+second for both. Then breaks the instrumented run down per phase: total
+ms, calls, mean ms per call and share of env step time, plus the replan
+counters.
+
+    python benchmarks/bench_planner_stats.py
+    python benchmarks/bench_planner_stats.py --episodes 40 --planner jps
+"""
+import argparse
+import os
+import sys
+import time
+
+main_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.chdir(main_dir)
+sys.path.insert(0, os.path.join(main_dir, "pcg-agents"))
+
+from pcgrl_koster import AsteroidsPCGEnvKoster
+from planner_stats import COUNTS, PHASES
+
+
+def run(instrument, args):
+    env = AsteroidsPCGEnvKoster(render_mode=None, max_steps=args.max_steps, planner=args.planner,
+                                instrument=instrument)
+    steps = 0
+    episodes = []
+    start = time.perf_counter()
+    for episode in range(args.episodes):
+        env.reset(seed=args.seed + episode)
+        env.action_space.seed(args.seed + episode)
+        while True:
+            _, _, terminated, truncated, info = env.step(env.action_space.sample())
+            steps += 1
+            if terminated or truncated:
+                episodes.append(info.get("planner_stats"))
+                break
+    elapsed = time.perf_counter() - start
+    summary = env.agent.stats.summary(totals=True) if instrument else None
+    env.close()
+    return steps, elapsed, summary, episodes
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--episodes", type=int, default=20)
+    parser.add_argument("--max-steps", type=int, default=600)
+    parser.add_argument("--planner", default="astar")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    print(f"{args.episodes} episodes of up to {args.max_steps} steps, planner {args.planner}")
+    print(f"{'instrument':>10} {'steps/s':>9}")
+    for instrument in (False, True):
+        steps, elapsed, summary, episodes = run(instrument, args)
+        print(f"{str(instrument):>10} {steps / elapsed:>9.0f}")
+
+    assert summary["replans"] == sum(e["replans"] for e in episodes), "episode infos don't add up"
+    print()
+    print(f"{'phase':>20} {'ms':>9} {'calls':>7} {'mean ms':>8} {'% step':>7}")
+    for phase in PHASES:
+        if f"{phase}_calls" not in summary:
+            continue
+        ms = summary[f"{phase}_ms"]
+        print(f"{phase:>20} {ms:>9.1f} {summary[f'{phase}_calls']:>7} {summary[f'{phase}_mean_ms']:>8.3f}"
+              f" {100 * ms / (elapsed * 1e3):>7.1f}")
+    print("  " + ", ".join(f"{name} {summary[name]}" for name in COUNTS)
+          + f", {summary['expansions_per_replan']:.1f} expansions and"
+            f" {summary['path_cells_per_replan']:.1f} path cells per replan")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+"""
+Planning for many envs in one process: every Koster env's A* player
+planning for itself versus all of them handing their replans to one
+PlanningService, flushed once per tick, in-process and on a pool of
+worker processes.
+
+Part one stamps a batch of asteroid fields into grids one build_grid()
+call at a time and in the service's single pass, and checks the grids
+and the pooled paths match. Part two steps `--envs` Koster envs in
+lockstep with random spawn actions, replanning every tick (as many
+replans as possible, to measure planning throughput) or on the envs'
+usual interval, and reports env steps and replans per second. The
+pooled rows are the check on the service's experimental worker pool:
+only a multi-core machine can show whether it scales.
+
+    python benchmarks/bench_planning_service.py
+    python benchmarks/bench_planning_service.py --envs 32 --workers 0 2 4 8 --interval 0
+"""
+import argparse
+import math
+import os
+import sys
+import time
+
+main_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.chdir(main_dir)
+sys.path.insert(0, os.path.join(main_dir, "pcg-agents"))
+
+import numpy as np
+import pygame
+from pcgrl_koster import AsteroidsPCGEnvKoster
+from a_star import AStarAgent
+from planning_service import PlanningService, Request
+from constants import ASTEROID_KINDS, ASTEROID_MIN_RADIUS, PLAYER_SPEED, SCREEN_HEIGHT, SCREEN_WIDTH
+from entity_store import ASTEROID, EntityStore
+
+
+class StillPlayer:
+    def __init__(self, x, y):
+        self.position = pygame.Vector2(x, y)
+        self.player_speed = PLAYER_SPEED
+
+
+def make_requests(count, asteroids, rng):
+    requests = []
+    for _ in range(count):
+        store = EntityStore()
+        for _ in range(asteroids):
+            store.spawn(
+                ASTEROID, rng.uniform(0, SCREEN_WIDTH), rng.uniform(0, SCREEN_HEIGHT),
+                radius=ASTEROID_MIN_RADIUS * int(rng.integers(1, ASTEROID_KINDS + 1)),
+            )
+        view = store.view(ASTEROID)
+        player = StillPlayer(rng.uniform(0, SCREEN_WIDTH), rng.uniform(0, SCREEN_HEIGHT))
+        agent = AStarAgent(grid_size=(64, 36), safe_distance=50)
+        requests.append((agent, Request(player, view, view.pos.astype(np.float64),
+                                        view.radius.astype(np.float64), ())))
+    return requests
+
+
+def stamping(args, rng):
+    requests = make_requests(args.envs, args.asteroids, rng)
+    service = PlanningService(workers=max(args.workers))
+    start = time.perf_counter()
+    for _ in range(args.repeats):
+        single = [agent.build_grid(request.asteroids) for agent, request in requests]
+    t_single = (time.perf_counter() - start) / args.repeats
+    start = time.perf_counter()
+    for _ in range(args.repeats):
+        batched = service.build_grids(requests)
+    t_batched = (time.perf_counter() - start) / args.repeats
+    assert all((a == b).all() for a, b in zip(single, batched)), "grid mismatch"
+
+    expected = []
+    for agent, request in requests:
+        agent.current_path = agent.plan_path(request.player, request.asteroids, ())
+        expected.append(agent.current_path)
+    for agent, request in requests:
+        service.submit(agent, request.player, request.asteroids)
+    service.flush()
+    service.close()
+    assert [agent.current_path for agent, _ in requests] == expected, "path mismatch"
+    print(f"{args.envs} grids of {args.asteroids} asteroids: build_grid each {t_single * 1e3:.2f} ms,"
+          f" one batched pass {t_batched * 1e3:.2f} ms ({t_single / t_batched:.1f}x);"
+          f" paths from {max(args.workers)} workers match")
+
+
+def run(workers, args):
+    service = None if workers is None else PlanningService(workers=workers)
+    envs = [
+        AsteroidsPCGEnvKoster(render_mode=None, max_steps=args.max_steps,
+                              replan_interval=args.interval, planning_service=service)
+        for _ in range(args.envs)
+    ]
+    for i, env in enumerate(envs):
+        env.reset(seed=args.seed + i)
+        env.action_space.seed(args.seed + i)
+    replans = [0]
+    for env in envs:
+        plan_path = env.agent.plan_path
+
+        def counted(*a, plan_path=plan_path):
+            replans[0] += 1
+            return plan_path(*a)
+
+        env.agent.plan_path = counted
+    if service is not None:
+        # warm the pool up outside the timing
+        service.flush()
+
+    start = time.perf_counter()
+    for _ in range(args.ticks):
+        for env in envs:
+            _, _, terminated, truncated, _ = env.step(env.action_space.sample())
+            if terminated or truncated:
+                env.reset()
+        if service is not None:
+            service.flush()
+    elapsed = time.perf_counter() - start
+    if service is not None:
+        replans[0] = service.stats["requests"]
+        service.close()
+    for env in envs:
+        env.close()
+    return args.ticks * args.envs / elapsed, replans[0] / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--envs", type=int, default=16)
+    parser.add_argument("--workers", type=int, nargs="+", default=[0, 2, 4])
+    parser.add_argument("--asteroids", type=int, default=20)
+    parser.add_argument("--repeats", type=int, default=50)
+    parser.add_argument("--ticks", type=int, default=200)
+    parser.add_argument("--max-steps", type=int, default=600)
+    # 0 replans every tick
+    parser.add_argument("--interval", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    stamping(args, np.random.default_rng(args.seed))
+    print()
+    print(f"{args.envs} Koster envs, {args.ticks} ticks, replan interval {args.interval}s, {os.cpu_count()} CPUs")
+    print(f"{'planning':>14} {'steps/s':>9} {'replans/s':>10}")
+    base = None
+    for workers in [None] + args.workers:
+        name = "each env" if workers is None else f"service x{workers}"
+        steps, replans = run(workers, args)
+        base = base or steps
+        print(f"{name:>14} {steps:>9.0f} {replans:>10.0f}  ({steps / base:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
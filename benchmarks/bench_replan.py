@@ -0,0 +1,79 @@
+"""
+Replanning every frame: the Koster env's surrogate player with A* (and
+JPS) searching from scratch on each replan versus D* Lite
+(planner="dstar") repairing the tree it kept from the last one.
+
+Steps the env with random spawn actions and a short replan interval,
+and reports per planner the replans made, nodes expanded and time spent
+inside the grid search itself (grid building and goal picking are the
+same for all three and left out). Paths can break ties differently, so
+the games drift apart after a while; the totals still compare.
+
+    python benchmarks/bench_replan.py
+    python benchmarks/bench_replan.py --steps 5000 --replan-interval 0.1
+"""
+import argparse
+import os
+import sys
+import time
+
+main_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.chdir(main_dir)
+sys.path.insert(0, os.path.join(main_dir, "pcg-agents"))
+
+from pcgrl_koster import AsteroidsPCGEnvKoster
+
+SEARCH_METHODS = {
+    "astar": "a_star_search",
+    "jps": "jump_point_search",
+    "dstar": "incremental_search",
+}
+
+
+def run(planner, steps, replan_interval, seed):
+    env = AsteroidsPCGEnvKoster(
+        render_mode=None, max_steps=10**9, replan_interval=replan_interval, planner=planner
+    )
+    env.reset(seed=seed)
+    env.action_space.seed(seed)
+    agent = env.agent
+
+    totals = {"replans": 0, "expansions": 0, "seconds": 0.0}
+    search = getattr(agent, SEARCH_METHODS[planner])
+
+    def timed(*args, **kwargs):
+        start = time.perf_counter()
+        path = search(*args, **kwargs)
+        totals["seconds"] += time.perf_counter() - start
+        totals["replans"] += 1
+        totals["expansions"] += agent.last_expansions
+        return path
+
+    setattr(agent, SEARCH_METHODS[planner], timed)
+    for _ in range(steps):
+        _, _, terminated, truncated, _ = env.step(env.action_space.sample())
+        if terminated or truncated:
+            env.reset()
+    env.close()
+    return totals
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--steps", type=int, default=2000)
+    parser.add_argument("--replan-interval", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    print(f"{args.steps} steps, replan interval {args.replan_interval}s")
+    print(f"{'planner':>8} {'replans':>8} {'expansions':>11} {'exp/replan':>11} {'search ms':>10} {'ms/replan':>10}")
+    for planner in SEARCH_METHODS:
+        t = run(planner, args.steps, args.replan_interval, args.seed)
+        replans = max(t["replans"], 1)
+        print(f"{planner:>8} {t['replans']:>8} {t['expansions']:>11} {t['expansions'] / replans:>11.1f}"
+              f" {t['seconds'] * 1e3:>10.1f} {t['seconds'] * 1e3 / replans:>10.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+When to replan: the Koster env's surrogate player replanning on its fixed
+replan_interval timer versus a ReplanScheduler (time-to-collision, newly
+blocked path cells and drift checks), with and without a per-frame CPU
+budget.
+
+Plays the same seeded episodes, with random spawn actions, for each
+setup and reports how often the player was hit, mean steps survived,
+replans per episode, planner time per step and the scheduler's counters.
+Most episodes end in a hit, so hit counts vary by several between seeds;
+compare setups over several hundred episodes (the default 480).
+
+    python benchmarks/bench_scheduler.py
+    python benchmarks/bench_scheduler.py --episodes 60 --budget-ms 0.2 --planner spacetime
+"""
+import argparse
+import os
+import sys
+import time
+
+main_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.chdir(main_dir)
+sys.path.insert(0, os.path.join(main_dir, "pcg-agents"))
+
+from pcgrl_koster import AsteroidsPCGEnvKoster
+from replan_scheduler import REASONS, ReplanScheduler
+
+
+def run(scheduler, planner, episodes, max_steps, seed):
+    env = AsteroidsPCGEnvKoster(render_mode=None, max_steps=max_steps, planner=planner, scheduler=scheduler)
+    agent = env.agent
+    totals = {"replans": 0, "seconds": 0.0}
+    plan_path = agent.plan_path
+
+    def timed(*args):
+        start = time.perf_counter()
+        path = plan_path(*args)
+        totals["seconds"] += time.perf_counter() - start
+        totals["replans"] += 1
+        return path
+
+    agent.plan_path = timed
+    hits = steps = 0
+    for episode in range(episodes):
+        env.reset(seed=seed + episode)
+        env.action_space.seed(seed + episode)
+        while True:
+            _, _, terminated, truncated, _ = env.step(env.action_space.sample())
+            steps += 1
+            if terminated or truncated:
+                hits += terminated
+                break
+    env.close()
+    return hits, steps, totals
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--episodes", type=int, default=480)
+    parser.add_argument("--max-steps", type=int, default=600)
+    parser.add_argument("--budget-ms", type=float, default=0.1)
+    parser.add_argument("--planner", default="astar")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    setups = [
+        ("timer", None),
+        ("scheduler", ReplanScheduler()),
+        (f"budget {args.budget_ms}ms", ReplanScheduler(budget_ms=args.budget_ms)),
+    ]
+    print(f"{args.episodes} episodes of up to {args.max_steps} steps, planner {args.planner}")
+    print(f"{'replanning':>14} {'hit':>5} {'steps/ep':>9} {'replans/ep':>11} {'plan ms/step':>13}")
+    for name, scheduler in setups:
+        hits, steps, t = run(scheduler, args.planner, args.episodes, args.max_steps, args.seed)
+        print(f"{name:>14} {hits:>5} {steps / args.episodes:>9.1f} {t['replans'] / args.episodes:>11.1f}"
+              f" {t['seconds'] * 1e3 / steps:>13.3f}")
+        if scheduler is not None:
+            counters = scheduler.counters
+            print(f"{'':>14} triggered {counters['triggered']}, skipped {counters['skipped']},"
+                  f" deferred {counters['deferred']};"
+                  f" by reason: " + ", ".join(f"{r} {counters[r]}" for r in REASONS))
+
+
+if __name__ == "__main__":
+    main()
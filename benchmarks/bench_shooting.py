@@ -0,0 +1,138 @@
+"""
+AStarAgent.shoot_if_possible: one NumPy pass over the asteroid arrays
+versus the per-asteroid loop it replaced (math.hypot plus angle_between's
+two Vector2s and two atan2 calls each), and what lead_shots does to shot
+accuracy.
+
+Part one times a single call, cooldown over, for growing asteroid counts
+and checks both versions make the same decision. Part two plays Koster
+env episodes with lead_shots off and on and counts shots fired against
+asteroids hit.
+
+    python benchmarks/bench_shooting.py
+    python benchmarks/bench_shooting.py --counts 10 100 1000 --episodes 40
+"""
+import argparse
+import math
+import os
+import sys
+import time
+
+main_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.chdir(main_dir)
+sys.path.insert(0, os.path.join(main_dir, "pcg-agents"))
+
+import numpy as np
+import pygame
+from pcgrl_koster import AsteroidsPCGEnvKoster
+from a_star import AStarAgent
+from constants import SCREEN_HEIGHT, SCREEN_WIDTH
+from entity_store import ASTEROID, EntityStore
+
+
+class StillPlayer:
+    """
+    Just what shoot_if_possible reads, counting shots instead of firing.
+    """
+
+    player_shoot_cooldown = 0.3
+
+    def __init__(self, x, y, rotation):
+        self.position = pygame.Vector2(x, y)
+        self.rotation = rotation
+        self.timer = 0
+        self.shots = 0
+
+    def shoot(self):
+        self.shots += 1
+
+
+def loop_in_front(agent, player, asteroids):
+    forward_vec = pygame.Vector2(0, 1).rotate(player.rotation)
+    best_asteroid = None
+    best_dist = float("inf")
+    for asteroid in asteroids:
+        dx = asteroid.position.x - player.position.x
+        dy = asteroid.position.y - player.position.y
+        dist = math.hypot(dx, dy)
+        if dist > agent.shoot_distance:
+            continue
+        if abs(agent.angle_between(forward_vec, (dx, dy))) < agent.shoot_angle_thresh:
+            if dist < best_dist:
+                best_dist = dist
+                best_asteroid = asteroid
+    return best_asteroid is not None
+
+
+def time_calls(counts, repeats, rng):
+    agent = AStarAgent(shoot_distance=300, shoot_angle_thresh=15)
+    print(f"{'asteroids':>9} {'loop us':>9} {'numpy us':>9} {'speedup':>8}")
+    for count in counts:
+        store = EntityStore()
+        for _ in range(count):
+            store.spawn(ASTEROID, rng.uniform(0, SCREEN_WIDTH), rng.uniform(0, SCREEN_HEIGHT), radius=40)
+        asteroids = store.view(ASTEROID)
+        refs = list(asteroids)
+        players = [
+            StillPlayer(rng.uniform(0, SCREEN_WIDTH), rng.uniform(0, SCREEN_HEIGHT), rng.uniform(0, 360))
+            for _ in range(repeats)
+        ]
+        start = time.perf_counter()
+        expected = [loop_in_front(agent, p, refs) for p in players]
+        t_loop = (time.perf_counter() - start) / repeats
+        start = time.perf_counter()
+        for p in players:
+            agent.shoot_if_possible(p, asteroids)
+        t_new = (time.perf_counter() - start) / repeats
+        assert [p.shots == 1 for p in players] == expected, "shoot decision mismatch"
+        print(f"{count:>9} {t_loop * 1e6:>9.1f} {t_new * 1e6:>9.1f} {t_loop / t_new:>8.1f}")
+
+
+def accuracy(lead_shots, episodes, seed):
+    agent = AStarAgent(
+        grid_size=(64, 36), safe_distance=50, replan_interval=0.5,
+        shoot_distance=300, shoot_angle_thresh=15, lead_shots=lead_shots,
+    )
+    env = AsteroidsPCGEnvKoster(render_mode=None, agent=agent)
+    shots = hits = 0
+    for episode in range(episodes):
+        env.reset(seed=seed + episode)
+        env.action_space.seed(seed + episode)
+        shoot = env.player.shoot
+        fired = [0]
+
+        def counted():
+            fired[0] += 1
+            shoot()
+
+        env.player.shoot = counted
+        while True:
+            _, _, terminated, truncated, info = env.step(env.action_space.sample())
+            if terminated or truncated:
+                break
+        shots += fired[0]
+        hits += info["score"]
+    env.close()
+    return shots, hits
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--counts", type=int, nargs="+", default=[10, 50, 200, 1000])
+    parser.add_argument("--repeats", type=int, default=500)
+    parser.add_argument("--episodes", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    time_calls(args.counts, args.repeats, np.random.default_rng(args.seed))
+    print()
+    print(f"{args.episodes} Koster episodes")
+    print(f"{'lead_shots':>10} {'shots':>6} {'hits':>6} {'hits/shot':>10}")
+    for lead_shots in (False, True):
+        shots, hits = accuracy(lead_shots, args.episodes, args.seed)
+        print(f"{str(lead_shots):>10} {shots:>6} {hits:>6} {hits / max(shots, 1):>10.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""
+get_state() / set_state() cost for the three envs, and a check that a
+restored snapshot replays the same trajectory.
+
+Plays each env for --warmup steps, snapshots it, plays --branch more
+steps, restores and plays the same actions again; the two branches must
+produce identical observations and rewards. The Koster env runs this
+check for every planner in a_star.PLANNERS, with and without a
+ReplanScheduler, over --seeds seeds, since each keeps its own state. Then times get_state and
+set_state.
+
+    python benchmarks/bench_snapshot.py --env koster
+    python benchmarks/bench_snapshot.py --env astar
+    python benchmarks/bench_snapshot.py --env rllib
+
+Each env imports its own game modules (constants, player, ...), so run
+one env per process.
+"""
+import argparse
+import os
+import sys
+import time
+
+main_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+import numpy as np
+
+
+def make_env(name, seed=0, **env_kwargs):
+    if name == "rllib":
+        sys.path.insert(0, os.path.join(main_dir, "adversarial-training-powerups"))
+        from environment import AsteroidsRLLibEnv
+
+        env = AsteroidsRLLibEnv({"headless": True})
+        env.reset(seed=seed)
+        rng = np.random.default_rng(seed)
+        return env, lambda: {"player": int(rng.integers(5)), "asteroid": int(rng.integers(3))}
+
+    # the PCG envs resolve their game modules relative to the repo root
+    os.chdir(main_dir)
+    sys.path.insert(0, os.path.join(main_dir, "pcg-agents"))
+    if name == "koster":
+        from pcgrl_koster import AsteroidsPCGEnvKoster as Env
+    else:
+        from pcgrl import AsteroidsPCGEnvWithAStar as Env
+    env = Env(render_mode=None, max_steps=10**9, **env_kwargs)
+    env.reset(seed=seed)
+    env.action_space.seed(seed)
+    return env, env.action_space.sample
+
+
+def play(env, actions):
+    trace = []
+    for action in actions:
+        obs, reward = env.step(action)[:2]
+        trace.append(repr(obs) + repr(reward))
+    return trace
+
+
+def check_replay(env, sample, args):
+    play(env, [sample() for _ in range(args.warmup)])
+    state = env.get_state()
+    actions = [sample() for _ in range(args.branch)]
+    first = play(env, actions)
+    env.set_state(state)
+    second = play(env, actions)
+    return state, first == second
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--env", choices=["koster", "astar", "rllib"], default="koster")
+    parser.add_argument("--warmup", type=int, default=300)
+    parser.add_argument("--branch", type=int, default=200)
+    parser.add_argument("--repeats", type=int, default=2000)
+    parser.add_argument("--seeds", type=int, default=4)
+    args = parser.parse_args()
+
+    env, sample = make_env(args.env)
+    if args.env == "koster":
+        # importable once the env has put the agents on sys.path
+        from a_star import PLANNERS
+        from replan_scheduler import ReplanScheduler
+
+        for planner in PLANNERS:
+            for scheduled in (False, True):
+                for seed in range(1, args.seeds + 1):
+                    scheduler = ReplanScheduler() if scheduled else None
+                    branch_env, branch_sample = make_env(args.env, seed, planner=planner, scheduler=scheduler)
+                    _, same = check_replay(branch_env, branch_sample, args)
+                    assert same, (f"restored snapshot diverged (planner {planner},"
+                                  f" scheduler {scheduled}, seed {seed})")
+            print(f"replay:     identical for planner {planner}, with and without a scheduler,"
+                  f" over {args.seeds} seeds")
+
+    state, same = check_replay(env, sample, args)
+    assert same, "restored snapshot diverged"
+
+    start = time.perf_counter()
+    for _ in range(args.repeats):
+        env.get_state()
+    get_us = (time.perf_counter() - start) / args.repeats * 1e6
+    start = time.perf_counter()
+    for _ in range(args.repeats):
+        env.set_state(state)
+    set_us = (time.perf_counter() - start) / args.repeats * 1e6
+
+    print(f"env:        {args.env}")
+    print(f"entities:   {state['entities'][0]}")
+    print(f"replay:     identical over {args.branch} steps")
+    print(f"get_state:  {get_us:.1f} us")
+    print(f"set_state:  {set_us:.1f} us")
+    env.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+Planning against predicted asteroid motion: Koster env episodes with the
+surrogate player on planner="astar" (asteroids frozen where they are at
+each replan) versus planner="spacetime" (asteroids moved along their
+velocities over the planning horizon), at several replan intervals.
+
+The adversary spawns asteroids at random. Reports, per planner and
+interval, how many episodes ended with the player hit rather than
+surviving to max_steps, the mean steps survived, replans per episode
+and planner time per step.
+
+    python benchmarks/bench_spacetime.py
+    python benchmarks/bench_spacetime.py --episodes 50 --intervals 0.25 0.5 1.0
+"""
+import argparse
+import os
+import sys
+import time
+
+main_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.chdir(main_dir)
+sys.path.insert(0, os.path.join(main_dir, "pcg-agents"))
+
+from pcgrl_koster import AsteroidsPCGEnvKoster
+
+
+def run(planner, replan_interval, episodes, max_steps, seed):
+    env = AsteroidsPCGEnvKoster(
+        render_mode=None, max_steps=max_steps, replan_interval=replan_interval, planner=planner
+    )
+    agent = env.agent
+    totals = {"replans": 0, "seconds": 0.0}
+    plan_path = agent.plan_path
+
+    def timed(*args):
+        start = time.perf_counter()
+        path = plan_path(*args)
+        totals["seconds"] += time.perf_counter() - start
+        totals["replans"] += 1
+        return path
+
+    agent.plan_path = timed
+    deaths = steps = 0
+    for episode in range(episodes):
+        env.reset(seed=seed + episode)
+        env.action_space.seed(seed + episode)
+        while True:
+            _, _, terminated, truncated, _ = env.step(env.action_space.sample())
+            steps += 1
+            if terminated or truncated:
+                deaths += terminated
+                break
+    env.close()
+    return deaths, steps, totals
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--episodes", type=int, default=30)
+    parser.add_argument("--max-steps", type=int, default=600)
+    parser.add_argument("--intervals", type=float, nargs="+", default=[0.25, 0.5, 1.0])
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    print(f"{args.episodes} episodes of up to {args.max_steps} steps")
+    print(f"{'planner':>10} {'interval':>8} {'hit':>5} {'steps/ep':>9} {'replans/ep':>11} {'plan ms/step':>13}")
+    for interval in args.intervals:
+        for planner in ("astar", "spacetime"):
+            deaths, steps, t = run(planner, interval, args.episodes, args.max_steps, args.seed)
+            print(f"{planner:>10} {interval:>8.2f} {deaths:>5} {steps / args.episodes:>9.1f}"
+                  f" {t['replans'] / args.episodes:>11.1f} {t['seconds'] * 1e3 / steps:>13.3f}")
+
+
+if __name__ == "__main__":
+    main()
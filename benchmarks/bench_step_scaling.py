@@ -0,0 +1,67 @@
+"""
+AsteroidsRLLibEnv step time as the number of live asteroids grows.
+
+Fills a headless env with a fixed population of asteroids (the player is
+made immortal so the episode never resets) and times env.step with a
+no-op action for each population size.
+
+    python benchmarks/bench_step_scaling.py --counts 10 100 1000
+"""
+import argparse
+import os
+import sys
+import time
+
+main_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, os.path.join(main_dir, "adversarial-training-powerups"))
+
+from constants import SCREEN_HEIGHT, SCREEN_WIDTH, POSSIBLE_RADII, POSSIBLE_SPEEDS
+from environment import AsteroidsRLLibEnv
+from entity_store import ASTEROID, SHOT
+from lifecycle import LifecyclePolicy
+import numpy as np
+
+
+def populate(env, count, rng):
+    pos = rng.uniform((0, 0), (SCREEN_WIDTH, SCREEN_HEIGHT), size=(count, 2))
+    heading = rng.uniform(0, 2 * np.pi, size=count)
+    speed = rng.choice(POSSIBLE_SPEEDS, size=count)
+    vel = np.stack((np.cos(heading), np.sin(heading)), axis=1) * speed[:, None]
+    env.entities.spawn_many(ASTEROID, pos, vel, rng.choice(POSSIBLE_RADII, size=count))
+
+
+def time_steps(count, steps, seed):
+    rng = np.random.default_rng(seed)
+    # no culling or caps, so the population stays at `count`
+    env = AsteroidsRLLibEnv({"headless": True, "lifecycle": LifecyclePolicy(ttl={SHOT: 2.0})})
+    env.reset()
+    env.max_steps = float("inf")
+    env.player.player_lives = 10**9
+    populate(env, count, rng)
+
+    action = {"player": 4, "asteroid": 0}
+    for _ in range(10):  # warm-up
+        env.step(action)
+    start = time.perf_counter()
+    for _ in range(steps):
+        env.step(action)
+    elapsed = time.perf_counter() - start
+    env.close()
+    return elapsed / steps
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--counts", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--steps", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    print(f"{'asteroids':>10} {'ms/step':>10} {'steps/sec':>10}")
+    for count in args.counts:
+        per_step = time_steps(count, args.steps, args.seed)
+        print(f"{count:>10} {per_step * 1e3:>10.3f} {1.0 / per_step:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
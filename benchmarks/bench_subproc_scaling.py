@@ -0,0 +1,55 @@
+"""
+Env throughput of train_parallel.py's vector envs as the worker count
+grows: aggregate env steps/sec stepping `--ticks` random actions in every
+worker, with no learning in the way, and the scaling relative to one
+worker.
+
+    python benchmarks/bench_subproc_scaling.py
+    python benchmarks/bench_subproc_scaling.py --env koster --workers 1 2 4 8 16 32
+"""
+import argparse
+import os
+import sys
+import time
+
+main_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, main_dir)
+
+import numpy as np
+from train_parallel import ENVS, make_envs
+
+
+def run(args, workers):
+    env = make_envs(args.env, workers, args.seed, args.vec, max_steps=args.max_steps)
+    env.reset()
+    env.action_space.seed(args.seed)
+    actions = [np.array([env.action_space.sample() for _ in range(workers)]) for _ in range(args.ticks)]
+    start = time.perf_counter()
+    for action in actions:
+        env.step(action)
+    elapsed = time.perf_counter() - start
+    env.close()
+    return args.ticks * workers / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--env", choices=ENVS, default="pcgrl")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--vec", choices=("subproc", "dummy"), default="subproc")
+    parser.add_argument("--ticks", type=int, default=1000)
+    parser.add_argument("--max-steps", type=int, default=600)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    print(f"{args.env}, {args.vec} vec env, {args.ticks} ticks per worker, {os.cpu_count()} CPUs")
+    print(f"{'workers':>7} {'steps/s':>9} {'scaling':>8} {'per worker':>11}")
+    base = None
+    for workers in args.workers:
+        rate = run(args, workers)
+        base = base or rate / workers
+        print(f"{workers:>7} {rate:>9.0f} {rate / base:>8.2f} {rate / workers / base:>11.2f}")
+
+
+if __name__ == "__main__":
+    main()
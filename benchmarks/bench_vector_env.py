@@ -0,0 +1,77 @@
+"""
+Training-side throughput: one AsteroidsPCGEnvWithAStar versus
+VectorAsteroidsPCGEnv running N games in lockstep, both driven by random
+spawn actions on a single core. Counts env steps (one game advancing one
+tick), so the two numbers compare directly.
+
+    python benchmarks/bench_vector_env.py --num-envs 64 256 1024
+    python benchmarks/bench_vector_env.py --ppo   # short PPO("MlpPolicy", env) run
+"""
+import argparse
+import os
+import sys
+import time
+
+main_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.chdir(main_dir)
+sys.path.insert(0, os.path.join(main_dir, "pcg-agents"))
+
+import numpy as np
+from pcgrl import AsteroidsPCGEnvWithAStar
+from vector_pcgrl import VectorAsteroidsPCGEnv
+
+
+def single_env_rate(steps, seed):
+    env = AsteroidsPCGEnvWithAStar(render_mode=None)
+    env.reset(seed=seed)
+    rng = np.random.default_rng(seed)
+    start = time.perf_counter()
+    for _ in range(steps):
+        _, _, terminated, truncated, _ = env.step(int(rng.integers(env.action_space.n)))
+        if terminated or truncated:
+            env.reset()
+    elapsed = time.perf_counter() - start
+    env.close()
+    return steps / elapsed
+
+
+def vector_env_rate(num_envs, ticks, seed):
+    env = VectorAsteroidsPCGEnv(num_envs, seed=seed)
+    env.reset()
+    rng = np.random.default_rng(seed)
+    start = time.perf_counter()
+    for _ in range(ticks):
+        env.step(rng.integers(env.action_space.n, size=num_envs))
+    elapsed = time.perf_counter() - start
+    return num_envs * ticks / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--num-envs", type=int, nargs="+", default=[64, 256, 1024])
+    parser.add_argument("--single-steps", type=int, default=1200)
+    parser.add_argument("--ticks", type=int, default=300)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--ppo", action="store_true")
+    args = parser.parse_args()
+
+    base = single_env_rate(args.single_steps, args.seed)
+    print(f"{'envs':>6} {'env-steps/sec':>14} {'speedup':>8}")
+    print(f"{'1':>6} {base:>14.0f} {1.0:>8.1f}")
+    for n in args.num_envs:
+        rate = vector_env_rate(n, args.ticks, args.seed)
+        print(f"{n:>6} {rate:>14.0f} {rate / base:>8.1f}")
+
+    if args.ppo:
+        from stable_baselines3 import PPO
+
+        env = VectorAsteroidsPCGEnv(64, seed=args.seed)
+        model = PPO("MlpPolicy", env, n_steps=64, batch_size=512, verbose=0, device="cpu")
+        start = time.perf_counter()
+        model.learn(total_timesteps=64 * 64 * 2)
+        print(f"PPO: {model.num_timesteps} timesteps in {time.perf_counter() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,365 @@
+import numpy as np
+import pygame
+
+# Entity kinds stored in EntityStore.kind
+ASTEROID = 0
+SHOT = 1
+SPEED_POWERUP = 2
+SHOT_POWERUP = 3
+LIFE_POWERUP = 4
+POWERUP_KINDS = (SPEED_POWERUP, SHOT_POWERUP, LIFE_POWERUP)
+
+
+class EntityStore:
+    """
+    Struct-of-arrays storage for the simulated entities of one game
+    (asteroids, shots, powerups). Every entity is one row across the
+    contiguous float32 columns below, so movement, wrapping and expiry are
+    single NumPy operations instead of a Python loop over sprites.
+
+    Rows [0, count) are in use, in spawn order. kill() only clears the alive
+    flag; compact() drops dead rows at the end of a tick.
+    """
+
+    def __init__(self, capacity=256):
+        self.count = 0
+        self.next_uid = 0
+        self._allocate(capacity)
+
+    def _allocate(self, capacity):
+        self.capacity = capacity
+        self.pos = np.zeros((capacity, 2), dtype=np.float32)
+        self.vel = np.zeros((capacity, 2), dtype=np.float32)
+        self.radius = np.zeros(capacity, dtype=np.float32)
+        self.kind = np.zeros(capacity, dtype=np.int8)
+        self.ttl = np.full(capacity, np.inf, dtype=np.float32)
+        self.alive = np.zeros(capacity, dtype=bool)
+        # Stable id per entity, used to keep a display sprite across frames
+        self.uid = np.zeros(capacity, dtype=np.int64)
+
+    def _columns(self):
+        return (self.pos, self.vel, self.radius, self.kind, self.ttl, self.alive, self.uid)
+
+    def _reserve(self, extra):
+        needed = self.count + extra
+        if needed <= self.capacity:
+            return
+        capacity = self.capacity
+        while capacity < needed:
+            capacity *= 2
+        old = self._columns()
+        n = self.count
+        self._allocate(capacity)
+        for new_col, old_col in zip(self._columns(), old):
+            new_col[:n] = old_col[:n]
+
+    def clear(self):
+        self.alive[: self.count] = False
+        self.count = 0
+
+    def get_state(self):
+        """
+        Copy of the rows in use, for set_state().
+        """
+        n = self.count
+        return (n, self.next_uid) + tuple(col[:n].copy() for col in self._columns())
+
+    def set_state(self, state):
+        n, next_uid = state[0], state[1]
+        self.alive[: self.count] = False
+        self.count = 0
+        self._reserve(n)
+        for col, saved in zip(self._columns(), state[2:]):
+            col[:n] = saved
+        self.count = n
+        self.next_uid = next_uid
+
+    def spawn(self, kind, x, y, vx=0.0, vy=0.0, radius=0.0, ttl=np.inf):
+        """
+        Add one entity and return its row.
+        """
+        self._reserve(1)
+        row = self.count
+        self.pos[row] = (x, y)
+        self.vel[row] = (vx, vy)
+        self.radius[row] = radius
+        self.kind[row] = kind
+        self.ttl[row] = ttl
+        self.alive[row] = True
+        self.uid[row] = self.next_uid
+        self.next_uid += 1
+        self.count += 1
+        return row
+
+    def spawn_many(self, kind, pos, vel, radius, ttl=np.inf):
+        """
+        Add len(pos) entities of one kind and return their rows.
+        """
+        k = len(pos)
+        self._reserve(k)
+        rows = np.arange(self.count, self.count + k)
+        self.pos[rows] = pos
+        self.vel[rows] = vel
+        self.radius[rows] = radius
+        self.kind[rows] = kind
+        self.ttl[rows] = ttl
+        self.alive[rows] = True
+        self.uid[rows] = np.arange(self.next_uid, self.next_uid + k)
+        self.next_uid += k
+        self.count += k
+        return rows
+
+    def kill(self, rows):
+        self.alive[rows] = False
+
+    def integrate(self, dt):
+        """
+        Advance every entity by velocity * dt.
+        """
+        n = self.count
+        self.pos[:n] += self.vel[:n] * dt
+
+    def age(self, dt):
+        """
+        Count down time-to-live and kill whatever ran out.
+        """
+        n = self.count
+        self.ttl[:n] -= dt
+        self.alive[:n] &= self.ttl[:n] > 0
+
+    def wrap(self, width, height):
+        """
+        Classic Asteroids wrapping: leaving one edge puts the entity on the
+        opposite edge.
+        """
+        n = self.count
+        x = self.pos[:n, 0]
+        y = self.pos[:n, 1]
+        left = x < 0
+        right = x > width
+        x[left] = width
+        x[right] = 0
+        top = y < 0
+        bottom = y > height
+        y[top] = height
+        y[bottom] = 0
+
+    def compact(self):
+        """
+        Drop dead rows, keeping the survivors in spawn order.
+        """
+        n = self.count
+        keep = self.alive[:n].copy()
+        if keep.all():
+            return
+        m = int(keep.sum())
+        for col in self._columns():
+            col[:m] = col[:n][keep]
+        self.alive[m:n] = False
+        self.count = m
+
+    def mask(self, kind):
+        """
+        Alive rows of `kind`, or of any kind in a tuple such as POWERUP_KINDS.
+        """
+        n = self.count
+        if isinstance(kind, tuple):
+            match = np.zeros(n, dtype=bool)
+            for k in kind:
+                match |= self.kind[:n] == k
+            return self.alive[:n] & match
+        return self.alive[:n] & (self.kind[:n] == kind)
+
+    def rows(self, kind):
+        return np.flatnonzero(self.mask(kind))
+
+    def count_kind(self, kind):
+        return int(np.count_nonzero(self.mask(kind)))
+
+    def view(self, kind):
+        return EntityView(self, self.rows(kind))
+
+    def ref(self, row):
+        return EntityRef(self.pos[row], self.vel[row], self.radius[row])
+
+
+class EntityRef:
+    """
+    Detached copy of one row with the sprite-style attributes
+    (position, velocity, radius) that per-object code reads.
+    """
+
+    __slots__ = ("position", "velocity", "radius")
+
+    def __init__(self, pos, vel, radius):
+        self.position = pygame.Vector2(float(pos[0]), float(pos[1]))
+        self.velocity = pygame.Vector2(float(vel[0]), float(vel[1]))
+        self.radius = float(radius)
+
+
+class EntityView:
+    """
+    Snapshot of the live rows of one kind. Vectorized code reads the
+    pos/vel/radius arrays; iterating yields EntityRefs for code that still
+    walks entities one at a time.
+    """
+
+    def __init__(self, store, rows):
+        self.rows = rows
+        self.pos = store.pos[rows]
+        self.vel = store.vel[rows]
+        self.radius = store.radius[rows]
+
+    def __len__(self):
+        return len(self.rows)
+
+    def __iter__(self):
+        for i in range(len(self.rows)):
+            yield EntityRef(self.pos[i], self.vel[i], self.radius[i])
+
+
+def rotate(vectors, degrees):
+    """
+    Rotate (n, 2) vectors by per-row angles in degrees, same sense as
+    pygame.Vector2.rotate.
+    """
+    theta = np.radians(degrees)
+    c = np.cos(theta)
+    s = np.sin(theta)
+    x = vectors[:, 0]
+    y = vectors[:, 1]
+    return np.stack((x * c - y * s, x * s + y * c), axis=1)
+
+
+def split_asteroids(store, rows, degrees, min_radius):
+    """
+    Vectorized Asteroid.split: kill the asteroids at `rows` and, for those
+    bigger than min_radius, spawn two children of radius - min_radius whose
+    velocity is the parent's rotated by +/- degrees and sped up 1.5x.
+    """
+    rows = np.asarray(rows)
+    store.kill(rows)
+    big = store.radius[rows] > min_radius
+    if not big.any():
+        return
+    parents = rows[big]
+    degrees = np.asarray(degrees, dtype=np.float32)[big]
+    pos = store.pos[parents]
+    vel = store.vel[parents]
+    radius = store.radius[parents] - min_radius
+    store.spawn_many(
+        ASTEROID,
+        np.concatenate((pos, pos)),
+        np.concatenate((rotate(vel, degrees), rotate(vel, -degrees))) * 1.5,
+        np.concatenate((radius, radius)),
+    )
+
+
+def spawn_sprites(store, kind, sprites, ttl=np.inf):
+    """
+    Move pygame sprites (anything with position, velocity and radius, e.g.
+    the Shots Player.shoot() adds to a group) into `store` as `kind` rows
+    and return the rows. The sprites themselves are left to the caller.
+    """
+    sprites = list(sprites)
+    if not sprites:
+        return np.arange(0)
+    return store.spawn_many(
+        kind,
+        [(s.position.x, s.position.y) for s in sprites],
+        [(s.velocity.x, s.velocity.y) for s in sprites],
+        [s.radius for s in sprites],
+        ttl,
+    )
+
+
+def resolve_hits(hit_a, hit_b):
+    """
+    Given colliding pairs (hit_a[i], hit_b[i]) sorted by a then b, keep the
+    first partner for each `a` among the `b`s not already used, so every
+    entity takes part in at most one hit (e.g. one shot destroys one asteroid).
+    """
+    used_a = set()
+    used_b = set()
+    pairs = []
+    for a, b in zip(hit_a.tolist(), hit_b.tolist()):
+        if a in used_a or b in used_b:
+            continue
+        used_a.add(a)
+        used_b.add(b)
+        pairs.append((a, b))
+    return pairs
+
+
+def circle_hits(store, kind_a, kind_b, broadphase=None):
+    """
+    Circle overlap between live entities of kind_a and of kind_b. Returns
+    row index arrays (a, b) sorted by a then b. With a SpatialHash
+    broadphase only the candidate pairs it returns are tested exactly;
+    without one every a is tested against every b.
+    """
+    rows_a = store.rows(kind_a)
+    rows_b = store.rows(kind_b)
+    if len(rows_a) == 0 or len(rows_b) == 0:
+        return rows_a[:0], rows_b[:0]
+    if broadphase is None:
+        d = store.pos[rows_a][:, None, :] - store.pos[rows_b][None, :, :]
+        reach = store.radius[rows_a][:, None] + store.radius[rows_b][None, :]
+        ia, ib = np.nonzero((d * d).sum(axis=2) <= reach * reach)
+        return rows_a[ia], rows_b[ib]
+
+    broadphase.build(store.pos[rows_a])
+    ia, ib = broadphase.query(store.pos[rows_b])
+    a = rows_a[ia]
+    b = rows_b[ib]
+    d = store.pos[a] - store.pos[b]
+    reach = store.radius[a] + store.radius[b]
+    hit = (d * d).sum(axis=1) <= reach * reach
+    a = a[hit]
+    b = b[hit]
+    order = np.lexsort((b, a))
+    return a[order], b[order]
+
+
+def circle_hits_point(store, kind, point, radius):
+    """
+    Rows of live `kind` entities overlapping a circle at `point`.
+    """
+    rows = store.rows(kind)
+    d = store.pos[rows] - np.asarray(point, dtype=np.float32)
+    reach = store.radius[rows] + radius
+    return rows[(d * d).sum(axis=1) <= reach * reach]
+
+
+class SpriteCache:
+    """
+    Display sprites for store rows, built only when something is drawn.
+    `factories` maps an entity kind to a callable(x, y, radius) returning a
+    sprite with a draw(screen) method. Sprites are keyed by the row's uid so
+    an entity keeps its look (e.g. asteroid polygon) from frame to frame.
+    """
+
+    def __init__(self, factories):
+        self.factories = factories
+        self.sprites = {}
+
+    def clear(self):
+        self.sprites = {}
+
+    def draw(self, store, screen):
+        live = {}
+        for row in np.flatnonzero(store.alive[: store.count]):
+            factory = self.factories.get(int(store.kind[row]))
+            if factory is None:
+                continue
+            uid = int(store.uid[row])
+            x, y = float(store.pos[row, 0]), float(store.pos[row, 1])
+            sprite = self.sprites.get(uid)
+            if sprite is None:
+                sprite = factory(x, y, float(store.radius[row]))
+                # display-only: never part of a simulation group
+                sprite.kill()
+            sprite.position.update(x, y)
+            sprite.draw(screen)
+            live[uid] = sprite
+        self.sprites = live
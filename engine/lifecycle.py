@@ -0,0 +1,72 @@
+import numpy as np
+
+from entity_store import ASTEROID, SHOT, SPEED_POWERUP, SHOT_POWERUP, LIFE_POWERUP
+
+# Names used for the per-kind counters reported in env info dicts
+KIND_NAMES = {
+    ASTEROID: "asteroid",
+    SHOT: "shot",
+    SPEED_POWERUP: "speed_powerup",
+    SHOT_POWERUP: "shot_powerup",
+    LIFE_POWERUP: "life_powerup",
+}
+
+
+class LifecyclePolicy:
+    """
+    Bounds how long entities stay in an EntityStore, so the cost of a step
+    does not creep up over a long episode.
+
+    ttl         {kind: seconds} lifetime stamped on new entities of that kind
+                (see ttl_for); kinds not listed live until something kills them.
+    cull_margin {kind: pixels} how far past the screen edge an entity may
+                drift before it is removed. Leave out kinds that wrap.
+    caps        {kind: count} hard limit on live entities of that kind; when
+                exceeded the oldest ones are removed.
+
+    enforce() ages, culls and caps the store once per tick and returns how
+    many entities of each kind it removed.
+    """
+
+    def __init__(self, ttl=None, cull_margin=None, caps=None):
+        self.ttl = dict(ttl or {})
+        self.cull_margin = dict(cull_margin or {})
+        self.caps = dict(caps or {})
+
+    def ttl_for(self, kind):
+        return self.ttl.get(kind, np.inf)
+
+    def enforce(self, store, dt, width, height):
+        n = store.count
+        alive = store.alive[:n]
+        kind = store.kind[:n]
+        was_alive = alive.copy()
+
+        store.ttl[:n] -= dt
+        alive &= store.ttl[:n] > 0
+
+        pos = store.pos[:n]
+        for k, margin in self.cull_margin.items():
+            out = (
+                (pos[:, 0] < -margin) | (pos[:, 0] > width + margin)
+                | (pos[:, 1] < -margin) | (pos[:, 1] > height + margin)
+            )
+            alive &= ~(out & (kind == k))
+
+        for k, cap in self.caps.items():
+            rows = np.flatnonzero(alive & (kind == k))
+            # rows are in spawn order, so the first ones are the oldest
+            if len(rows) > cap:
+                alive[rows[: len(rows) - cap]] = False
+
+        removed = np.bincount(kind[was_alive & ~alive], minlength=len(KIND_NAMES))
+        return {name: int(removed[k]) for k, name in KIND_NAMES.items()}
+
+
+def entity_counts(store):
+    """
+    Live entities of each kind, keyed like LifecyclePolicy.enforce().
+    """
+    n = store.count
+    live = np.bincount(store.kind[:n][store.alive[:n]], minlength=len(KIND_NAMES))
+    return {name: int(live[k]) for k, name in KIND_NAMES.items()}
@@ -0,0 +1,83 @@
+import bisect
+import itertools
+
+import numpy as np
+
+
+class RandomStream:
+    """
+    Random numbers owned by one env instance.
+
+    Mirrors the subset of the `random` module the game code uses
+    (random, uniform, randint, choice, choices), so a spawner or entity can
+    take either this or the `random` module itself. Uniforms are drawn
+    from a NumPy Generator in pre-generated blocks, so the same seed always
+    gives the same sequence no matter how many envs share the process.
+    """
+
+    def __init__(self, seed=None, block_size=1024):
+        self.block_size = block_size
+        self.seed(seed)
+
+    def seed(self, seed=None):
+        self.generator = np.random.default_rng(seed)
+        self._block = self.generator.random(self.block_size)
+        self._next = 0
+
+    def get_state(self):
+        # blocks are replaced, never written in place, so sharing one is safe
+        return (self.generator.bit_generator.state, self._block, self._next)
+
+    def set_state(self, state):
+        bit_state, self._block, self._next = state
+        self.generator.bit_generator.state = bit_state
+
+    def _take(self, n):
+        """
+        The next n uniforms in [0, 1) as an array, refilling the block as needed.
+        """
+        out = np.empty(n)
+        filled = 0
+        while filled < n:
+            if self._next == len(self._block):
+                self._block = self.generator.random(self.block_size)
+                self._next = 0
+            k = min(n - filled, len(self._block) - self._next)
+            out[filled:filled + k] = self._block[self._next:self._next + k]
+            self._next += k
+            filled += k
+        return out
+
+    def random(self):
+        if self._next == len(self._block):
+            self._block = self.generator.random(self.block_size)
+            self._next = 0
+        u = float(self._block[self._next])
+        self._next += 1
+        return u
+
+    def uniform(self, a, b):
+        return a + (b - a) * self.random()
+
+    def uniforms(self, n, a, b):
+        """
+        n uniforms in [a, b) at once, e.g. one split angle per destroyed asteroid.
+        """
+        return a + (b - a) * self._take(n)
+
+    def randint(self, a, b):
+        """
+        Integer in [a, b], both ends included, like random.randint.
+        """
+        return a + int(self.random() * (b - a + 1))
+
+    def choice(self, seq):
+        return seq[int(self.random() * len(seq))]
+
+    def choices(self, population, weights=None, k=1):
+        if weights is None:
+            return [self.choice(population) for _ in range(k)]
+        cum = list(itertools.accumulate(weights))
+        total = cum[-1]
+        return [population[bisect.bisect_right(cum, self.random() * total, 0, len(cum) - 1)]
+                for _ in range(k)]
@@ -0,0 +1,22 @@
+class SimClock:
+    """
+    Simulation time, advanced by the owning env by each tick's dt.
+
+    get_ticks() returns milliseconds like pygame.time.get_ticks(), so the
+    gameplay timers (shot cooldown, powerup despawn, effect expiry) can read
+    either one. Pass a SimClock wherever a `clock` is accepted to make those
+    timers follow simulated rather than wall-clock time; a headless run at
+    any speed then plays exactly like 60 FPS play.
+    """
+
+    def __init__(self):
+        self.time = 0.0  # seconds
+
+    def advance(self, dt):
+        self.time += dt
+
+    def reset(self):
+        self.time = 0.0
+
+    def get_ticks(self):
+        return self.time * 1000.0
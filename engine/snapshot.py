@@ -0,0 +1,31 @@
+import pygame
+
+
+def _copy(value):
+    if isinstance(value, pygame.Vector2):
+        return pygame.Vector2(value)
+    if isinstance(value, list):
+        return list(value)
+    if isinstance(value, dict):
+        return dict(value)
+    return value
+
+
+def copy_attrs(obj):
+    """
+    Snapshot the public attributes of a game object such as a Player.
+    Vectors, lists and dicts are copied one level deep (the elements are
+    immutable tuples/numbers); anything else, e.g. a shared clock, is kept
+    by reference. Private attributes, like a sprite's group memberships,
+    are left out.
+    """
+    return {k: _copy(v) for k, v in obj.__dict__.items() if not k.startswith("_")}
+
+
+def restore_attrs(obj, state):
+    """
+    Write a copy_attrs() snapshot back onto an existing object without
+    re-running its constructor. The snapshot stays reusable.
+    """
+    for k, v in state.items():
+        setattr(obj, k, _copy(v))
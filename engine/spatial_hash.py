@@ -0,0 +1,95 @@
+import numpy as np
+
+# Cell keys pack (cx, cy) into one int64; the offset keeps the slightly
+# off-screen cells of spawning asteroids non-negative.
+_STRIDE = 1 << 20
+_OFFSET = 1 << 19
+
+
+class SpatialHash:
+    """
+    Uniform-grid broadphase shared by every game variant.
+
+    build() buckets one set of points (e.g. asteroid centres) by grid cell;
+    query() returns the candidate pairs between those points and a second
+    set (e.g. shots) that sit in the same or an adjacent cell. Only
+    candidates are returned, the exact overlap test is left to the caller,
+    so cell_size must be at least the largest distance at which two entities
+    can touch. For asteroids vs anything that is 2 * ASTEROID_MAX_RADIUS.
+
+    Rebuilding is a sort over the built points, cheap enough to do every tick.
+    """
+
+    # dx, dy of the 3x3 neighbourhood around a cell
+    NEIGHBOURS = np.array([(dx, dy) for dx in (-1, 0, 1) for dy in (-1, 0, 1)], dtype=np.int64)
+
+    def __init__(self, cell_size):
+        self.cell_size = float(cell_size)
+        self.build(np.empty((0, 2)))
+
+    def _cells(self, pos):
+        return np.floor(np.asarray(pos, dtype=np.float64) / self.cell_size).astype(np.int64)
+
+    @staticmethod
+    def _key(cx, cy):
+        return (cx + _OFFSET) * _STRIDE + (cy + _OFFSET)
+
+    def build(self, pos):
+        """
+        Bucket the points in `pos` (n, 2) by cell.
+        """
+        pos = np.asarray(pos).reshape(-1, 2)
+        cells = self._cells(pos)
+        keys = self._key(cells[:, 0], cells[:, 1])
+        self.order = np.argsort(keys, kind="stable")
+        self.keys, self.starts, counts = np.unique(
+            keys[self.order], return_index=True, return_counts=True
+        )
+        self.ends = self.starts + counts
+
+    def query(self, points):
+        """
+        Candidate pairs between the built points and `points` (m, 2).
+        Returns index arrays (built_idx, point_idx).
+        """
+        points = np.asarray(points).reshape(-1, 2)
+        empty = np.empty(0, dtype=np.int64)
+        if len(self.keys) == 0 or len(points) == 0:
+            return empty, empty
+
+        cells = self._cells(points)
+        nx = cells[:, 0, None] + self.NEIGHBOURS[:, 0]
+        ny = cells[:, 1, None] + self.NEIGHBOURS[:, 1]
+        nkeys = self._key(nx, ny).ravel()
+        point_idx = np.repeat(np.arange(len(points)), len(self.NEIGHBOURS))
+
+        slot = np.minimum(np.searchsorted(self.keys, nkeys), len(self.keys) - 1)
+        found = self.keys[slot] == nkeys
+        point_idx = point_idx[found]
+        slot = slot[found]
+
+        # Expand each matched cell into one pair per point bucketed there
+        starts = self.starts[slot]
+        counts = self.ends[slot] - starts
+        total = int(counts.sum())
+        if total == 0:
+            return empty, empty
+        run_start = np.repeat(np.cumsum(counts) - counts, counts)
+        within = np.arange(total) - run_start
+        built_idx = self.order[np.repeat(starts, counts) + within]
+        return built_idx, np.repeat(point_idx, counts)
+
+    def sprite_pairs(self, sprites_a, sprites_b):
+        """
+        Candidate (a, b) pairs between two sprite groups, ordered like a
+        nested `for a in sprites_a: for b in sprites_b` loop, for the
+        sprite-based game loops.
+        """
+        sprites_a = list(sprites_a)
+        sprites_b = list(sprites_b)
+        if not sprites_a or not sprites_b:
+            return []
+        self.build([(s.position.x, s.position.y) for s in sprites_a])
+        ia, ib = self.query([(s.position.x, s.position.y) for s in sprites_b])
+        order = np.lexsort((ib, ia))
+        return [(sprites_a[i], sprites_b[j]) for i, j in zip(ia[order].tolist(), ib[order].tolist())]
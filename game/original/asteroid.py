@@ -4,8 +4,10 @@ import random
 import pygame
 
 class Asteroid(CircleShape):
-    def __init__(self, x, y, radius):
+    def __init__(self, x, y, radius, rng=None):
         super().__init__(x,y,radius)
+        # the owning env's RandomStream, or the global random module
+        self.rng = rng or random
 
     def draw(self, screen):
         pygame.draw.circle(screen, (255,255,255), self.position, self.radius, 2)
@@ -19,14 +21,14 @@ class Asteroid(CircleShape):
             return
         
         #spawning asteroids
-        random_degrees = random.uniform(20, 50)
+        random_degrees = self.rng.uniform(20, 50)
         vector1 = pygame.math.Vector2.rotate(self.velocity, random_degrees)
         vector2 = pygame.math.Vector2.rotate(self.velocity, -random_degrees)
 
         new_radius = self.radius - ASTEROID_MIN_RADIUS
         
-        asteroid1 = Asteroid(self.position.x, self.position.y, new_radius)
-        asteroid2 = Asteroid(self.position.x, self.position.y, new_radius)
+        asteroid1 = Asteroid(self.position.x, self.position.y, new_radius, self.rng)
+        asteroid2 = Asteroid(self.position.x, self.position.y, new_radius, self.rng)
 
         asteroid1.velocity = vector1 * 1.5 
         asteroid2.velocity = vector2 * 1.5
\ No newline at end of file
@@ -28,12 +28,14 @@ class AsteroidField(pygame.sprite.Sprite):
         ],
     ]
 
-    def __init__(self):
+    def __init__(self, rng=None):
         pygame.sprite.Sprite.__init__(self, self.containers)
+        # the owning env's RandomStream, or the global random module
+        self.rng = rng or random
         self.spawn_timer = 0.0
 
     def spawn(self, radius, position, velocity):
-        asteroid = Asteroid(position.x, position.y, radius)
+        asteroid = Asteroid(position.x, position.y, radius, self.rng)
         asteroid.velocity = velocity
 
     def update(self, dt):
@@ -42,10 +44,10 @@ class AsteroidField(pygame.sprite.Sprite):
             self.spawn_timer = 0
 
             # spawn a new asteroid at a random edge
-            edge = random.choice(self.edges)
-            speed = random.randint(40, 100)
+            edge = self.rng.choice(self.edges)
+            speed = self.rng.randint(40, 100)
             velocity = edge[0] * speed
-            velocity = velocity.rotate(random.randint(-30, 30))
-            position = edge[1](random.uniform(0, 1))
-            kind = random.randint(1, ASTEROID_KINDS)
+            velocity = velocity.rotate(self.rng.randint(-30, 30))
+            position = edge[1](self.rng.uniform(0, 1))
+            kind = self.rng.randint(1, ASTEROID_KINDS)
             self.spawn(ASTEROID_MIN_RADIUS * kind, position, velocity)
\ No newline at end of file
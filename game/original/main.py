@@ -1,3 +1,5 @@
+import os
+import sys
 import pygame
 import pygame.freetype
 from constants import *
@@ -6,6 +8,9 @@ from asteroid import Asteroid
 from asteroidfield import *
 from shot import Shot
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "engine"))
+from spatial_hash import SpatialHash
+
 def main():
     #initialzing  game and screen
     pygame.init()
@@ -24,6 +29,7 @@ def main():
 
     AsteroidField.containers = updatables
     asteroid_field = AsteroidField()
+    broadphase = SpatialHash(2 * ASTEROID_MAX_RADIUS)
 
 
     dt = 0
@@ -72,12 +78,15 @@ def main():
                 break
                 # return
         
-            for shot in shots:
-                if asteroid.collision_check(shot):
-                    asteroid.split()
-                    shot.kill()
-                    score += 1
-                    # print("hit")
+        # only asteroid/shot pairs in neighbouring grid cells can touch
+        for asteroid, shot in broadphase.sprite_pairs(asteroids, shots):
+            if not (asteroid.alive() and shot.alive()):
+                continue
+            if asteroid.collision_check(shot):
+                asteroid.split()
+                shot.kill()
+                score += 1
+                # print("hit")
 
         font.render_to(screen, (10,10), f"Score: {score}", (255,255,255))
         
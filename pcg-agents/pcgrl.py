@@ -4,6 +4,7 @@ import sys
 #using random asteroid implementation
 main_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
 sys.path.append(os.path.join(main_dir,"agents"))
+sys.path.append(os.path.join(main_dir,"engine"))
 sys.path.insert(0, 'game/original')
 sys.path.insert(0, 'agents')
 
@@ -20,9 +21,38 @@ import gymnasium as gym
 from gymnasium import spaces
 import pygame
 import numpy as np
-import random
 import math
 
+from entity_store import (
+    ASTEROID, SHOT, EntityStore, SpriteCache,
+    circle_hits, circle_hits_point, resolve_hits, spawn_sprites, split_asteroids,
+)
+from spatial_hash import SpatialHash
+from lifecycle import LifecyclePolicy, entity_counts
+from sim_clock import SimClock
+from rng import RandomStream
+from snapshot import copy_attrs, restore_attrs
+
+# Asteroids and shots wrap around the screen here, so nothing is culled for
+# leaving it; shots expire instead of circling forever.
+DEFAULT_LIFECYCLE = dict(ttl={SHOT: 2.0}, caps={ASTEROID: 100, SHOT: 64})
+
+
+class StoreAsteroidField(AsteroidField):
+    """
+    AsteroidField whose timed spawns go into an EntityStore instead of
+    creating Asteroid sprites.
+    """
+
+    containers = ()
+
+    def __init__(self, store, rng):
+        super().__init__(rng)
+        self.store = store
+
+    def spawn(self, radius, position, velocity):
+        self.store.spawn(ASTEROID, position.x, position.y, velocity.x, velocity.y, radius)
+
 
 class AsteroidsPCGEnvWithAStar(gym.Env):
     """
@@ -41,12 +71,16 @@ class AsteroidsPCGEnvWithAStar(gym.Env):
         max_steps=600,
         spawn_limit=3,
         replan_interval=0.5,
+        lifecycle=None,
+        copy_obs=True,
     ):
         """
         :param render_mode: None or 'human'
         :param max_steps: max steps per episode
         :param spawn_limit: max number of asteroids the RL can spawn each step
         :param replan_interval: how often the AStarAgent replans
+        :param lifecycle: LifecyclePolicy for shot TTL / culling / caps (default DEFAULT_LIFECYCLE)
+        :param copy_obs: return a fresh copy of each observation; False hands out the env's reused buffer
         """
         super().__init__()
         self.render_mode = render_mode
@@ -63,16 +97,22 @@ class AsteroidsPCGEnvWithAStar(gym.Env):
             self.screen = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
         self.clock = pygame.time.Clock()
 
-        # Sprite groups
-        self.updatables = pygame.sprite.Group()
-        self.drawables = pygame.sprite.Group()
-        self.asteroids = pygame.sprite.Group()
-        self.shots = pygame.sprite.Group()
-
-        # Link containers
-        Asteroid.containers = (self.asteroids, self.updatables, self.drawables)
-        Shot.containers = (self.shots, self.updatables, self.drawables)
-        AsteroidField.containers = self.updatables
+        # Asteroids and shots live in an array-backed store; sprites are only
+        # built when rendering. Player.shoot() still creates a Shot sprite,
+        # which lands in new_shots and is moved into the store each tick.
+        self.entities = EntityStore()
+        # Broadphase for asteroid-shot collisions, rebuilt every tick
+        self.broadphase = SpatialHash(2 * ASTEROID_MAX_RADIUS)
+        self.sprite_cache = SpriteCache({ASTEROID: Asteroid, SHOT: Shot})
+        # Player timers run on simulated time, advanced in _update_game
+        self.sim_clock = SimClock()
+        # All spawn randomness comes from this env's own stream; reset(seed=...)
+        # reseeds it, so the same seed replays the same episode.
+        self.rng = RandomStream()
+        self.lifecycle = lifecycle or LifecyclePolicy(**DEFAULT_LIFECYCLE)
+        self.culled = {}
+        self.new_shots = pygame.sprite.Group()
+        Shot.containers = (self.new_shots,)
 
         # A* agent (the "surrogate player" logic)
         self.astar_agent = AStarAgent(
@@ -83,11 +123,11 @@ class AsteroidsPCGEnvWithAStar(gym.Env):
             shoot_angle_thresh=15
         )
 
-        self.asteroid_field = AsteroidField()
+        self.asteroid_field = StoreAsteroidField(self.entities, self.rng)
 
         # Create the player
-        Player.containers = (self.updatables, self.drawables)
-        self.player = Player(SCREEN_WIDTH / 2, SCREEN_HEIGHT / 2)
+        Player.containers = ()
+        self.player = Player(SCREEN_WIDTH / 2, SCREEN_HEIGHT / 2, self.sim_clock)
 
         # Env state
         self.score = 0
@@ -104,6 +144,14 @@ class AsteroidsPCGEnvWithAStar(gym.Env):
         low = np.array([0, 0, 0], dtype=np.float32)
         high = np.array([100, SCREEN_WIDTH, SCREEN_HEIGHT], dtype=np.float32)
         self.observation_space = spaces.Box(low, high, dtype=np.float32)
+        # Observations are written into this buffer every step; with
+        # copy_obs=False the same array is returned each time. That is only
+        # safe for a caller that copies every observation before the next
+        # step or reset: SB3's VecEnvs keep the last one of an episode as
+        # info["terminal_observation"] and then reset, which would overwrite
+        # it, so copies are the default.
+        self.copy_obs = copy_obs
+        self._obs = np.zeros(3, dtype=np.float32)
         # acitons for RL agent would be
         #spawning asteroids, spawning powerups, enemy?????
         #spawning RL created effects, possibly
@@ -114,32 +162,32 @@ class AsteroidsPCGEnvWithAStar(gym.Env):
         Extend as needed (player health, velocities, etc.).
         - health, velocity, position, bullets shot at given state, # of powerups collected
         """
-        num_asts = len(self.asteroids)
-        px, py = self.player.position.x, self.player.position.y
-        obs = np.array([num_asts, px, py], dtype=np.float32)
-        return obs
+        obs = self._obs
+        obs[0] = len(self.asteroids)
+        obs[1] = self.player.position.x
+        obs[2] = self.player.position.y
+        return obs.copy() if self.copy_obs else obs
 
     def reset(self, seed=None, options=None):
         super().reset(seed=seed)
-        random.seed(seed)
-        np.random.seed(seed if seed is not None else None)
+        if seed is not None:
+            self.rng.seed(seed)
 
-        # Clear sprite groups
-        self.updatables.empty()
-        self.drawables.empty()
-        self.asteroids.empty()
-        self.shots.empty()
+        # Clear entities
+        self.entities.clear()
+        self.sim_clock.reset()
+        self.culled = {}
+        self.sprite_cache.clear()
+        self.new_shots.empty()
 
         # Create new
-        self.asteroid_field = AsteroidField()
-        Player.containers = (self.updatables, self.drawables)
-        Shot.containers = (self.shots, self.updatables, self.drawables)
-        Asteroid.containers = (self.asteroids, self.updatables, self.drawables)
-        self.player = Player(SCREEN_WIDTH / 2, SCREEN_HEIGHT / 2)
+        self.asteroid_field = StoreAsteroidField(self.entities, self.rng)
+        Player.containers = ()
+        Shot.containers = (self.new_shots,)
+        self.player = Player(SCREEN_WIDTH / 2, SCREEN_HEIGHT / 2, self.sim_clock)
 
         # A* agent fresh start
-        self.astar_agent.current_path = []
-        self.astar_agent.time_since_replan = 0.0
+        self.astar_agent.reset()
 
         self.score = 0
         self.steps_elapsed = 0
@@ -172,19 +220,54 @@ class AsteroidsPCGEnvWithAStar(gym.Env):
         terminated = self.game_over
         truncated = (self.steps_elapsed >= self.max_steps)
 
-        return obs, reward, terminated, truncated, {}
+        info = {"live": entity_counts(self.entities), "culled": self.culled}
+        return obs, reward, terminated, truncated, info
+
+    def get_state(self):
+        """
+        Snapshot of the game world (entities, player, timers, RNG, A* path)
+        for branching from this point, e.g. lookahead. Restore it with
+        set_state() any number of times; it shares nothing mutable with the env.
+        """
+        return {
+            "entities": self.entities.get_state(),
+            "player": copy_attrs(self.player),
+            "asteroid_field": copy_attrs(self.asteroid_field),
+            "agent": self.astar_agent.get_state(),
+            "clock": self.sim_clock.time,
+            "rng": self.rng.get_state(),
+            "score": self.score,
+            "steps_elapsed": self.steps_elapsed,
+            "game_over": self.game_over,
+        }
+
+    def set_state(self, state):
+        self.entities.set_state(state["entities"])
+        restore_attrs(self.player, state["player"])
+        restore_attrs(self.asteroid_field, state["asteroid_field"])
+        self.astar_agent.set_state(state["agent"])
+        self.sim_clock.time = state["clock"]
+        self.rng.set_state(state["rng"])
+        self.score = state["score"]
+        self.steps_elapsed = state["steps_elapsed"]
+        self.game_over = state["game_over"]
+        self.new_shots.empty()
 
     def render(self):
         if self.render_mode == "human":
             self.screen.fill((0, 0, 0))
-            for d in self.drawables:
-                d.draw(self.screen)
+            self.sprite_cache.draw(self.entities, self.screen)
+            self.player.draw(self.screen)
             pygame.display.flip()
             self.clock.tick(self.metadata["render_fps"])
 
     def close(self):
         pygame.quit()
 
+    @property
+    def asteroids(self):
+        return self.entities.view(ASTEROID)
+
     # ----------------------------------------------------------------
     # Internal Helpers
     # ----------------------------------------------------------------
@@ -194,6 +277,10 @@ class AsteroidsPCGEnvWithAStar(gym.Env):
         - A* agent decides how to rotate/move/shoot
         - We step all sprites, handle collisions, etc.
         """
+        self.sim_clock.advance(dt)
+        # Shot.containers is class-level; point it at this env's group so
+        # envs sharing a process don't collect each other's shots
+        Shot.containers = (self.new_shots,)
         # Minimal event loop
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
@@ -202,40 +289,54 @@ class AsteroidsPCGEnvWithAStar(gym.Env):
         # A* controls the player
         self.astar_agent.update(dt, self.player, self.asteroids)
 
-        # Now update all sprites (position, collisions, etc.)
-        for upd in self.updatables:
-            upd.update(dt)
+        # Update player and asteroid field, then move every entity at once
+        self.player.update(dt)
+        self._collect_new_shots()
+        self.asteroid_field.update(dt)
+        self.entities.integrate(dt)
+        self.culled = self.lifecycle.enforce(self.entities, dt, SCREEN_WIDTH, SCREEN_HEIGHT)
 
         self._handle_collisions()
         self._wrap_sprites()
 
+    def _collect_new_shots(self):
+        spawn_sprites(self.entities, SHOT, self.new_shots, self.lifecycle.ttl_for(SHOT))
+        self.new_shots.empty()
+
     def _handle_collisions(self):
-        for asteroid in self.asteroids:
-            # Player collision
-            if asteroid.collision_check(self.player):
-                # Player destroyed
-                self.game_over = True
-            # Shots
-            for shot in self.shots:
-                if asteroid.collision_check(shot):
-                    asteroid.split()
-                    shot.kill()
-                    self.score += 1
+        store = self.entities
+        # Player collision
+        player_pos = (self.player.position.x, self.player.position.y)
+        if len(circle_hits_point(store, ASTEROID, player_pos, self.player.radius)):
+            # Player destroyed
+            self.game_over = True
+        # Shots: each shot destroys at most one asteroid
+        hit_ast, hit_shot = circle_hits(store, ASTEROID, SHOT, self.broadphase)
+        pairs = resolve_hits(hit_ast, hit_shot)
+        if pairs:
+            store.kill([b for _, b in pairs])
+            split_asteroids(
+                store, [a for a, _ in pairs],
+                self.rng.uniforms(len(pairs), 20, 50),
+                ASTEROID_MIN_RADIUS,
+            )
+            self.score += len(pairs)
+        store.compact()
 
     def _wrap_sprites(self):
         """
         Classic Asteroids wrapping
         """
-        for sprite in self.updatables:
-            if hasattr(sprite, 'position'):
-                if sprite.position.x < 0:
-                    sprite.position.x = SCREEN_WIDTH
-                elif sprite.position.x > SCREEN_WIDTH:
-                    sprite.position.x = 0
-                if sprite.position.y < 0:
-                    sprite.position.y = SCREEN_HEIGHT
-                elif sprite.position.y > SCREEN_HEIGHT:
-                    sprite.position.y = 0
+        self.entities.wrap(SCREEN_WIDTH, SCREEN_HEIGHT)
+        position = self.player.position
+        if position.x < 0:
+            position.x = SCREEN_WIDTH
+        elif position.x > SCREEN_WIDTH:
+            position.x = 0
+        if position.y < 0:
+            position.y = SCREEN_HEIGHT
+        elif position.y > SCREEN_HEIGHT:
+            position.y = 0
 
     def _spawn_asteroid(self):
         """
@@ -243,15 +344,14 @@ class AsteroidsPCGEnvWithAStar(gym.Env):
         Similar to AsteroidField logic, but done manually for PCG control.
         """
         edges = AsteroidField.edges
-        edge = random.choice(edges)
-        speed = random.randint(40, 100)
+        edge = self.rng.choice(edges)
+        speed = self.rng.randint(40, 100)
         velocity = edge[0] * speed
-        velocity = velocity.rotate(random.randint(-30, 30))
-        position = edge[1](random.uniform(0, 1))
+        velocity = velocity.rotate(self.rng.randint(-30, 30))
+        position = edge[1](self.rng.uniform(0, 1))
 
-        radius = random.randint(ASTEROID_MIN_RADIUS, ASTEROID_MAX_RADIUS)
-        asteroid = Asteroid(position.x, position.y, radius)
-        asteroid.velocity = velocity
+        radius = self.rng.randint(ASTEROID_MIN_RADIUS, ASTEROID_MAX_RADIUS)
+        self.entities.spawn(ASTEROID, position.x, position.y, velocity.x, velocity.y, radius)
 
     def _compute_reward(self):
         """
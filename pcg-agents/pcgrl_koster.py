@@ -1,12 +1,15 @@
+import os
 import sys
 
+main_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.append(os.path.join(main_dir, "engine"))
 sys.path.insert(0, "game/original")
 sys.path.insert(0, "agents")
 
 from a_star import AStarAgent
 from constants import *
+from pcgrl import DEFAULT_LIFECYCLE, StoreAsteroidField
 
-from asteroidfield import AsteroidField
 from asteroid import Asteroid
 from shot import Shot
 from player import Player
@@ -16,9 +19,16 @@ import gymnasium as gym
 from gymnasium import spaces
 import pygame
 import numpy as np
-import random
 import math
 
+from entity_store import (
+    ASTEROID, SHOT, EntityStore, SpriteCache, circle_hits, resolve_hits, spawn_sprites, split_asteroids,
+)
+from spatial_hash import SpatialHash
+from lifecycle import LifecyclePolicy, entity_counts
+from sim_clock import SimClock
+from rng import RandomStream
+from snapshot import copy_attrs, restore_attrs
 
 class AsteroidsPCGEnvKoster(gym.Env):
     """
@@ -39,6 +49,12 @@ class AsteroidsPCGEnvKoster(gym.Env):
         replan_interval=0.5,
         near_miss_radius=40.0,
         diversity_window=20,
+        lifecycle=None,
+        copy_obs=True,
+        planner="astar",
+        scheduler=None,
+        planning_service=None,
+        instrument=False,
     ):
         """
         :param render_mode: 'human' or None
@@ -47,12 +63,18 @@ class AsteroidsPCGEnvKoster(gym.Env):
         :param replan_interval: how often the A* agent replans
         :param near_miss_radius: distance threshold for awarding 'near-miss' events
         :param diversity_window: how many recent actions to track for 'variety' reward
+        :param lifecycle: LifecyclePolicy for shot TTL / culling / caps (default DEFAULT_LIFECYCLE)
+        :param copy_obs: return a fresh copy of each observation; False hands out the env's reused buffer
+        :param planner: grid search for the default A* agent, "astar", "jps", "dstar" or "spacetime" (see a_star.PLANNERS)
+        :param scheduler: ReplanScheduler for the default A* agent, None to replan every replan_interval
+        :param planning_service: PlanningService the default A* agent hands its replans to; flush it after every step
+        :param instrument: time the default A* agent's planning phases; any instrumented agent's
+            episode summary (see PlannerStats.summary) is in the info of the episode's last step
         """
         super().__init__()
         self.render_mode = render_mode
         self.max_steps = max_steps
         self.spawn_limit = spawn_limit
-        self.font = pygame.freetype.SysFont(None, 36)
         # "Near miss" threshold: if an asteroid passes within this distance of player
         # but does not collide, it counts as a near miss (challenge).
         self.near_miss_radius = near_miss_radius
@@ -67,16 +89,26 @@ class AsteroidsPCGEnvKoster(gym.Env):
         else:
             pygame.display.init()
             self.screen = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+        pygame.freetype.init()
+        self.font = pygame.freetype.SysFont(None, 36)
         self.clock = pygame.time.Clock()
 
-        self.updatables = pygame.sprite.Group()
-        self.drawables = pygame.sprite.Group()
-        self.asteroids = pygame.sprite.Group()
-        self.shots = pygame.sprite.Group()
-
-        Asteroid.containers = (self.asteroids, self.updatables, self.drawables)
-        Shot.containers = (self.shots, self.updatables, self.drawables)
-        AsteroidField.containers = self.updatables
+        # Asteroids and shots live in an array-backed store; sprites are only
+        # built when rendering. Player.shoot() still creates a Shot sprite,
+        # which lands in new_shots and is moved into the store each tick.
+        self.entities = EntityStore()
+        # Broadphase for asteroid-shot collisions, rebuilt every tick
+        self.broadphase = SpatialHash(2 * ASTEROID_MAX_RADIUS)
+        self.sprite_cache = SpriteCache({ASTEROID: Asteroid, SHOT: Shot})
+        # Player timers run on simulated time, advanced in _update_game
+        self.sim_clock = SimClock()
+        # All spawn randomness comes from this env's own stream; reset(seed=...)
+        # reseeds it, so the same seed replays the same episode.
+        self.rng = RandomStream()
+        self.lifecycle = lifecycle or LifecyclePolicy(**DEFAULT_LIFECYCLE)
+        self.culled = {}
+        self.new_shots = pygame.sprite.Group()
+        Shot.containers = (self.new_shots,)
 
         # A* agent = surrogate player
         if agent is None:
@@ -86,14 +118,18 @@ class AsteroidsPCGEnvKoster(gym.Env):
                 replan_interval=replan_interval,
                 shoot_distance=300,
                 shoot_angle_thresh=15,
+                planner=planner,
+                scheduler=scheduler,
+                service=planning_service,
+                instrument=instrument,
             )
         else:
             self.agent = agent
 
-        self.asteroid_field = AsteroidField()
+        self.asteroid_field = StoreAsteroidField(self.entities, self.rng)
 
-        Player.containers = (self.updatables, self.drawables)
-        self.player = Player(SCREEN_WIDTH / 2, SCREEN_HEIGHT / 2)
+        Player.containers = ()
+        self.player = Player(SCREEN_WIDTH / 2, SCREEN_HEIGHT / 2, self.sim_clock)
 
         self.score = 0  # how many hits / splits
         self.steps_elapsed = 0
@@ -122,28 +158,35 @@ class AsteroidsPCGEnvKoster(gym.Env):
         low = np.array([0, 0, 0, 0], dtype=np.float32)
         high = np.array([100, SCREEN_WIDTH, SCREEN_HEIGHT, 100], dtype=np.float32)
         self.observation_space = spaces.Box(low, high, dtype=np.float32)
+        # Observations are written into this buffer every step; with
+        # copy_obs=False the same array is returned each time. That is only
+        # safe for a caller that copies every observation before the next
+        # step or reset: SB3's VecEnvs keep the last one of an episode as
+        # info["terminal_observation"] and then reset, which would overwrite
+        # it, so copies are the default.
+        self.copy_obs = copy_obs
+        self._obs = np.zeros(4, dtype=np.float32)
         self.MAX_ASTEROIDS = 10
 
     def reset(self, seed=None, options=None):
         super().reset(seed=seed)
-        random.seed(seed)
-        np.random.seed(seed if seed is not None else None)
+        if seed is not None:
+            self.rng.seed(seed)
 
-        # Clear sprite groups
-        self.updatables.empty()
-        self.drawables.empty()
-        self.asteroids.empty()
-        self.shots.empty()
+        # Clear entities
+        self.entities.clear()
+        self.sim_clock.reset()
+        self.culled = {}
+        self.sprite_cache.clear()
+        self.new_shots.empty()
 
-        self.asteroid_field = AsteroidField()
-        Player.containers = (self.updatables, self.drawables)
-        Shot.containers = (self.shots, self.updatables, self.drawables)
-        Asteroid.containers = (self.asteroids, self.updatables, self.drawables)
-        self.player = Player(SCREEN_WIDTH / 2, SCREEN_HEIGHT / 2)
+        self.asteroid_field = StoreAsteroidField(self.entities, self.rng)
+        Player.containers = ()
+        Shot.containers = (self.new_shots,)
+        self.player = Player(SCREEN_WIDTH / 2, SCREEN_HEIGHT / 2, self.sim_clock)
 
         # A* agent fresh start
-        self.agent.current_path = []
-        self.agent.time_since_replan = 0.0
+        self.agent.reset()
 
         self.score = 0
         self.steps_elapsed = 0
@@ -210,6 +253,10 @@ class AsteroidsPCGEnvKoster(gym.Env):
             "steps_elapsed": self.steps_elapsed,
             "num_asteroids": len(self.asteroids),
             "near_miss_count": self.near_miss_count,
+            # nodes the surrogate player's planner expanded this step (0 without a replan)
+            "planner_expansions": self.agent.step_expansions,
+            "live": entity_counts(self.entities),
+            "culled": self.culled,
             "last_spawns": self.last_spawns,
             "action": action,
             "spawn_params": {
@@ -223,14 +270,50 @@ class AsteroidsPCGEnvKoster(gym.Env):
         self.steps_elapsed += 1
         terminated = self.game_over
         truncated = self.steps_elapsed >= self.max_steps
+        if (terminated or truncated) and self.agent.stats is not None:
+            debug_info["planner_stats"] = self.agent.stats.summary()
 
         return obs, reward, terminated, truncated, debug_info
 
+    def get_state(self):
+        """
+        Snapshot of the game world (entities, player, timers, RNG, A* path)
+        for branching from this point, e.g. lookahead. Restore it with
+        set_state() any number of times; it shares nothing mutable with the env.
+        """
+        return {
+            "entities": self.entities.get_state(),
+            "player": copy_attrs(self.player),
+            "asteroid_field": copy_attrs(self.asteroid_field),
+            "agent": self.agent.get_state(),
+            "clock": self.sim_clock.time,
+            "rng": self.rng.get_state(),
+            "score": self.score,
+            "steps_elapsed": self.steps_elapsed,
+            "game_over": self.game_over,
+            "near_miss_count": self.near_miss_count,
+            "last_spawns": list(self.last_spawns),
+        }
+
+    def set_state(self, state):
+        self.entities.set_state(state["entities"])
+        restore_attrs(self.player, state["player"])
+        restore_attrs(self.asteroid_field, state["asteroid_field"])
+        self.agent.set_state(state["agent"])
+        self.sim_clock.time = state["clock"]
+        self.rng.set_state(state["rng"])
+        self.score = state["score"]
+        self.steps_elapsed = state["steps_elapsed"]
+        self.game_over = state["game_over"]
+        self.near_miss_count = state["near_miss_count"]
+        self.last_spawns = list(state["last_spawns"])
+        self.new_shots.empty()
+
     def render(self, info):
         if self.render_mode == "human":
             self.screen.fill((0, 0, 0))
-            for d in self.drawables:
-                d.draw(self.screen)
+            self.sprite_cache.draw(self.entities, self.screen)
+            self.player.draw(self.screen)
             self.font.render_to(
                 self.screen, (10, 10), f"Score: {info['score']}", (255, 255, 255)
             )
@@ -241,16 +324,26 @@ class AsteroidsPCGEnvKoster(gym.Env):
     def close(self):
         pygame.quit()
 
+    @property
+    def asteroids(self):
+        return self.entities.view(ASTEROID)
+
     def _get_obs(self):
         """
         Observation includes near-miss count to inform the agent about 'challenge' level.
         """
-        num_asts = len(self.asteroids)
-        px, py = self.player.position.x, self.player.position.y
-        obs = np.array([num_asts, px, py, self.near_miss_count], dtype=np.float32)
-        return obs
+        obs = self._obs
+        obs[0] = len(self.asteroids)
+        obs[1] = self.player.position.x
+        obs[2] = self.player.position.y
+        obs[3] = self.near_miss_count
+        return obs.copy() if self.copy_obs else obs
 
     def _update_game(self, dt):
+        self.sim_clock.advance(dt)
+        # Shot.containers is class-level; point it at this env's group so
+        # envs sharing a process don't collect each other's shots
+        Shot.containers = (self.new_shots,)
         # Minimal event loop
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
@@ -259,62 +352,71 @@ class AsteroidsPCGEnvKoster(gym.Env):
         # A* agent update
         self.agent.update(dt, self.player, self.asteroids)
 
-        # Update sprites
-        for upd in self.updatables:
-            upd.update(dt)
+        # Update player and asteroid field, then move every entity at once
+        self.player.update(dt)
+        self._collect_new_shots()
+        self.asteroid_field.update(dt)
+        self.entities.integrate(dt)
+        self.culled = self.lifecycle.enforce(self.entities, dt, SCREEN_WIDTH, SCREEN_HEIGHT)
 
         self._handle_collisions()
         self._wrap_sprites()
 
+    def _collect_new_shots(self):
+        spawn_sprites(self.entities, SHOT, self.new_shots, self.lifecycle.ttl_for(SHOT))
+        self.new_shots.empty()
+
     def _handle_collisions(self):
         # We'll also detect near misses: if asteroid passes near player but doesn't collide
-        player_pos = self.player.position
-
-        for asteroid in self.asteroids:
-            dist = (asteroid.position - player_pos).length()
-            if dist < asteroid.radius + self.near_miss_radius:
-                # If it's truly colliding, game over
-                if asteroid.collision_check(self.player):
-                    self.game_over = True
-                else:
-                    # near-miss
-                    self.near_miss_count += 1
-
-            # Shots
-            for shot in self.shots:
-                if asteroid.collision_check(shot):
-                    asteroid.split()
-                    shot.kill()
-                    self.score += 1
+        store = self.entities
+        ast = store.rows(ASTEROID)
+        d = store.pos[ast] - (self.player.position.x, self.player.position.y)
+        dist = np.sqrt((d * d).sum(axis=1))
+        near = dist < store.radius[ast] + self.near_miss_radius
+        touching = dist <= store.radius[ast] + self.player.radius
+        # If it's truly colliding, game over
+        if (near & touching).any():
+            self.game_over = True
+        self.near_miss_count += int(np.count_nonzero(near & ~touching))
+
+        # Shots: each shot destroys at most one asteroid
+        hit_ast, hit_shot = circle_hits(store, ASTEROID, SHOT, self.broadphase)
+        pairs = resolve_hits(hit_ast, hit_shot)
+        if pairs:
+            store.kill([b for _, b in pairs])
+            split_asteroids(
+                store, [a for a, _ in pairs],
+                self.rng.uniforms(len(pairs), 20, 50),
+                ASTEROID_MIN_RADIUS,
+            )
+            self.score += len(pairs)
+        store.compact()
 
     def _wrap_sprites(self):
-        for sprite in self.updatables:
-            if hasattr(sprite, "position"):
-                if sprite.position.x < 0:
-                    sprite.position.x = SCREEN_WIDTH
-                elif sprite.position.x > SCREEN_WIDTH:
-                    sprite.position.x = 0
-                if sprite.position.y < 0:
-                    sprite.position.y = SCREEN_HEIGHT
-                elif sprite.position.y > SCREEN_HEIGHT:
-                    sprite.position.y = 0
+        self.entities.wrap(SCREEN_WIDTH, SCREEN_HEIGHT)
+        position = self.player.position
+        if position.x < 0:
+            position.x = SCREEN_WIDTH
+        elif position.x > SCREEN_WIDTH:
+            position.x = 0
+        if position.y < 0:
+            position.y = SCREEN_HEIGHT
+        elif position.y > SCREEN_HEIGHT:
+            position.y = 0
 
     def _spawn_asteroid(self, radius, speed, angle):
         """
         Spawn an asteroid at a random edge location but with given radius, speed, and direction.
         """
-        edges = AsteroidField.edges
-        edge = random.choice(edges)
-        position = edge[1](random.uniform(0, 1))
+        edges = StoreAsteroidField.edges
+        edge = self.rng.choice(edges)
+        position = edge[1](self.rng.uniform(0, 1))
 
         # Velocity from angle + speed
         # in pygame angle 0 is right
         vx = speed * math.sin(math.radians(angle))
         vy = -speed * math.cos(math.radians(angle))
-        velocity = pygame.Vector2(vx, vy)
-
-        asteroid = Asteroid(position.x, position.y, radius)
-        asteroid.velocity = velocity
+        self.entities.spawn(ASTEROID, position.x, position.y, vx, vy, radius)
 
     # ----------------------------------------------------------------
     # Koster-inspired reward design
@@ -0,0 +1,400 @@
+import os
+import sys
+from collections import namedtuple
+main_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.append(os.path.join(main_dir, "agents"))
+sys.path.append(os.path.join(main_dir, "engine"))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from a_star import AStarAgent
+from constants import *
+from pcgrl import DEFAULT_LIFECYCLE
+
+from gymnasium import spaces
+from stable_baselines3.common.vec_env import VecEnv
+import numpy as np
+
+from entity_store import ASTEROID, SHOT, rotate
+
+# AsteroidField.edges as arrays: spawn position = origin + u * span,
+# heading = direction, for the left, right, top and bottom edge.
+EDGE_DIRECTION = np.array([(1, 0), (-1, 0), (0, 1), (0, -1)], dtype=np.float32)
+EDGE_ORIGIN = np.array([
+    (-ASTEROID_MAX_RADIUS, 0),
+    (SCREEN_WIDTH + ASTEROID_MAX_RADIUS, 0),
+    (0, -ASTEROID_MAX_RADIUS),
+    (0, SCREEN_HEIGHT + ASTEROID_MAX_RADIUS),
+], dtype=np.float32)
+EDGE_SPAN = np.array([(0, SCREEN_HEIGHT), (0, SCREEN_HEIGHT), (SCREEN_WIDTH, 0), (SCREEN_WIDTH, 0)], dtype=np.float32)
+
+# One game's live asteroids in the pos/radius arrays AStarAgent reads off an EntityView
+GameAsteroids = namedtuple("GameAsteroids", ["pos", "radius"])
+
+
+class VectorAsteroidsPCGEnv(VecEnv):
+    """
+    N AsteroidsPCGEnvWithAStar games stepped in lockstep.
+
+    Every game's asteroids, shots and player live in shared (N, capacity)
+    NumPy arrays, so spawning, movement, the surrogate player's shooting and
+    steering, collisions and wrapping are one array operation for all games.
+    Only A* replanning runs per game, and only for the games whose replan
+    timer ran out this tick. The rules, reward and observation follow
+    AsteroidsPCGEnvWithAStar; finished games are reset automatically,
+    as the SB3 VecEnv interface expects, so
+
+        model = PPO("MlpPolicy", VectorAsteroidsPCGEnv(256))
+
+    trains on batched observations directly.
+    """
+
+    metadata = {"render_modes": []}
+
+    def __init__(
+        self,
+        num_envs=64,
+        max_steps=600,
+        spawn_limit=3,
+        replan_interval=0.5,
+        seed=None,
+    ):
+        """
+        :param num_envs: number of games stepped together
+        :param max_steps: max steps per episode
+        :param spawn_limit: max number of asteroids the RL can spawn each step
+        :param replan_interval: how often each game's A* player replans
+        :param seed: seed for the shared NumPy generator
+        """
+        self.render_mode = None
+        self.max_steps = max_steps
+        self.spawn_limit = spawn_limit
+        self.replan_interval = replan_interval
+        self.dt = 1.0 / 60.0
+
+        # Same limits the single env's default lifecycle policy applies
+        self.asteroid_capacity = DEFAULT_LIFECYCLE["caps"][ASTEROID]
+        self.shot_capacity = DEFAULT_LIFECYCLE["caps"][SHOT]
+        self.shot_lifetime = DEFAULT_LIFECYCLE["ttl"][SHOT]
+
+        # One planner for A* searches; the per-game path state lives here
+        self.planner = AStarAgent(
+            grid_size=(64, 36),
+            safe_distance=50,
+            replan_interval=replan_interval,
+            shoot_distance=300,
+            shoot_angle_thresh=15,
+        )
+
+        self.rng = np.random.default_rng(seed)
+        self._allocate(num_envs)
+
+        low = np.array([0, 0, 0], dtype=np.float32)
+        high = np.array([100, SCREEN_WIDTH, SCREEN_HEIGHT], dtype=np.float32)
+        super().__init__(
+            num_envs,
+            spaces.Box(low, high, dtype=np.float32),
+            spaces.Discrete(spawn_limit + 1),
+        )
+        self._actions = np.zeros(num_envs, dtype=np.int64)
+
+    def _allocate(self, n):
+        a, s = self.asteroid_capacity, self.shot_capacity
+        self.ast_pos = np.zeros((n, a, 2), dtype=np.float32)
+        self.ast_vel = np.zeros((n, a, 2), dtype=np.float32)
+        self.ast_radius = np.zeros((n, a), dtype=np.float32)
+        self.ast_alive = np.zeros((n, a), dtype=bool)
+        # spawn order, so the cap drops the oldest like LifecyclePolicy
+        self.ast_birth = np.zeros((n, a), dtype=np.int64)
+        self.shot_pos = np.zeros((n, s, 2), dtype=np.float32)
+        self.shot_vel = np.zeros((n, s, 2), dtype=np.float32)
+        self.shot_ttl = np.zeros((n, s), dtype=np.float32)
+        self.shot_alive = np.zeros((n, s), dtype=bool)
+        self.shot_birth = np.zeros((n, s), dtype=np.int64)
+        self.births = 0
+
+        self.player_pos = np.zeros((n, 2), dtype=np.float32)
+        self.rotation = np.zeros(n, dtype=np.float32)
+        self.shoot_timer = np.zeros(n, dtype=np.float32)
+        self.spawn_timer = np.zeros(n, dtype=np.float32)
+        self.score = np.zeros(n, dtype=np.int64)
+        self.steps_elapsed = np.zeros(n, dtype=np.int64)
+        self.game_over = np.zeros(n, dtype=bool)
+
+        # A* player: replan timer, remaining path and the next waypoint
+        self.time_since_replan = np.zeros(n, dtype=np.float32)
+        self.paths = [[] for _ in range(n)]
+        self.waypoint = np.zeros((n, 2), dtype=np.float32)
+        self.has_path = np.zeros(n, dtype=bool)
+
+    # ----------------------------------------------------------------
+    # VecEnv interface
+    # ----------------------------------------------------------------
+    def reset(self):
+        if self._seeds[0] is not None:
+            self.rng = np.random.default_rng(self._seeds[0])
+        self._reset_seeds()
+        self._reset_options()
+        self._reset_games(np.ones(self.num_envs, dtype=bool))
+        return self._get_obs()
+
+    def step_async(self, actions):
+        self._actions = np.asarray(actions).reshape(self.num_envs)
+
+    def step_wait(self):
+        dt = self.dt
+
+        # 1) Spawn asteroids based on the RL actions
+        counts = np.clip(self._actions, 0, self.spawn_limit)
+        games = np.repeat(np.arange(self.num_envs), counts)
+        self._spawn_at_edges(
+            games,
+            speed=self.rng.integers(40, 101, len(games)),
+            turn=self.rng.integers(-30, 31, len(games)),
+            radius=self.rng.integers(ASTEROID_MIN_RADIUS, ASTEROID_MAX_RADIUS + 1, len(games)),
+        )
+
+        # 2) A* players replan, shoot and steer; shot cooldowns tick down
+        self._update_players(dt)
+        self.shoot_timer -= dt
+
+        # 3) Timed asteroid field spawns
+        self.spawn_timer += dt
+        due = self.spawn_timer > ASTEROID_SPAWN_RATE
+        self.spawn_timer[due] = 0
+        games = np.flatnonzero(due)
+        self._spawn_at_edges(
+            games,
+            speed=self.rng.integers(40, 101, len(games)),
+            turn=self.rng.integers(-30, 31, len(games)),
+            radius=ASTEROID_MIN_RADIUS * self.rng.integers(1, ASTEROID_KINDS + 1, len(games)),
+        )
+
+        # 4) Move everything, expire shots, collide, wrap
+        self.ast_pos += self.ast_vel * dt
+        self.shot_pos += self.shot_vel * dt
+        self.shot_ttl -= dt
+        self.shot_alive &= self.shot_ttl > 0
+        self._handle_collisions()
+        self._wrap()
+
+        # 5) Reward, observation and episode bookkeeping
+        rewards = (0.1 * self.score - 5.0 * self.game_over - 0.01).astype(np.float32)
+        self.steps_elapsed += 1
+        terminated = self.game_over.copy()
+        truncated = self.steps_elapsed >= self.max_steps
+        dones = terminated | truncated
+        obs = self._get_obs()
+
+        infos = [{} for _ in range(self.num_envs)]
+        if dones.any():
+            for i in np.flatnonzero(dones):
+                infos[i]["terminal_observation"] = obs[i].copy()
+                infos[i]["TimeLimit.truncated"] = bool(truncated[i] and not terminated[i])
+            self._reset_games(dones)
+            obs[dones] = self._get_obs()[dones]
+        return obs, rewards, dones, infos
+
+    def close(self):
+        pass
+
+    def get_attr(self, attr_name, indices=None):
+        return [getattr(self, attr_name) for _ in self._get_indices(indices)]
+
+    def set_attr(self, attr_name, value, indices=None):
+        # Settings are shared by every game, so they can only change for all of them
+        if sorted(set(self._get_indices(indices))) != list(range(self.num_envs)):
+            raise ValueError(f"{attr_name} is shared by all {self.num_envs} games; set it without indices")
+        setattr(self, attr_name, value)
+
+    def env_method(self, method_name, *method_args, indices=None, **method_kwargs):
+        method = getattr(self, method_name)
+        return [method(*method_args, **method_kwargs) for _ in self._get_indices(indices)]
+
+    def env_is_wrapped(self, wrapper_class, indices=None):
+        return [False for _ in self._get_indices(indices)]
+
+    # ----------------------------------------------------------------
+    # Internal Helpers
+    # ----------------------------------------------------------------
+    def _get_obs(self):
+        obs = np.empty((self.num_envs, 3), dtype=np.float32)
+        obs[:, 0] = self.ast_alive.sum(axis=1)
+        obs[:, 1:] = self.player_pos
+        return obs
+
+    def _reset_games(self, mask):
+        self.ast_alive[mask] = False
+        self.shot_alive[mask] = False
+        self.player_pos[mask] = (SCREEN_WIDTH / 2, SCREEN_HEIGHT / 2)
+        self.rotation[mask] = 0
+        self.shoot_timer[mask] = 0
+        self.spawn_timer[mask] = 0
+        self.score[mask] = 0
+        self.steps_elapsed[mask] = 0
+        self.game_over[mask] = False
+        self.time_since_replan[mask] = 0
+        self.has_path[mask] = False
+        for i in np.flatnonzero(mask):
+            self.paths[i] = []
+
+    def _alloc(self, alive, birth, games):
+        """
+        Slots for one new entity per entry of `games` (sorted game indices):
+        free slots first, then the oldest live ones, which enforces the cap.
+        """
+        uniq, first, counts = np.unique(games, return_index=True, return_counts=True)
+        key = np.where(alive[uniq], birth[uniq], -1)
+        order = np.argsort(key, axis=1, kind="stable")
+        nth = np.minimum(np.arange(len(games)) - np.repeat(first, counts), alive.shape[1] - 1)
+        slots = order[np.repeat(np.arange(len(uniq)), counts), nth]
+        alive[games, slots] = True
+        birth[games, slots] = self.births + np.arange(len(games))
+        self.births += len(games)
+        return slots
+
+    def _spawn_asteroids(self, games, pos, vel, radius):
+        if len(games) == 0:
+            return
+        slots = self._alloc(self.ast_alive, self.ast_birth, games)
+        self.ast_pos[games, slots] = pos
+        self.ast_vel[games, slots] = vel
+        self.ast_radius[games, slots] = radius
+
+    def _spawn_at_edges(self, games, speed, turn, radius):
+        """
+        AsteroidField-style spawn: random edge, heading into the screen
+        turned by `turn` degrees, at a random point along the edge.
+        """
+        if len(games) == 0:
+            return
+        edge = self.rng.integers(0, 4, len(games))
+        u = self.rng.random(len(games), dtype=np.float32)
+        pos = EDGE_ORIGIN[edge] + u[:, None] * EDGE_SPAN[edge]
+        vel = rotate(EDGE_DIRECTION[edge] * speed[:, None], turn)
+        self._spawn_asteroids(games, pos, vel, radius)
+
+    def _forward(self):
+        # pygame.Vector2(0, 1).rotate(rotation)
+        theta = np.radians(self.rotation)
+        return np.stack((-np.sin(theta), np.cos(theta)), axis=1).astype(np.float32)
+
+    def _update_players(self, dt):
+        """
+        AStarAgent.update for every game: replan when due, shoot at an
+        asteroid in front, then follow the path.
+        """
+        self.time_since_replan += dt
+        for i in np.flatnonzero(self.time_since_replan > self.replan_interval):
+            self._set_path(i, self._plan_path(i))
+            self.time_since_replan[i] = 0.0
+
+        # Shoot at the closest asteroid within range and angle, if any
+        forward = self._forward()
+        d = self.ast_pos - self.player_pos[:, None, :]
+        dist = np.sqrt((d * d).sum(axis=2))
+        angle = np.degrees(
+            np.arctan2(d[..., 1], d[..., 0]) - np.arctan2(forward[:, 1], forward[:, 0])[:, None]
+        )
+        angle = np.where(angle > 180, angle - 360, np.where(angle < -180, angle + 360, angle))
+        in_front = (
+            self.ast_alive
+            & (dist <= self.planner.shoot_distance)
+            & (np.abs(angle) < self.planner.shoot_angle_thresh)
+        )
+        shoot = in_front.any(axis=1) & (self.shoot_timer <= 0)
+        games = np.flatnonzero(shoot)
+        if len(games):
+            slots = self._alloc(self.shot_alive, self.shot_birth, games)
+            self.shot_pos[games, slots] = self.player_pos[games]
+            self.shot_vel[games, slots] = forward[games] * PLAYER_SHOOT_SPEED
+            self.shot_ttl[games, slots] = self.shot_lifetime
+            self.shoot_timer[games] = PLAYER_SHOOT_COOLDOWN
+
+        # Follow the path: drop a reached waypoint, else turn toward it and thrust
+        d = self.waypoint - self.player_pos
+        reached = self.has_path & (np.hypot(d[:, 0], d[:, 1]) < 10)
+        for i in np.flatnonzero(reached):
+            self.paths[i].pop(0)
+            self._set_path(i, self.paths[i])
+        moving = self.has_path & ~reached
+        desired = (np.degrees(np.arctan2(d[:, 1], d[:, 0])) - 90) % 360
+        diff = (desired - self.rotation % 360) % 360
+        turn = np.where(diff > 180, -PLAYER_SPEED * dt, PLAYER_SPEED * dt)
+        self.rotation = np.where(moving, self.rotation + turn, self.rotation).astype(np.float32)
+        self.player_pos[moving] += self._forward()[moving] * PLAYER_SPEED * dt
+
+    def _set_path(self, i, path):
+        self.paths[i] = path
+        self.has_path[i] = bool(path)
+        if path:
+            self.waypoint[i] = self.planner.grid_to_world(*path[0])
+
+    def _plan_path(self, i):
+        """
+        AStarAgent.plan_path for game i: block cells near asteroids, head
+        for the free cell farthest from every asteroid, run A* there.
+        """
+        planner = self.planner
+        alive = self.ast_alive[i]
+        asteroids = GameAsteroids(self.ast_pos[i, alive], self.ast_radius[i, alive])
+        grid = planner.build_grid(asteroids)
+        goal = planner.find_safest_cell(grid, asteroids)
+        if goal is None:
+            return []
+        start = planner.world_to_grid(*self.player_pos[i])
+        return planner.a_star_search(grid, start, goal)
+
+    def _handle_collisions(self):
+        # Player vs asteroids
+        d = self.ast_pos - self.player_pos[:, None, :]
+        reach = self.ast_radius + PLAYER_RADIUS
+        self.game_over |= (self.ast_alive & ((d * d).sum(axis=2) <= reach * reach)).any(axis=1)
+
+        # Shots vs asteroids, only for live shots
+        g, s = np.nonzero(self.shot_alive)
+        if len(g) == 0:
+            return
+        d = self.ast_pos[g] - self.shot_pos[g, s][:, None, :]
+        reach = self.ast_radius[g] + SHOT_RADIUS
+        k, a = np.nonzero(self.ast_alive[g] & ((d * d).sum(axis=2) <= reach * reach))
+        if len(k) == 0:
+            return
+
+        # Each shot destroys at most one asteroid, in spawn order like resolve_hits
+        hit_g, hit_s, hit_a = g[k], s[k], a
+        order = np.lexsort((self.shot_birth[hit_g, hit_s], self.ast_birth[hit_g, hit_a], hit_g))
+        used = set()
+        pairs = []
+        for gi, si, ai in zip(hit_g[order].tolist(), hit_s[order].tolist(), hit_a[order].tolist()):
+            if (gi, "a", ai) in used or (gi, "s", si) in used:
+                continue
+            used.add((gi, "a", ai))
+            used.add((gi, "s", si))
+            pairs.append((gi, si, ai))
+        pg, ps, pa = (np.array(col) for col in zip(*pairs))
+        self.shot_alive[pg, ps] = False
+        self.ast_alive[pg, pa] = False
+        np.add.at(self.score, pg, 1)
+
+        # Split the big ones into two smaller, faster asteroids
+        big = self.ast_radius[pg, pa] > ASTEROID_MIN_RADIUS
+        pg, pa = pg[big], pa[big]
+        if len(pg) == 0:
+            return
+        degrees = self.rng.uniform(20, 50, len(pg)).astype(np.float32)
+        order = np.argsort(np.concatenate((pg, pg)), kind="stable")
+        games = np.concatenate((pg, pg))[order]
+        pos = np.concatenate((self.ast_pos[pg, pa],) * 2)[order]
+        vel = self.ast_vel[pg, pa]
+        vel = np.concatenate((rotate(vel, degrees), rotate(vel, -degrees)))[order] * 1.5
+        radius = np.concatenate((self.ast_radius[pg, pa],) * 2)[order] - ASTEROID_MIN_RADIUS
+        self._spawn_asteroids(games, pos, vel, radius)
+
+    def _wrap(self):
+        for pos in (self.ast_pos, self.shot_pos, self.player_pos):
+            for axis, size in ((0, SCREEN_WIDTH), (1, SCREEN_HEIGHT)):
+                c = pos[..., axis]
+                low = c < 0
+                high = c > size
+                c[low] = size
+                c[high] = 0
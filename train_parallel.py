@@ -0,0 +1,152 @@
+"""
+Train PPO on a PCG environment stepped in parallel worker processes.
+
+Each worker process runs its own headless env (SDL's dummy video and
+audio drivers, render_mode=None), seeded seed + worker index, in an SB3
+SubprocVecEnv; --vec dummy runs them all in this process instead, for
+debugging. Aggregate env steps/sec is printed (and logged as
+time/env_steps_per_sec) as training goes.
+
+    python train_parallel.py --env pcgrl --workers 8
+    python train_parallel.py --env koster --workers 32 --timesteps 2000000 --planner jps --wandb
+"""
+import argparse
+import os
+import sys
+import time
+
+main_dir = os.path.abspath(os.path.dirname(__file__))
+# workers inherit the environment, so none of them opens a window or audio device
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+# the envs find their modules relative to the repo root
+os.chdir(main_dir)
+sys.path.insert(0, os.path.join(main_dir, "pcg-agents"))
+
+from stable_baselines3 import PPO
+from stable_baselines3.common.callbacks import BaseCallback
+from stable_baselines3.common.env_util import make_vec_env
+from stable_baselines3.common.vec_env import DummyVecEnv, SubprocVecEnv
+
+ENVS = ("pcgrl", "koster")
+
+
+def env_class(name):
+    """
+    The env class behind an ENVS name, imported on demand.
+    """
+    if name == "pcgrl":
+        from pcgrl import AsteroidsPCGEnvWithAStar
+        return AsteroidsPCGEnvWithAStar
+    if name == "koster":
+        from pcgrl_koster import AsteroidsPCGEnvKoster
+        return AsteroidsPCGEnvKoster
+    raise ValueError(f"unknown env {name!r}, expected one of {ENVS}")
+
+
+def make_envs(name, workers, seed=0, vec="subproc", start_method=None, **env_kwargs):
+    """
+    `workers` headless envs of ENVS `name`, built with env_kwargs, the
+    i-th seeded seed + i, in a SubprocVecEnv (or a DummyVecEnv with
+    vec="dummy").
+    """
+    if vec == "subproc":
+        vec_env_cls, vec_env_kwargs = SubprocVecEnv, dict(start_method=start_method)
+    elif vec == "dummy":
+        vec_env_cls, vec_env_kwargs = DummyVecEnv, None
+    else:
+        raise ValueError(f"unknown vec {vec!r}, expected 'subproc' or 'dummy'")
+    return make_vec_env(
+        env_class(name),
+        n_envs=workers,
+        seed=seed,
+        env_kwargs=dict(env_kwargs, render_mode=None),
+        vec_env_cls=vec_env_cls,
+        vec_env_kwargs=vec_env_kwargs,
+    )
+
+
+class StepRateCallback(BaseCallback):
+    """
+    Prints and logs aggregate env steps/sec, over the whole run and over
+    the last `every` seconds.
+    """
+
+    def __init__(self, every=10.0, verbose=1):
+        super().__init__(verbose)
+        self.every = every
+
+    def _on_training_start(self):
+        self.started = self.last_time = time.perf_counter()
+        self.first_steps = self.last_steps = self.num_timesteps
+
+    def _on_step(self):
+        now = time.perf_counter()
+        if now - self.last_time >= self.every:
+            recent = (self.num_timesteps - self.last_steps) / (now - self.last_time)
+            self._report(now, recent)
+            self.last_time, self.last_steps = now, self.num_timesteps
+        return True
+
+    def _on_training_end(self):
+        self._report(time.perf_counter(), None)
+
+    def _report(self, now, recent):
+        overall = (self.num_timesteps - self.first_steps) / max(now - self.started, 1e-9)
+        self.logger.record("time/env_steps_per_sec", overall)
+        if self.verbose:
+            line = f"{self.num_timesteps} steps, {overall:.0f} env steps/s"
+            if recent is not None:
+                line += f" ({recent:.0f} over the last {self.every:.0f}s)"
+            print(line, flush=True)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--env", choices=ENVS, default="pcgrl")
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--vec", choices=("subproc", "dummy"), default="subproc")
+    # None: SB3's default (forkserver where available, else spawn)
+    parser.add_argument("--start-method", default=None)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--timesteps", type=int, default=200000)
+    parser.add_argument("--max-steps", type=int, default=600)
+    parser.add_argument("--spawn-limit", type=int, default=3)
+    # koster only: the surrogate player's grid search (see a_star.PLANNERS)
+    parser.add_argument("--planner", default=None)
+    # PPO rollout length per worker; the batch is n_steps * workers
+    parser.add_argument("--n-steps", type=int, default=2048)
+    parser.add_argument("--report-every", type=float, default=10.0)
+    parser.add_argument("--save", default="outputs/asteroids_pcg_model")
+    parser.add_argument("--wandb", action="store_true")
+    args = parser.parse_args()
+
+    env_kwargs = dict(max_steps=args.max_steps, spawn_limit=args.spawn_limit)
+    if args.planner is not None:
+        if args.env != "koster":
+            parser.error("--planner needs --env koster")
+        env_kwargs["planner"] = args.planner
+    env = make_envs(args.env, args.workers, args.seed, args.vec, args.start_method, **env_kwargs)
+
+    callbacks = [StepRateCallback(args.report_every)]
+    if args.wandb:
+        import wandb
+        from wandb.integration.sb3 import WandbCallback
+
+        wandb.init(project="asteroids-pcg", name=f"{args.env}-x{args.workers}", config=vars(args))
+        callbacks.append(WandbCallback(
+            gradient_save_freq=1000,
+            model_save_freq=5000,
+            model_save_path="models/",
+            verbose=2
+        ))
+
+    model = PPO("MlpPolicy", env, n_steps=args.n_steps, seed=args.seed, verbose=1, device="cpu")
+    model.learn(total_timesteps=args.timesteps, callback=callbacks)
+    model.save(args.save)
+
+    env.close()
+
+
+if __name__ == "__main__":
+    main()